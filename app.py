@@ -5,7 +5,9 @@ Pasul 1: Extragere date de pe site-uri + traducere
 Pasul 2: Generare CSV/Excel compatibil Gomag + import
 """
 import io
+import os
 import json
+import hashlib
 import time
 import pandas as pd
 import streamlit as st
@@ -17,13 +19,253 @@ def render_exception(results_container, i, total, e):
     with results_container:
         st.error(f"❌ [{i + 1}/{total}] Eroare: {err_short}")
         with st.expander("Detalii eroare (traceback)"):
-            st.code(_traceback.format_exc())
+            st.code(''.join(_traceback.format_exception(e)))
+
+def render_metrics(container, stages: list):
+    """Tabel p50/p95 per furnizor și etapă."""
+    if not stages:
+        return
+    container.dataframe(
+        pd.DataFrame([
+            {
+                'Furnizor': r['supplier'],
+                'Etapă': r['stage'],
+                'Nr': r['count'],
+                'p50 (ms)': r['p50_ms'],
+                'p95 (ms)': r['p95_ms'],
+                'Total (s)': r['total_s'],
+            }
+            for r in stages
+        ]),
+        width='stretch',
+        hide_index=True,
+    )
+
+def render_job_event(event: dict, total: int):
+    """Un rezultat al jobului de extragere (produs / avertisment / eroare)."""
+    prefix = (
+        f"[{event['position'] + 1}/{total}] "
+        if event['position'] is not None else ""
+    )
+    if event['level'] == 'success':
+        st.success(f"✅ {prefix}{event['text']}")
+    elif event['level'] == 'warning':
+        st.warning(f"⚠️ {prefix}{event['text']}")
+    else:
+        st.error(f"❌ {prefix}{event['text']}")
+        if event['detail']:
+            with st.expander("Detalii eroare (traceback)"):
+                st.code(event['detail'])
+
+def job_view(job_id: str):
+    """Progresul, metricile și ultimele rezultate ale jobului."""
+    jobs = get_job_store()
+    job = jobs.get(job_id)
+    if job is None:
+        st.warning("⚠️ Jobul de extragere nu mai există")
+        return
+    total = job['total'] or 0
+    st.progress(min(job['done'] / total, 1.0) if total else 1.0)
+    if job['status'] == RUNNING:
+        col_status, col_stop = st.columns([4, 1])
+        col_status.text(
+            f"⏳ Procesat {job['done']}/{total}: "
+            f"{job['current_url'][:80]}..."
+        )
+        if job['message']:
+            col_status.caption(job['message'])
+        if col_stop.button("⏹️ Oprește", key=f"cancel_{job_id}"):
+            jobs.request_cancel(job_id)
+            st.toast("⏹️ Extragerea se oprește după pagina curentă")
+    elif job['status'] != DONE:
+        st.warning(
+            f"⚠️ Extragere oprită ({job['status']}) după "
+            f"{job['done']}/{total} URL-uri. {job['message']}"
+        )
+    else:
+        st.text(
+            f"✅ Finalizat! {job['ok']} produse extrase din {total}"
+        )
+    render_metrics(st, job['metrics'])
+    for event in jobs.latest_events(job_id, JOB_EVENTS_SHOWN):
+        render_job_event(event, total)
+
+    # Jobul s-a terminat între două reîmprospătări: rerun complet,
+    # ca lista de produse să apară
+    if job['status'] in FINISHED and st.session_state.get(
+        'scrape_job_running'
+    ):
+        st.session_state.scrape_job_running = False
+        st.rerun()
+
+def expand_color_variants(products: list) -> list:
+    """Fiecare variantă de culoare devine un produs separat."""
+    final_products = []
+    for product in products:
+        color_variants = product.get('color_variants', [])
+        if color_variants and len(color_variants) > 1:
+            images = product.get('images', [])
+            for variant in color_variants:
+                vp = product.copy()
+                v_name = variant.get('name', '')
+                vp['name'] = (
+                    f"{product['name']} - {v_name}"
+                )
+                vp['sku'] = (
+                    f"{product['sku']}-"
+                    f"{v_name.upper()[:5]}"
+                    if product.get('sku')
+                    else ''
+                )
+                vp['colors'] = [v_name]
+                if variant.get('image'):
+                    v_img = make_absolute_url(
+                        variant['image'],
+                        product.get('source_url', ''),
+                    )
+                    vp['images'] = (
+                        [v_img] + [img for img in images if img != v_img]
+                    )
+                final_products.append(vp)
+        else:
+            final_products.append(product)
+    return final_products
+
+def load_final_products(store, ids: list, import_variants: bool) -> list:
+    """Produsele complete selectate, citite din depozit la export."""
+    products = store.get_many(ids)
+    if import_variants:
+        return expand_color_variants(products)
+    return products
 
 from utils.helpers import match_scraper, format_product_for_display
-from utils.translator import translate_product_data
 from utils.image_handler import make_absolute_url
-from scrapers import get_scraper
+from utils import metrics
+from utils.url_ingest import ingest as ingest_urls
+from utils.page_cache import get_cache as get_page_cache
+from utils.browser_profiles import get_store as get_profile_store
+from utils.product_store import ProductStore, SCRAPED, TRANSLATED
+from utils.job_store import get_job_store, RUNNING, DONE, FINISHED
+from scrapers.background import start_scrape_job
+from scrapers.work_queue import default_queue_url, redact_url
+from scrapers.browser_pool import get_pool as get_browser_pool
+from scrapers.prefetch import DEFAULT_LOOKAHEAD
+from scrapers.discovery import UrlDiscovery
+from scrapers.price_refresh import (
+    PriceRefresher, apply_refresh, items_from_store,
+)
 from gomag.importer import GomagImporter
+from gomag.batch_upload import GomagBatchUploader
+from gomag.category_index import CategoryIndex
+from gomag.writer import price_update_csv
+from gomag.catalog_diff import GomagCatalog
+
+# Produse afișate pe o pagină în lista de revizuire
+PRODUCTS_PER_PAGE = 20
+# URL-uri listate per site în Pasul 1 (descoperirea poate aduce mii)
+URLS_SHOWN_PER_SITE = 200
+# Cât de des își reîmprospătează pagina starea jobului de extragere
+JOB_POLL_SECONDS = 2
+# Ultimele rezultate ale jobului afișate în pagină
+JOB_EVENTS_SHOWN = 50
+
+# Starea jobului, reîmprospătată fără rerun-ul întregii pagini
+job_panel = st.fragment(run_every=JOB_POLL_SECONDS)(job_view)
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def review_page(_store, store_path, version, collection, query, site,
+                page):
+    """
+    Rezumatele + tabelul unei pagini din lista de revizuire.
+    Cheia de cache include versiunea depozitului, deci orice
+    modificare (scrape, editare, ștergere) invalidează pagina.
+    """
+    _, page_records = _store.search(
+        collection, query, site,
+        offset=(page - 1) * PRODUCTS_PER_PAGE,
+        limit=PRODUCTS_PER_PAGE,
+    )
+    df_page = pd.DataFrame([
+        {
+            'Imagine': r.thumbnail or None,
+            'Status': '✅' if r.status == 'scraped' else '⚠️',
+            'Nume': r.name or 'N/A',
+            'SKU': r.sku or 'N/A',
+            'Preț (LEI)': round(r.final_price, 2),
+            'Culori': len(r.colors),
+            'Imagini': r.images_count,
+            'Site': r.source_site or 'N/A',
+        }
+        for r in page_records
+    ])
+    return page_records, df_page
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def review_table(_store, store_path, version, collection, query, site):
+    """Rezumatele filtrate, tabelul editabil din Pasul 2 și meta (id-uri)."""
+    _, records = _store.search(collection, query, site)
+    display_data = []
+    for r in records:
+        colors_str = ', '.join(r.colors[:3])
+        if len(r.colors) > 3:
+            colors_str += f" +{len(r.colors) - 3}"
+
+        display_data.append({
+            'Import': True,
+            'Nume': (r.name or 'N/A')[:60],
+            'SKU': r.sku or 'N/A',
+            'Preț (LEI)': round(r.final_price, 2),
+            'Culori': colors_str or 'N/A',
+            'Imagini': r.images_count,
+            'Sursă': r.source_site or 'N/A',
+        })
+    return records, pd.DataFrame(display_data), table_meta(records)
+
+
+def table_meta(records: list) -> pd.DataFrame:
+    """Id-ul și nr. de variante, aliniate cu rândurile tabelului."""
+    return pd.DataFrame({
+        'id': [r.id for r in records],
+        'variants': [r.variants_count for r in records],
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_export(_store, _importer, store_path, version, selection_hash,
+                 _ids, import_variants, category_name, brand_name,
+                 file_format):
+    """
+    Fișierul Gomag (CSV/XLSX) + preview, memoizat pe hash-ul selecției
+    și versiunea depozitului: apăsările repetate nu regenerează nimic.
+    """
+    final_products = load_final_products(_store, _ids, import_variants)
+    if file_format == 'xlsx':
+        data = _importer.generate_excel_file(
+            final_products, category_name, brand_name
+        )
+        return data, None, len(final_products)
+    data = _importer.generate_csv_file(
+        final_products, category_name, brand_name
+    )
+    return data, _importer.export_preview(), len(final_products)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_diff_export(_store, _importer, _catalog, store_path, version,
+                      selection_hash, _ids, import_variants,
+                      category_name, brand_name, catalog_id):
+    """Exportul incremental față de exportul Gomag încărcat."""
+    final_products = load_final_products(_store, _ids, import_variants)
+    new_csv, update_csv, diff = _importer.generate_diff_files(
+        final_products, _catalog, category_name, brand_name
+    )
+    return (
+        new_csv, update_csv, diff.stats,
+        diff.changed_columns.most_common(),
+    )
+
 
 # ──────────────────────────────────────────────
 # CONFIGURARE PAGINĂ
@@ -41,10 +283,10 @@ st.markdown("---")
 # ──────────────────────────────────────────────
 # INIȚIALIZARE SESSION STATE
 # ──────────────────────────────────────────────
-if 'scraped_products' not in st.session_state:
-    st.session_state.scraped_products = []
-if 'translated_products' not in st.session_state:
-    st.session_state.translated_products = []
+# Produsele stau pe disc (SQLite), nu în session_state
+if 'product_store' not in st.session_state:
+    st.session_state.product_store = ProductStore()
+store = st.session_state.product_store
 if 'import_results' not in st.session_state:
     st.session_state.import_results = []
 if 'categories' not in st.session_state:
@@ -55,6 +297,31 @@ if 'step' not in st.session_state:
     st.session_state.step = 1
 if 'urls_to_process' not in st.session_state:
     st.session_state.urls_to_process = []
+if 'discovered_urls' not in st.session_state:
+    st.session_state.discovered_urls = []
+# Ultima sursă aplicată listei de extras (fișier / text / descoperire):
+# o sursă înlocuiește lista doar când se schimbă, nu la fiecare rerun
+if 'urls_source' not in st.session_state:
+    st.session_state.urls_source = []
+if 'price_refresh' not in st.session_state:
+    st.session_state.price_refresh = []
+if 'scrape_job' not in st.session_state:
+    st.session_state.scrape_job = None
+
+# ?job=<id>: alt tab / utilizator urmărește același job de extragere
+job_param = st.query_params.get('job')
+if job_param and job_param != st.session_state.scrape_job:
+    attached = get_job_store().get(job_param)
+    if attached and os.path.exists(attached['store_path']):
+        if attached['store_path'] != store.path:
+            store = st.session_state.product_store = ProductStore(
+                attached['store_path']
+            )
+        st.session_state.scrape_job = job_param
+
+scrape_job = st.session_state.scrape_job
+current_job = get_job_store().get(scrape_job) if scrape_job else None
+job_running = bool(current_job) and current_job['status'] == RUNNING
 
 # ──────────────────────────────────────────────
 # SIDEBAR - CONFIGURARE
@@ -100,12 +367,59 @@ PSI_PASS = "pass_psi"
 
     # Status
     st.subheader("📊 Status")
-    st.metric("Produse extrase", len(st.session_state.scraped_products))
-    st.metric(
-        "Produse traduse", len(st.session_state.translated_products)
-    )
+    st.metric("Produse extrase", store.count(SCRAPED))
+    st.metric("Produse traduse", store.count(TRANSLATED))
     st.metric("Produse importate", len(st.session_state.import_results))
 
+    stage_metrics = metrics.summary()
+    if stage_metrics:
+        with st.expander("⏱️ Timpi pe etape"):
+            render_metrics(st, stage_metrics)
+            st.download_button(
+                label="📥 Prometheus",
+                data=metrics.to_prometheus(stage_metrics),
+                file_name="metrics.prom",
+                mime="text/plain",
+            )
+            st.download_button(
+                label="📥 JSON",
+                data=json.dumps(
+                    metrics.snapshot(), indent=2, ensure_ascii=False
+                ),
+                file_name="metrics.json",
+                mime="application/json",
+            )
+
+    # Browsere remote (Selenium Grid / chromedriver pe alte mașini)
+    browser_pool = get_browser_pool()
+    if browser_pool is not None:
+        with st.expander(f"🖥️ Browsere remote ({len(browser_pool)})"):
+            for endpoint in browser_pool.status():
+                load = max(endpoint['active'], endpoint['busy'])
+                if endpoint['healthy']:
+                    st.caption(
+                        f"🟢 {endpoint['url']} — "
+                        f"{load}/{endpoint['capacity']} sesiuni"
+                    )
+                else:
+                    st.caption(
+                        f"🔴 {endpoint['url']} — reîncercare în "
+                        f"{endpoint['retry_in']}s: {endpoint['error'][:80]}"
+                    )
+
+    # Profiluri Chrome persistente (cache HTTP + cookie-uri per furnizor)
+    profile_store = get_profile_store()
+    profiles = profile_store.profiles() if profile_store else []
+    if profiles:
+        with st.expander(f"🗂️ Profiluri Chrome ({len(profiles)})"):
+            st.caption(
+                "Cache-ul HTTP și cookie-urile de consimțământ se păstrează "
+                "între rulări; profilurile nefolosite se șterg automat."
+            )
+            if st.button("🧹 Șterge profilurile", width='stretch'):
+                removed = profile_store.clear()
+                st.success(f"✅ {removed} profiluri șterse")
+
     st.markdown("---")
 
     # Navigare pași
@@ -127,10 +441,16 @@ PSI_PASS = "pass_psi"
     # Buton reset
     if st.button("🔄 Reset Complet", type="secondary"):
         for key in [
-            'scraped_products', 'translated_products',
-            'import_results', 'categories', 'urls_to_process'
+            'import_results', 'categories', 'urls_to_process',
+            'discovered_urls', 'price_refresh', 'urls_source',
         ]:
             st.session_state[key] = []
+        # Depozitul se golește: jobul care scrie în el se oprește
+        if job_running:
+            get_job_store().request_cancel(scrape_job)
+        st.session_state.scrape_job = None
+        st.query_params.pop('job', None)
+        store.clear()
         st.session_state.step = 1
         st.session_state.selected_category = ""
         st.rerun()
@@ -143,9 +463,10 @@ if st.session_state.step == 1:
     st.header("📥 Pas 1: Upload Link-uri & Extragere Date")
 
     # Tab-uri pentru input
-    tab_upload, tab_manual = st.tabs([
+    tab_upload, tab_manual, tab_discover = st.tabs([
         "📄 Upload Excel/CSV",
-        "✍️ Introducere manuală"
+        "✍️ Introducere manuală",
+        "🔎 Descoperire (sitemap / categorii)",
     ])
 
     with tab_upload:
@@ -210,7 +531,10 @@ if st.session_state.step == 1:
 
                 st.info(f"📎 {len(urls)} URL-uri valide găsite")
 
-                if urls:
+                source = ('file', uploaded_file.file_id, url_column,
+                          has_header)
+                if urls and st.session_state.urls_source != source:
+                    st.session_state.urls_source = source
                     st.session_state.urls_to_process = urls
 
             except Exception as e:
@@ -234,13 +558,154 @@ if st.session_state.step == 1:
                 if u.strip().startswith('http')
             ]
             st.info(f"📎 {len(urls)} URL-uri introduse")
-            st.session_state.urls_to_process = urls
+            source = ('text', urls_text)
+            if st.session_state.urls_source != source:
+                st.session_state.urls_source = source
+                st.session_state.urls_to_process = urls
+
+    with tab_discover:
+        st.markdown(
+            "Domeniul furnizorului, un sitemap sau o pagină de categorie "
+            "(câte una pe linie). URL-urile de produs găsite intră direct "
+            "în lista de extras."
+        )
+
+        sources_text = st.text_area(
+            "Surse:",
+            height=150,
+            placeholder=(
+                "https://promobox.com\n"
+                "https://www.midocean.com/sitemap.xml\n"
+                "https://www.stricker-europe.com/en/bags/backpacks/"
+            ),
+        )
+        col_limit, col_since = st.columns(2)
+        with col_limit:
+            discover_limit = st.number_input(
+                "Maxim produse (0 = toate)",
+                min_value=0, value=0, step=100,
+            )
+        with col_since:
+            discover_since = st.date_input(
+                "Doar modificate după (opțional)",
+                value=None,
+                help="Folosește <lastmod> din sitemap.",
+            )
+
+        if st.button(
+            "🔎 Descoperă produse", disabled=not sources_text.strip()
+        ):
+            discovery = UrlDiscovery(since=discover_since)
+            found = []
+            progress = st.empty()
+            with st.spinner("Citesc sitemap-urile și categoriile..."):
+                for url in discovery.discover(
+                    sources_text.strip().split('\n'),
+                    limit=discover_limit or None,
+                ):
+                    found.append(url)
+                    if len(found) % 1000 == 0:
+                        progress.text(f"🔎 {len(found)} produse...")
+            progress.empty()
+            st.session_state.discovered_urls = found
+            st.session_state.urls_source = ('discover',)
+            st.session_state.urls_to_process = found
+
+            stats = discovery.stats
+            st.info(
+                f"🔎 {stats['sitemaps']} sitemap-uri, "
+                f"{stats['pages']} pagini de categorie → "
+                f"{stats['seen']} URL-uri, {stats['products']} produse "
+                f"({stats['duplicates']} duplicate, "
+                f"{stats['not_product']} nu sunt produse, "
+                f"{stats['old']} nemodificate)"
+            )
+            for url, error in discovery.errors[:10]:
+                st.warning(f"⚠️ {url[:80]}: {error[:100]}")
+
+        if st.session_state.discovered_urls:
+            discovered = st.session_state.discovered_urls
+            in_use = st.session_state.urls_to_process == discovered
+            st.info(
+                f"📎 {len(discovered)} URL-uri descoperite"
+                + (" (în lista de extras)" if in_use else "")
+            )
+            col_use, col_drop = st.columns(2)
+            with col_use:
+                if not in_use and st.button(
+                    "📥 Folosește URL-urile descoperite",
+                    width='stretch',
+                ):
+                    st.session_state.urls_to_process = discovered
+                    st.rerun()
+            with col_drop:
+                if st.button("🗑️ Renunță la cele descoperite",
+                             width='stretch'):
+                    if in_use:
+                        st.session_state.urls_to_process = []
+                    st.session_state.discovered_urls = []
+                    st.rerun()
 
     st.markdown("---")
 
     # PROCESARE URL-uri
+    start_scraping = False
     if st.session_state.urls_to_process:
-        urls = st.session_state.urls_to_process
+        # Canonicalizare + deduplicare înainte de scraping
+        col_known, col_cache = st.columns(2)
+        with col_known:
+            skip_known = st.checkbox(
+                "⏭️ Sari peste produsele deja extrase",
+                value=bool(store.count(SCRAPED)),
+                help=(
+                    "Păstrează produsele extrase anterior și "
+                    "extrage doar URL-urile noi."
+                ),
+            )
+        with col_cache:
+            use_page_cache = st.checkbox(
+                "♻️ Refolosește paginile descărcate recent",
+                value=True,
+                help=(
+                    "Paginile descărcate în ultimele 6 ore se citesc "
+                    "din cache. Debifează pentru prețuri la zi."
+                ),
+            )
+
+        ingest_report = ingest_urls(
+            st.session_state.urls_to_process,
+            known_urls=(
+                store.urls(SCRAPED) if skip_known else None
+            ),
+            page_cache=get_page_cache() if use_page_cache else None,
+        )
+        urls = ingest_report['urls']
+
+        if ingest_report['fetches_saved'] or ingest_report['invalid']:
+            st.info(
+                f"🧹 {ingest_report['total']} URL-uri → "
+                f"{len(urls)} de extras | "
+                f"{ingest_report['fetches_saved']} fetch-uri economisite "
+                f"({ingest_report['duplicates']} duplicate, "
+                f"{ingest_report['variants_grouped']} variante grupate, "
+                f"{ingest_report['already_scraped']} deja extrase, "
+                f"{ingest_report['cached']} din cache)"
+            )
+        if ingest_report['invalid']:
+            st.warning(
+                f"⚠️ {len(ingest_report['invalid'])} intrări ignorate "
+                f"(nu sunt URL-uri valide)"
+            )
+        if ingest_report['groups']:
+            with st.expander(
+                f"🔗 {len(ingest_report['groups'])} produse cu "
+                f"URL-uri grupate"
+            ):
+                groups = list(ingest_report['groups'].items())
+                st.text('\n'.join(
+                    f"{kept}  ←  {len(originals)} URL-uri"
+                    for kept, originals in groups[:URLS_SHOWN_PER_SITE]
+                ))
 
         # Afișăm URL-urile grupate per site
         st.subheader("📋 URL-uri de procesat")
@@ -254,8 +719,12 @@ if st.session_state.step == 1:
             with st.expander(
                 f"🌐 {site} ({len(site_urls)} produse)"
             ):
-                for u in site_urls:
-                    st.text(u)
+                st.text('\n'.join(site_urls[:URLS_SHOWN_PER_SITE]))
+                if len(site_urls) > URLS_SHOWN_PER_SITE:
+                    st.caption(
+                        f"… și încă "
+                        f"{len(site_urls) - URLS_SHOWN_PER_SITE} URL-uri"
+                    )
 
         st.markdown("---")
 
@@ -267,6 +736,7 @@ if st.session_state.step == 1:
                 "🚀 Începe Extragerea Datelor",
                 type="primary",
                 width='stretch',
+                disabled=job_running,
             )
 
         with col2:
@@ -275,130 +745,167 @@ if st.session_state.step == 1:
                 value=True,
             )
 
-        if start_scraping:
-            st.session_state.scraped_products = []
-            st.session_state.translated_products = []
-
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            results_container = st.container()
-
-            total = len(urls)
-            active_scrapers = {}
-
-            for i, url in enumerate(urls):
-                progress = (i + 1) / total
-                progress_bar.progress(progress)
-                status_text.text(
-                    f"⏳ Procesez {i + 1}/{total}: {url[:80]}..."
+        # Modul distribuit: workeri în alte procese / pe alte mașini
+        col_dist, col_workers, col_tabs = st.columns(3)
+        with col_dist:
+            distributed = st.checkbox(
+                "🖧 Mod distribuit",
+                help=(
+                    "URL-urile intră într-o coadă durabilă, servită de "
+                    "oricâte procese worker (și pe alte mașini)."
+                ),
+            )
+        with col_tabs:
+            tabs_per_supplier = st.number_input(
+                "🗂️ Tab-uri per furnizor",
+                min_value=1, max_value=8, value=1,
+                help=(
+                    "Pagini încărcate în paralel pentru fiecare furnizor, "
+                    "ca tab-uri în browsere comune (cookie-uri separate "
+                    "per furnizor)."
+                ),
+            )
+            prefetch_lookahead = st.number_input(
+                "⏩ Prefetch (pagini în avans)",
+                min_value=0, max_value=10, value=DEFAULT_LOOKAHEAD,
+                help=(
+                    "Următoarele pagini ale furnizorului se descarcă "
+                    "prin HTTP cât timp pagina curentă se încarcă. "
+                    "0 = dezactivat."
+                ),
+            )
+        queue_url = None
+        local_workers = 0
+        if distributed:
+            try:
+                queue_url = st.secrets.get("QUEUE", {}).get("URL")
+            except Exception:
+                queue_url = None
+            queue_url = queue_url or default_queue_url()
+            with col_workers:
+                local_workers = st.number_input(
+                    "Workeri locali",
+                    min_value=0, max_value=32, value=2,
+                    help="Procese worker pornite pe acest server",
                 )
+            shown_url = redact_url(queue_url)
+            st.caption(
+                "Workeri suplimentari: "
+                f"`python -m scrapers.worker --queue {shown_url}`"
+                + (" (credențialele din secrets)"
+                   if shown_url != queue_url else "")
+            )
 
-                scraper_name = match_scraper(url)
-
-                # Reutilizăm scraperul pentru același site
-                if scraper_name not in active_scrapers:
-                    active_scrapers[scraper_name] = get_scraper(
-                        scraper_name
-                    )
-
-                scraper = active_scrapers[scraper_name]
-
-                try:
-                    product = scraper.scrape(url)
-
-                    if product:
-                        # Traducere dacă e activată
-                        if translate_option:
-                            status_text.text(
-                                f"🌍 Traduc {i + 1}/{total}..."
-                            )
-                            try:
-                                product = translate_product_data(
-                                    product
-                                )
-                            except Exception as te:
-                                st.warning(
-                                    f"⚠️ Traducere eșuată: "
-                                    f"{str(te)[:80]}"
-                                )
-
-                        st.session_state.scraped_products.append(
-                            product
-                        )
-
-                        with results_container:
-                            colors_info = ""
-                            if product.get('colors'):
-                                colors_info = (
-                                    f" | 🎨 "
-                                    f"{len(product['colors'])} culori"
-                                )
-                            st.success(
-                                f"✅ [{i + 1}/{total}] "
-                                f"{product.get('name', 'N/A')} "
-                                f"| Preț: "
-                                f"{product.get('final_price', 0):.2f}"
-                                f" LEI "
-                                f"| SKU: "
-                                f"{product.get('sku', 'N/A')}"
-                                f"{colors_info}"
-                            )
-                    else:
-                        with results_container:
-                            st.warning(
-                                f"⚠️ [{i + 1}/{total}] "
-                                f"Nu am putut extrage: "
-                                f"{url[:80]}"
-                            )
-
-                except Exception as e:
-                    render_exception(results_container, i, total, e)
-            # Închidem scraperele
-            for scraper in active_scrapers.values():
-                try:
-                    scraper.close()
-                except Exception:
-                    pass
-
-            progress_bar.progress(1.0)
-            status_text.text(
-                f"✅ Finalizat! "
-                f"{len(st.session_state.scraped_products)} "
-                f"produse extrase din {total}"
+        if start_scraping:
+            if not skip_known:
+                store.clear(SCRAPED)
+            store.clear(TRANSLATED)
+
+            # Extragerea rulează în fundal (scrapers.background);
+            # pagina doar urmărește starea jobului
+            job_id = start_scrape_job(
+                urls, store.path,
+                translate=translate_option,
+                use_page_cache=use_page_cache,
+                queue_url=queue_url,
+                local_workers=int(local_workers),
+                tabs_per_supplier=int(tabs_per_supplier),
+                prefetch_lookahead=int(prefetch_lookahead),
             )
+            st.session_state.scrape_job = job_id
+            st.query_params['job'] = job_id
 
-            if translate_option:
-                st.session_state.translated_products = (
-                    st.session_state.scraped_products.copy()
-                )
+    scrape_job = st.session_state.scrape_job
+    if scrape_job:
+        st.markdown("---")
+        if start_scraping or job_running:
+            st.subheader("🛠️ Extragere în curs")
+            st.session_state.scrape_job_running = True
+            job_panel(scrape_job)
+        else:
+            st.subheader("🛠️ Ultima extragere")
+            job_view(scrape_job)
 
     # AFIȘARE PRODUSE EXTRASE
-    if st.session_state.scraped_products:
+    scraped_count = store.count(SCRAPED)
+    if scraped_count:
         st.markdown("---")
-        st.subheader(
-            f"📦 Produse Extrase "
-            f"({len(st.session_state.scraped_products)})"
+        st.subheader(f"📦 Produse Extrase ({scraped_count})")
+
+        # Căutare + filtru pe site (în SQLite, nu în Python)
+        col_q, col_site = st.columns([3, 1])
+        with col_q:
+            review_query = st.text_input(
+                "🔎 Caută după nume, SKU sau site:",
+                key="scraped_query",
+            )
+        with col_site:
+            review_site = st.selectbox(
+                "🌐 Site:",
+                options=[''] + store.sites(SCRAPED),
+                format_func=lambda x: x or "Toate",
+                key="scraped_site",
+            )
+
+        matching = store.search(
+            SCRAPED, review_query, review_site, limit=0
+        )[0]
+        page_count = max(1, -(-matching // PRODUCTS_PER_PAGE))
+        page = 1
+        if page_count > 1:
+            page = st.number_input(
+                f"Pagina (din {page_count}):",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                step=1,
+                key="scraped_page",
+            )
+        page = min(page, page_count)
+
+        # Tabelul paginii e în cache până la următoarea modificare
+        page_records, df_page = review_page(
+            store, store.path, store.version(), SCRAPED,
+            review_query, review_site, page,
+        )
+        st.caption(
+            f"{matching} produse găsite | pagina {page}/{page_count}"
+        )
+        st.dataframe(
+            df_page,
+            width='stretch',
+            hide_index=True,
+            column_config={
+                "Imagine": st.column_config.ImageColumn(
+                    "Imagine", width="small"
+                ),
+                "Preț (LEI)": st.column_config.NumberColumn(
+                    "Preț (LEI)", format="%.2f"
+                ),
+            },
         )
 
-        for idx, product in enumerate(
-            st.session_state.scraped_products
-        ):
-            # Label expander
-            colors_count = len(product.get('colors', []))
-            images_count = len(product.get('images', []))
-
-            expander_label = (
-                f"{'✅' if product.get('status') == 'scraped' else '⚠️'}"
-                f" {product.get('name', 'N/A')} | "
-                f"SKU: {product.get('sku', 'N/A')} | "
-                f"Preț: {product.get('final_price', 0):.2f} LEI"
+        # Detalii + editare pentru un singur produs de pe pagină
+        labels = {
+            r.id: (
+                f"{'✅' if r.status == 'scraped' else '⚠️'} "
+                f"{r.name or 'N/A'} | SKU: {r.sku or 'N/A'}"
             )
-            if colors_count > 0:
-                expander_label += f" | 🎨 {colors_count} culori"
-            if images_count > 0:
-                expander_label += f" | 📷 {images_count} img"
+            for r in page_records
+        }
+        detail_id = st.selectbox(
+            "🔍 Detalii produs:",
+            options=[None] + list(labels),
+            format_func=lambda x: (
+                "— alege un produs —" if x is None else labels[x]
+            ),
+            key=f"scraped_detail_{page}",
+        )
+        product = store.get(detail_id) if detail_id else None
 
-            with st.expander(expander_label):
+        if product:
+            idx = detail_id
+            with st.container():
                 col_info, col_img = st.columns([2, 1])
 
                 with col_info:
@@ -453,47 +960,16 @@ if st.session_state.step == 1:
                             f"{', '.join(product['colors'])}"
                         )
 
-                    # Variante culoare cu imagini
+                    # Variante culoare (fără imagini până la cerere)
                     if product.get('color_variants'):
                         st.write(
                             f"**Variante culoare:** "
-                            f"{len(product['color_variants'])}"
-                        )
-                        num_cols = min(
-                            len(product['color_variants']), 4
+                            f"{len(product['color_variants'])} - "
+                            + ', '.join(
+                                v.get('name', 'N/A')
+                                for v in product['color_variants']
+                            )
                         )
-                        if num_cols > 0:
-                            variant_cols = st.columns(num_cols)
-                            for vi, variant in enumerate(
-                                product['color_variants'][:8]
-                            ):
-                                col_idx = vi % num_cols
-                                with variant_cols[col_idx]:
-                                    v_name = variant.get(
-                                        'name', 'N/A'
-                                    )
-                                    if variant.get('image'):
-                                        try:
-                                            img_url = (
-                                                make_absolute_url(
-                                                    variant['image'],
-                                                    product.get(
-                                                        'source_url',
-                                                        ''
-                                                    )
-                                                )
-                                            )
-                                            st.image(
-                                                img_url,
-                                                caption=v_name,
-                                                width=80,
-                                            )
-                                        except Exception:
-                                            st.write(
-                                                f"🎨 {v_name}"
-                                            )
-                                    else:
-                                        st.write(f"🎨 {v_name}")
 
                     # Specificații
                     if product.get('specifications'):
@@ -510,36 +986,42 @@ if st.session_state.step == 1:
                             st.image(
                                 images[0],
                                 caption="Imagine principală",
-                                width=250,
+                                width=160,
                             )
                         except Exception:
                             st.write(f"🖼️ {images[0][:60]}...")
 
-                        if len(images) > 1:
-                            st.write(
-                                f"📷 +{len(images) - 1} imagini:"
-                            )
-                            thumb_count = min(
-                                len(images) - 1, 3
-                            )
-                            thumb_cols = st.columns(thumb_count)
-                            for img_i, img_url in enumerate(
-                                images[1:4]
+                        show_all = st.checkbox(
+                            f"📷 Toate imaginile ({len(images)})",
+                            key=f"all_images_{idx}",
+                        )
+                        if show_all:
+                            thumb_cols = st.columns(3)
+                            for img_i, img_url in enumerate(images[1:]):
+                                with thumb_cols[img_i % 3]:
+                                    try:
+                                        st.image(img_url, width=80)
+                                    except Exception:
+                                        st.write("🖼️")
+                            for variant in (
+                                product.get('color_variants') or []
                             ):
-                                with thumb_cols[
-                                    img_i % thumb_count
-                                ]:
+                                if variant.get('image'):
                                     try:
                                         st.image(
-                                            img_url, width=80
+                                            make_absolute_url(
+                                                variant['image'],
+                                                product.get(
+                                                    'source_url', ''
+                                                ),
+                                            ),
+                                            caption=variant.get(
+                                                'name', 'N/A'
+                                            ),
+                                            width=80,
                                         )
                                     except Exception:
-                                        st.write("🖼️")
-                            if len(images) > 4:
-                                st.write(
-                                    f"... și încă "
-                                    f"{len(images) - 4}"
-                                )
+                                        pass
                     else:
                         st.write("❌ Fără imagini")
 
@@ -580,11 +1062,13 @@ if st.session_state.step == 1:
                     if st.form_submit_button(
                         "💾 Salvează modificările"
                     ):
-                        sp = st.session_state.scraped_products
-                        sp[idx]['name'] = new_name
-                        sp[idx]['final_price'] = new_price
-                        sp[idx]['sku'] = new_sku
-                        sp[idx]['description'] = new_desc
+                        store.update(
+                            idx,
+                            name=new_name,
+                            final_price=new_price,
+                            sku=new_sku,
+                            description=new_desc,
+                        )
                         st.success("✅ Modificări salvate!")
                         st.rerun()
 
@@ -598,9 +1082,7 @@ if st.session_state.step == 1:
                 type="primary",
                 width='stretch',
             ):
-                st.session_state.translated_products = (
-                    st.session_state.scraped_products.copy()
-                )
+                store.copy(SCRAPED, TRANSLATED)
                 st.session_state.step = 2
                 st.rerun()
 
@@ -610,39 +1092,38 @@ if st.session_state.step == 1:
                 type="secondary",
                 width='stretch',
             ):
-                st.session_state.scraped_products = []
-                st.session_state.translated_products = []
+                store.clear()
                 st.rerun()
 
         # Export
         st.markdown("---")
         st.subheader("💾 Export Date Intermediare")
 
-        col_exp1, col_exp2 = st.columns(2)
-
-        with col_exp1:
-            json_data = json.dumps(
-                st.session_state.scraped_products,
-                indent=2,
-                ensure_ascii=False,
-                default=str,
-            )
-            st.download_button(
-                label="📥 Descarcă JSON",
-                data=json_data,
-                file_name="produse_extrase.json",
-                mime="application/json",
+        # Fișierele se construiesc doar la cerere, produs cu produs
+        if not st.button("📦 Pregătește fișierele de export"):
+            st.caption(
+                "Exportul citește toate produsele de pe disc; "
+                "apasă butonul când ai nevoie de fișiere."
             )
+        else:
+            col_exp1, col_exp2 = st.columns(2)
 
-        with col_exp2:
+            json_buffer = io.StringIO()
             export_data = []
-            for p in st.session_state.scraped_products:
+            json_buffer.write('[')
+            for n, p in enumerate(store.iter_products(SCRAPED)):
+                if n:
+                    json_buffer.write(',')
+                json_buffer.write('\n')
+                json_buffer.write(json.dumps(
+                    p, indent=2, ensure_ascii=False, default=str
+                ))
                 export_data.append({
                     'Nume': p.get('name', ''),
                     'SKU': p.get('sku', ''),
                     'Descriere': p.get('description', '') or p.get('description_html', ''),
                     'Specificații': json.dumps(p.get('specifications', p.get('specs', {})) or {}, ensure_ascii=False),
-                    
+
                     'Preț Original': p.get('original_price', 0),
                     'Moneda': p.get('currency', 'EUR'),
                     'Preț Final LEI': p.get('final_price', 0),
@@ -658,22 +1139,32 @@ if st.session_state.step == 1:
                     'Sursă': p.get('source_url', ''),
                     'Site': p.get('source_site', ''),
                 })
-            df_export = pd.DataFrame(export_data)
-            excel_buffer = io.BytesIO()
-            df_export.to_excel(
-                excel_buffer, index=False, engine='openpyxl'
-            )
-            excel_buffer.seek(0)
-            st.download_button(
-                label="📥 Descarcă Excel",
-                data=excel_buffer,
-                file_name="produse_extrase.xlsx",
-                mime=(
-                    "application/vnd.openxmlformats-"
-                    "officedocument.spreadsheetml.sheet"
-                ),
-            )
+            json_buffer.write('\n]')
+
+            with col_exp1:
+                st.download_button(
+                    label="📥 Descarcă JSON",
+                    data=json_buffer.getvalue(),
+                    file_name="produse_extrase.json",
+                    mime="application/json",
+                )
 
+            with col_exp2:
+                df_export = pd.DataFrame(export_data)
+                excel_buffer = io.BytesIO()
+                df_export.to_excel(
+                    excel_buffer, index=False, engine='openpyxl'
+                )
+                excel_buffer.seek(0)
+                st.download_button(
+                    label="📥 Descarcă Excel",
+                    data=excel_buffer,
+                    file_name="produse_extrase.xlsx",
+                    mime=(
+                        "application/vnd.openxmlformats-"
+                        "officedocument.spreadsheetml.sheet"
+                    ),
+                )
 
 # ══════════════════════════════════════════════
 # PAS 2: VERIFICARE & IMPORT ÎN GOMAG
@@ -681,12 +1172,10 @@ if st.session_state.step == 1:
 elif st.session_state.step == 2:
     st.header("📝 Pas 2: Verificare & Import în Gomag.ro")
 
-    products = (
-        st.session_state.translated_products
-        or st.session_state.scraped_products
-    )
+    # Rezumate compacte; produsele complete se citesc doar la export
+    collection = TRANSLATED if store.count(TRANSLATED) else SCRAPED
 
-    if not products:
+    if not store.count(collection):
         st.warning(
             "⚠️ Nu ai produse de importat. "
             "Întoarce-te la Pasul 1."
@@ -704,7 +1193,8 @@ elif st.session_state.step == 2:
                     json_upload.read().decode('utf-8')
                 )
                 if isinstance(imported, list) and imported:
-                    st.session_state.translated_products = imported
+                    store.clear(TRANSLATED)
+                    store.extend(imported, TRANSLATED)
                     st.success(
                         f"✅ {len(imported)} produse "
                         f"importate din JSON"
@@ -729,9 +1219,14 @@ elif st.session_state.step == 2:
                 imported = json.loads(
                     json_upload.read().decode('utf-8')
                 )
-                if isinstance(imported, list) and imported:
-                    st.session_state.translated_products = imported
-                    products = imported
+                upload_id = (json_upload.name, json_upload.size)
+                if (
+                    isinstance(imported, list) and imported
+                    and st.session_state.get('json_imported') != upload_id
+                ):
+                    st.session_state.json_imported = upload_id
+                    store.clear(TRANSLATED)
+                    store.extend(imported, TRANSLATED)
                     st.success(
                         f"✅ {len(imported)} produse "
                         f"importate din JSON"
@@ -739,6 +1234,79 @@ elif st.session_state.step == 2:
                     st.rerun()
             except Exception as e:
                 render_exception(results_container, i, total, e)
+
+    # ---- ACTUALIZARE PREȚ / STOC (fără re-scraping) ----
+    with st.expander("💱 Actualizare rapidă preț / stoc"):
+        st.caption(
+            "Verifică doar prețul (și stocul) la furnizor și generează "
+            "un CSV Gomag minimal: SKU + preț (+ stoc)."
+        )
+        col_pr1, col_pr2, col_pr3 = st.columns(3)
+        with col_pr1:
+            refresh_browser = st.checkbox(
+                "Browser pentru paginile fără preț în HTML",
+                value=True,
+            )
+        with col_pr2:
+            refresh_stock = st.checkbox("Include stocul", value=False)
+        with col_pr3:
+            refresh_all = st.checkbox(
+                "Și prețurile neschimbate", value=False,
+            )
+
+        if st.button(
+            f"💱 Verifică prețurile ({store.count(collection)} produse)"
+        ):
+            items = items_from_store(store, collection)
+            progress = st.progress(0)
+            refresher = PriceRefresher(use_browser=refresh_browser)
+            results = []
+            try:
+                for result in refresher.run(items):
+                    results.append(result)
+                    progress.progress(
+                        len(results) / len(items),
+                        text=f"{len(results)}/{len(items)}",
+                    )
+            finally:
+                refresher.close()
+            updated = apply_refresh(store, results)
+            st.session_state.price_refresh = results
+            st.success(
+                f"✅ {updated} prețuri verificate, "
+                f"{refresher.stats['changed']} schimbate, "
+                f"{refresher.stats['failed']} fără preț"
+            )
+
+        results = st.session_state.get('price_refresh')
+        if results:
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            'SKU': r['sku'],
+                            'Preț vechi': r['old_price'],
+                            'Preț nou': r['price'],
+                            'Preț final': r['final_price'],
+                            'Stoc': r['stock'],
+                            'Sursă': r['via'] or '❌',
+                            'URL': r['url'],
+                        }
+                        for r in results
+                        if refresh_all or r['changed'] or not r['via']
+                    ]
+                ),
+                width='stretch',
+            )
+            st.download_button(
+                label="📥 Descarcă CSV actualizare preț",
+                data=price_update_csv(
+                    results, with_stock=refresh_stock,
+                    only_changed=not refresh_all,
+                ),
+                file_name="actualizare_preturi_gomag.csv",
+                mime="text/csv",
+            )
     st.markdown("---")
 
     # ---- CONFIGURARE IMPORT ----
@@ -747,11 +1315,54 @@ elif st.session_state.step == 2:
     col_cfg1, col_cfg2, col_cfg3 = st.columns(3)
 
     with col_cfg1:
-        category_name = st.text_input(
-            "📂 Categorie Gomag:",
-            value="Rucsacuri Anti-Furt",
-            help="Numele exact al categoriei din Gomag",
-        )
+        # Categoriile vin din indexul persistent (fără browser)
+        category_index = CategoryIndex()
+        if category_index.is_stale() and gomag_ok:
+            GomagImporter().refresh_categories_async()
+
+        if category_index.categories:
+            cat_paths = [c['path'] for c in category_index.categories]
+            suggested = category_index.best_match(
+                "Rucsacuri Anti-Furt"
+            )
+            first = store.records(collection, limit=1)
+            if first:
+                suggested = (
+                    category_index.match_product(
+                        store.get(first[0].id)
+                    )
+                    or suggested
+                )
+            selected_path = st.selectbox(
+                "📂 Categorie Gomag:",
+                options=cat_paths,
+                index=(
+                    cat_paths.index(suggested['path'])
+                    if suggested else 0
+                ),
+                help="Din indexul local de categorii Gomag",
+            )
+            category_name = category_index.categories[
+                cat_paths.index(selected_path)
+            ]['name']
+        else:
+            category_name = st.text_input(
+                "📂 Categorie Gomag:",
+                value="Rucsacuri Anti-Furt",
+                help="Numele exact al categoriei din Gomag",
+            )
+
+        if category_index.is_refreshing():
+            st.caption("🔄 Categoriile se actualizează în fundal...")
+        elif st.button("🔄 Reîmprospătează categoriile"):
+            GomagImporter().refresh_categories_async(force=True)
+            st.caption("🔄 Actualizare pornită în fundal")
+        elif category_index.is_stale() and category_index.retry_in():
+            st.caption(
+                "⚠️ Ultima actualizare a categoriilor a eșuat; "
+                "reîncerc automat în "
+                f"{category_index.retry_in() / 60:.0f} min"
+            )
 
     with col_cfg2:
         brand_name = st.text_input(
@@ -766,13 +1377,15 @@ elif st.session_state.step == 2:
             options=[
                 "Descarcă CSV (recomandat)",
                 "Descarcă Excel",
+                "Descarcă doar diferențele (CSV)",
                 "Upload automat în Gomag",
             ],
             index=0,
             help=(
                 "CSV/Excel: descarci fișierul și îl imporți "
-                "manual în Gomag. Upload automat: se face "
-                "prin browser automation."
+                "manual în Gomag. Diferențe: doar produsele noi "
+                "și celulele schimbate față de exportul Gomag. "
+                "Upload automat: se face prin browser automation."
             ),
         )
 
@@ -789,27 +1402,27 @@ elif st.session_state.step == 2:
     st.markdown("---")
 
     # ---- TABEL PRODUSE PENTRU VERIFICARE ----
-    st.subheader(f"📋 Produse de importat ({len(products)})")
-
-    display_data = []
-    for p in products:
-        colors_str = ', '.join(p.get('colors', [])[:3])
-        if len(p.get('colors', [])) > 3:
-            colors_str += f" +{len(p['colors']) - 3}"
-
-        display_data.append({
-            'Import': True,
-            'Nume': p.get('name', 'N/A')[:60],
-            'SKU': p.get('sku', 'N/A'),
-            'Preț (LEI)': round(
-                float(p.get('final_price', 1.0)), 2
-            ),
-            'Culori': colors_str or 'N/A',
-            'Imagini': len(p.get('images', [])),
-            'Sursă': p.get('source_site', 'N/A'),
-        })
+    col_q2, col_site2 = st.columns([3, 1])
+    with col_q2:
+        table_query = st.text_input(
+            "🔎 Caută după nume, SKU sau site:",
+            key="import_query",
+            help="Se exportă doar produsele afișate și bifate",
+        )
+    with col_site2:
+        table_site = st.selectbox(
+            "🌐 Site:",
+            options=[''] + store.sites(collection),
+            format_func=lambda x: x or "Toate",
+            key="import_site",
+        )
 
-    df_display = pd.DataFrame(display_data)
+    # Tabelul e în cache până la următoarea modificare a depozitului
+    records, df_display, df_meta = review_table(
+        store, store.path, store.version(), collection,
+        table_query, table_site,
+    )
+    st.subheader(f"📋 Produse de importat ({len(records)})")
 
     edited_df = st.data_editor(
         df_display,
@@ -839,62 +1452,42 @@ elif st.session_state.step == 2:
     st.markdown("---")
 
     # ---- FILTRARE PRODUSE SELECTATE ----
-    products_to_import = []
-    if edited_df is not None:
-        for i, row in edited_df.iterrows():
-            if row.get('Import', True):
-                if i < len(products):
-                    try:
-                        new_price = float(
-                            row.get('Preț (LEI)', 1.0)
-                        )
-                        products[i]['final_price'] = new_price
-                    except (ValueError, TypeError):
-                        pass
-                    products_to_import.append(products[i])
+    # Vectorizat pe coloane (fără iterrows); prețurile modificate se
+    # salvează într-o singură tranzacție
+    selected_ids = []
+    final_count = 0
+    if edited_df is not None and len(edited_df):
+        selected = edited_df['Import'].fillna(True).astype(bool)
+        new_prices = pd.to_numeric(
+            edited_df['Preț (LEI)'], errors='coerce'
+        )
+        changed = (
+            selected & new_prices.notna()
+            & new_prices.ne(df_display['Preț (LEI)'])
+        )
+        if changed.any():
+            store.update_prices(dict(zip(
+                df_meta.loc[changed, 'id'].tolist(),
+                new_prices[changed].tolist(),
+            )))
+
+        # Numărul de rânduri se știe din rezumate; produsele complete
+        # (și expandarea variantelor) se încarcă doar la generare
+        selected_ids = df_meta.loc[selected, 'id'].tolist()
+        variants = df_meta.loc[selected, 'variants']
+        final_count = int(
+            variants.where(variants > 1, 1).sum()
+            if import_variants else selected.sum()
+        )
 
-    # Expandăm variante dacă necesar
-    final_products = []
-    if import_variants:
-        for product in products_to_import:
-            color_variants = product.get('color_variants', [])
-            if color_variants and len(color_variants) > 1:
-                for variant in color_variants:
-                    vp = product.copy()
-                    v_name = variant.get('name', '')
-                    vp['name'] = (
-                        f"{product['name']} - {v_name}"
-                    )
-                    vp['sku'] = (
-                        f"{product['sku']}-"
-                        f"{v_name.upper()[:5]}"
-                        if product.get('sku')
-                        else ''
-                    )
-                    vp['colors'] = [v_name]
-                    if variant.get('image'):
-                        v_img = make_absolute_url(
-                            variant['image'],
-                            product.get('source_url', ''),
-                        )
-                        vp['images'] = (
-                            [v_img]
-                            + [
-                                img
-                                for img in product.get(
-                                    'images', []
-                                )
-                                if img != v_img
-                            ]
-                        )
-                    final_products.append(vp)
-            else:
-                final_products.append(product)
-    else:
-        final_products = products_to_import
+    # Cheia exporturilor memoizate: selecția + versiunea depozitului
+    # (orice editare de preț / produs schimbă versiunea)
+    selection_hash = hashlib.sha1(
+        repr(selected_ids).encode('utf-8')
+    ).hexdigest()
 
     st.write(
-        f"**{len(final_products)} produse pregătite "
+        f"**{final_count} produse pregătite "
         f"pentru export/import**"
     )
 
@@ -908,18 +1501,20 @@ elif st.session_state.step == 2:
     if import_method == "Descarcă CSV (recomandat)":
         if st.button(
             f"📥 Generează CSV Gomag "
-            f"({len(final_products)} produse)",
+            f"({final_count} produse)",
             type="primary",
             width='stretch',
-            disabled=len(final_products) == 0,
+            disabled=final_count == 0,
         ):
-            csv_bytes = importer.generate_csv_file(
-                final_products, category_name, brand_name
+            csv_bytes, df_preview, exported = build_export(
+                store, importer, store.path, store.version(),
+                selection_hash, selected_ids, import_variants,
+                category_name, brand_name, 'csv',
             )
 
             st.success(
                 f"✅ CSV generat cu "
-                f"{len(final_products)} produse!"
+                f"{exported} produse!"
             )
 
             st.download_button(
@@ -929,46 +1524,30 @@ elif st.session_state.step == 2:
                 mime="text/csv",
             )
 
-            # Preview
-            df_preview = importer.generate_gomag_csv(
-                final_products, category_name, brand_name
-            )
+            # Preview (rândurile calculate deja la generarea CSV)
             with st.expander("👁️ Preview CSV"):
-                preview_cols = [
-                    'Cod Produs (SKU)',
-                    'Denumire Produs',
-                    'Pret Produs: Descriere',
-                    'Atribute: Culoare (variante de produs)',
-                    'Stoc Cantitativ',
-                    'Activ in Magazin',
-                    'Categorie / Categorii',
-                    'Marca (Brand)',
-                    'URL Poza de Produs',
-                ]
-                available_cols = [
-                    c for c in preview_cols
-                    if c in df_preview.columns
-                ]
                 st.dataframe(
-                    df_preview[available_cols],
+                    df_preview,
                     width='stretch',
                 )
 
     elif import_method == "Descarcă Excel":
         if st.button(
             f"📥 Generează Excel Gomag "
-            f"({len(final_products)} produse)",
+            f"({final_count} produse)",
             type="primary",
             width='stretch',
-            disabled=len(final_products) == 0,
+            disabled=final_count == 0,
         ):
-            excel_bytes = importer.generate_excel_file(
-                final_products, category_name, brand_name
+            excel_bytes, _, exported = build_export(
+                store, importer, store.path, store.version(),
+                selection_hash, selected_ids, import_variants,
+                category_name, brand_name, 'xlsx',
             )
 
             st.success(
                 f"✅ Excel generat cu "
-                f"{len(final_products)} produse!"
+                f"{exported} produse!"
             )
 
             st.download_button(
@@ -981,6 +1560,81 @@ elif st.session_state.step == 2:
                 ),
             )
 
+    elif import_method == "Descarcă doar diferențele (CSV)":
+        gomag_export = st.file_uploader(
+            "Exportul de produse din Gomag (CSV / XLSX)",
+            type=['csv', 'xlsx'],
+            key="gomag_export",
+            help=(
+                "Produsele sunt potrivite după SKU, apoi după "
+                "'Produs: Cod extern' (URL-ul sursă)."
+            ),
+        )
+        catalog = None
+        if gomag_export:
+            catalog_id = (gomag_export.name, gomag_export.size)
+            cached = st.session_state.get('gomag_catalog')
+            if cached and cached[0] == catalog_id:
+                catalog = cached[1]
+            else:
+                try:
+                    with st.spinner("Citesc exportul Gomag..."):
+                        catalog = GomagCatalog.from_export(
+                            gomag_export.getvalue(), gomag_export.name
+                        )
+                    st.session_state.gomag_catalog = (catalog_id, catalog)
+                except Exception as e:
+                    st.error(f"❌ Export Gomag invalid: {str(e)}")
+            if catalog is not None:
+                st.caption(
+                    f"📚 {len(catalog)} produse în Gomag, "
+                    f"{len(catalog.columns)} coloane comparate"
+                )
+
+        if st.button(
+            f"📥 Generează diferențele "
+            f"({final_count} produse)",
+            type="primary",
+            width='stretch',
+            disabled=final_count == 0 or catalog is None,
+        ):
+            new_csv, update_csv, diff_stats, changed_columns = (
+                build_diff_export(
+                    store, importer, catalog, store.path,
+                    store.version(), selection_hash, selected_ids,
+                    import_variants, category_name, brand_name,
+                    st.session_state.gomag_catalog[0],
+                )
+            )
+            st.success(
+                f"✅ {diff_stats['new']} produse noi, "
+                f"{diff_stats['changed']} modificate, "
+                f"{diff_stats['unchanged']} neschimbate"
+            )
+            if changed_columns:
+                st.caption(
+                    "Coloane modificate: " + ", ".join(
+                        f"{c} ({n})" for c, n in changed_columns
+                    )
+                )
+            col_d1, col_d2 = st.columns(2)
+            with col_d1:
+                st.download_button(
+                    label="📥 Produse noi (CSV complet)",
+                    data=new_csv,
+                    file_name="import_gomag_noi.csv",
+                    mime="text/csv",
+                    disabled=not diff_stats['new'],
+                )
+            with col_d2:
+                st.download_button(
+                    label="📥 Actualizări (doar celulele schimbate)",
+                    data=update_csv,
+                    file_name="import_gomag_actualizari.csv",
+                    mime="text/csv",
+                    disabled=not diff_stats['changed'],
+                )
+
     elif import_method == "Upload automat în Gomag":
         st.warning(
             "⚠️ Upload-ul automat necesită ca Gomag să aibă "
@@ -989,36 +1643,97 @@ elif st.session_state.step == 2:
         )
 
         if st.button(
-            f"🚀 Upload CSV automat "
-            f"({len(final_products)} produse)",
+            f"🚀 Upload automat în loturi "
+            f"({final_count} produse)",
             type="primary",
             width='stretch',
-            disabled=len(final_products) == 0,
+            disabled=final_count == 0,
         ):
-            csv_bytes = importer.generate_csv_file(
-                final_products, category_name, brand_name
+            final_products = load_final_products(
+                store, selected_ids, import_variants
             )
+            uploader = GomagBatchUploader(importer)
+            upload_progress = st.progress(0.0)
+            upload_status = st.empty()
 
-            with st.spinner("Se conectează la Gomag..."):
-                if importer.login():
-                    success = importer.upload_csv_to_gomag(
-                        csv_bytes
+            def _on_chunk(done, total_chunks, chunk):
+                upload_progress.progress(
+                    done / total_chunks if total_chunks else 1.0
+                )
+                if chunk:
+                    upload_status.text(
+                        f"📤 Lot {chunk['index']}/"
+                        f"{len(uploader.chunks)} "
+                        f"({chunk['count']} produse)..."
                     )
-                    if success:
-                        st.success("✅ CSV uploadat cu succes!")
-                    else:
-                        st.error(
-                            "❌ Upload eșuat. Descarcă CSV-ul "
-                            "și importă manual."
-                        )
-                        st.download_button(
-                            label="📥 Descarcă CSV (fallback)",
-                            data=csv_bytes,
-                            file_name="import_gomag.csv",
-                            mime="text/csv",
-                        )
-                else:
-                    st.error("❌ Login Gomag eșuat!")
+
+            with st.spinner("Se conectează la Gomag..."):
+                chunks = uploader.upload(
+                    final_products, category_name, brand_name,
+                    progress_callback=_on_chunk,
+                )
+            try:
+                metrics.write()
+            except OSError:
+                pass
+
+            summary = uploader.summary()
+            upload_status.text(
+                f"✅ {summary['done']}/{summary['chunks']} loturi "
+                f"încărcate ({summary['imported_products']} produse)"
+            )
+            st.session_state.import_results.extend(
+                uploader.imported_skus()
+            )
+
+            if chunks:
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            'Lot': c['index'],
+                            'Produse': c['count'],
+                            'Status': c['status'],
+                            'Încercări': c['attempts'],
+                            'Durată (s)': c['duration'],
+                            'Create': (c['result'] or {}).get(
+                                'created', ''
+                            ),
+                            'Actualizate': (c['result'] or {}).get(
+                                'updated', ''
+                            ),
+                            'Eșuate': (c['result'] or {}).get(
+                                'failed', ''
+                            ),
+                            'Eroare': c['error'],
+                        }
+                        for c in chunks
+                    ]),
+                    width='stretch',
+                    hide_index=True,
+                )
+
+            failed = uploader.failed_chunks()
+            if not chunks:
+                st.error("❌ Nimic de încărcat.")
+            elif not failed:
+                st.success("✅ Toate loturile au fost uploadate!")
+            else:
+                st.error(
+                    f"❌ {len(failed)} loturi eșuate. Descarcă "
+                    f"CSV-ul lor și importă manual."
+                )
+                failed_products = [
+                    p for c in failed
+                    for p in final_products[c['start']:c['end']]
+                ]
+                st.download_button(
+                    label="📥 Descarcă CSV loturi eșuate (fallback)",
+                    data=importer.generate_csv_file(
+                        failed_products, category_name, brand_name
+                    ),
+                    file_name="import_gomag_esuate.csv",
+                    mime="text/csv",
+                )
 
             importer.close()
 
@@ -0,0 +1,277 @@
+# benchmarks/bench_gomag_rows.py
+"""
+Benchmark: construcția rândurilor Gomag pe un catalog sintetic.
+
+Compară implementarea veche (per produs, 3 treceri regex pe descriere,
+brand_map reconstruit la fiecare apel) cu GomagRowBuilder (lot,
+regex precompilat, descriere curățată o singură dată) și verifică
+că rândurile rezultate sunt identice.
+
+Rulare:
+    python -m benchmarks.bench_gomag_rows --products 10000
+    python -m benchmarks.bench_gomag_rows --json rezultat.json
+"""
+import re
+import sys
+import json
+import time
+import random
+import argparse
+
+from gomag.importer import GomagImporter
+from gomag.row_builder import GomagRowBuilder
+
+
+_WORDS = (
+    "anti theft backpack laptop compartment water resistant rpet "
+    "usb charging port hidden zipper travel bag durable padded "
+    "shoulder straps reflective strip lightweight urban design"
+).split()
+_COLORS = ['black', 'grey', 'navy', 'red', 'green', 'blue', 'white']
+_SITES = [
+    'xdconnects', 'pfconcept', 'promobox', 'andapresent', 'midocean',
+    'sipec', 'stricker', 'stamina', 'utteam', 'clipper', 'psi',
+    'shop.example.com',
+]
+
+
+def make_catalogue(n: int, seed: int = 42) -> list:
+    """Catalog sintetic cu descrieri HTML de mărimi realiste."""
+    rnd = random.Random(seed)
+    products = []
+    for i in range(n):
+        name = " ".join(rnd.choices(_WORDS, k=rnd.randint(3, 7))).title()
+        paragraphs = []
+        for _ in range(rnd.randint(2, 12)):
+            sentence = " ".join(rnd.choices(_WORDS, k=rnd.randint(8, 30)))
+            paragraphs.append(
+                f"<p class=\"txt\">  {sentence.capitalize()}.\n"
+                f"<strong>{rnd.choice(_WORDS)}</strong> </p>"
+            )
+        specs = {
+            f"{rnd.choice(_WORDS).title()} {k}": rnd.choice(_WORDS)
+            for k in range(rnd.randint(0, 12))
+        }
+        price = round(rnd.uniform(0, 120), 2)
+        products.append({
+            'name': name,
+            'description': "<div>" + "\n".join(paragraphs) + "</div>",
+            'sku': f"SKU-{i:06d}",
+            'original_price': price,
+            'final_price': round(price * 2, 2) if price else 1.0,
+            'images': [
+                f"https://cdn.example.com/p/{i}/{k}.jpg"
+                for k in range(rnd.randint(0, 14))
+            ],
+            'colors': rnd.sample(_COLORS, rnd.randint(0, 5)),
+            'specifications': specs,
+            'material': rnd.choice(['', 'rPET', 'Polyester 600D']),
+            'weight': rnd.choice(['', '0.8 kg', '1.25kg', 'n/a']),
+            'dimensions': rnd.choice(['', '30 x 45 x 15 cm']),
+            'source_url': f"https://{rnd.choice(_SITES)}/p/{i}",
+            'source_site': rnd.choice(_SITES),
+        })
+    return products
+
+
+# ══════════════════════════════════════════
+# REFERINȚĂ: implementarea per produs dinaintea GomagRowBuilder
+# ══════════════════════════════════════════
+
+def _legacy_full_description(product: dict) -> str:
+    parts = []
+    raw_desc = product.get('description', '')
+    if raw_desc:
+        clean = re.sub(r'<[^>]+>', ' ', raw_desc)
+        clean = re.sub(r'\s+', ' ', clean).strip()
+        if clean and len(clean) > 10:
+            parts.append(f"<p>{clean}</p>")
+    specs = product.get('specifications', {})
+    if specs:
+        parts.append("<h3>Specificații</h3>")
+        parts.append("<ul>")
+        for key, val in specs.items():
+            if key and val:
+                parts.append(f"<li><strong>{key}:</strong> {val}</li>")
+        parts.append("</ul>")
+    if product.get('material'):
+        parts.append(
+            f"<p><strong>Material:</strong> {product['material']}</p>"
+        )
+    if product.get('dimensions'):
+        parts.append(
+            f"<p><strong>Dimensiuni:</strong> {product['dimensions']}</p>"
+        )
+    if product.get('weight'):
+        parts.append(
+            f"<p><strong>Greutate:</strong> {product['weight']}</p>"
+        )
+    colors = product.get('colors', [])
+    if colors:
+        parts.append(
+            f"<p><strong>Culori disponibile:</strong> "
+            f"{', '.join(colors)}</p>"
+        )
+    if not parts:
+        name = product.get('name', 'Produs importat')
+        parts.append(
+            f"<p>{name}. Produs de calitate superioară, "
+            f"ideal pentru protecția bunurilor personale.</p>"
+        )
+    return "\n".join(parts)
+
+
+def _legacy_short_description(product: dict) -> str:
+    parts = []
+    raw_desc = product.get('description', '')
+    if raw_desc:
+        clean = re.sub(r'<[^>]+>', ' ', raw_desc)
+        clean = re.sub(r'\s+', ' ', clean).strip()
+        if clean and len(clean) > 10:
+            first = clean.split('.')[0]
+            if len(first) > 20:
+                parts.append(first.strip() + '.')
+    specs = product.get('specifications', {})
+    if specs and not parts:
+        sp = []
+        for k, v in list(specs.items())[:4]:
+            sp.append(f"{k}: {v}")
+        parts.append(" | ".join(sp))
+    if product.get('material') and not parts:
+        parts.append(f"Material: {product['material']}")
+    colors = product.get('colors', [])
+    if colors:
+        parts.append(
+            f"Disponibil în {len(colors)} culori: "
+            f"{', '.join(colors[:3])}"
+            + ("..." if len(colors) > 3 else "")
+        )
+    if not parts:
+        name = product.get('name', 'Produs importat')
+        parts.append(f"{name} - produs cu protecție anti-furt.")
+    return " | ".join(parts)[:250]
+
+
+def _legacy_feed_description(product: dict) -> str:
+    name = product.get('name', '')
+    colors = product.get('colors', [])
+    specs = product.get('specifications', {})
+    parts = [name]
+    if colors:
+        parts.append(f"Culori: {', '.join(colors[:3])}")
+    for k, v in list(specs.items())[:2]:
+        parts.append(f"{k}: {v}")
+    return ". ".join(parts)[:200]
+
+
+def legacy_row(product: dict, category_name: str = "",
+               brand: str = "") -> list:
+    sku = product.get('sku', '')
+    name = product.get('name', 'Produs Importat')
+    description = _legacy_full_description(product)
+    short_desc = _legacy_short_description(product)
+    feed_desc = _legacy_feed_description(product)
+    images = product.get('images', [])
+    images_url = '|'.join(images[:10]) if images else ''
+    colors = product.get('colors', [])
+    colors_str = ','.join(colors) if colors else ''
+    price = product.get('final_price', 1.0)
+    if price <= 0:
+        price = 1.0
+    price_str = f"{price:.2f}"
+    buy_price = product.get('original_price', 0)
+    buy_price_str = f"{buy_price:.2f}" if buy_price > 0 else ""
+    weight = product.get('weight', '')
+    weight_str = ""
+    if weight:
+        wm = re.search(r'([\d.]+)', str(weight))
+        if wm:
+            weight_str = wm.group(1)
+    kw_parts = [name.lower().replace('-', ' ')]
+    if 'anti' in name.lower():
+        kw_parts.extend(["anti-furt", "anti-theft"])
+    if 'rucsac' in name.lower() or 'backpack' in name.lower():
+        kw_parts.extend(["rucsac", "ghiozdan"])
+    kw_parts.extend(["protectie", "siguranta"])
+    if colors:
+        kw_parts.extend(colors[:3])
+    keywords = ", ".join(kw_parts)
+    meta_desc = short_desc[:160] if short_desc else name[:160]
+    if not brand:
+        source = product.get('source_site', '')
+        brand_map = {
+            'xdconnects': 'XD Design', 'pfconcept': 'PF Concept',
+            'promobox': 'Promobox', 'andapresent': 'Anda Present',
+            'midocean': 'Midocean', 'sipec': 'Sipec',
+            'stricker': 'Stricker', 'stamina': 'Stamina',
+            'utteam': 'UT Team', 'clipper': 'Clipper', 'psi': 'PSI',
+        }
+        brand = brand_map.get(source, source)
+    return [
+        sku, '', '', '', name, description, short_desc, images_url,
+        '', '', '', '', feed_desc, colors_str, keywords, price_str,
+        '', '', '', '', '', '', '2-5 zile lucratoare', 'zile', '',
+        'buc', product.get('source_url', ''), buy_price_str, '', '0',
+        '', '', '1', '', '', '19', 'RON', '1', '', 'In Stoc', '0',
+        '0', '1', '1', weight_str, '1', '', '', category_name, brand,
+        name[:70], meta_desc, keywords[:250], name[:100], '', '',
+    ]
+
+
+# ══════════════════════════════════════════
+# RULARE
+# ══════════════════════════════════════════
+
+def _best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(n_products: int, repeat: int, category: str = "Rucsacuri") -> dict:
+    products = make_catalogue(n_products)
+    builder = GomagRowBuilder(GomagImporter.GOMAG_COLUMNS, category)
+
+    legacy_rows = [legacy_row(p, category) for p in products]
+    batch_rows = list(builder.iter_rows(products))
+    identical = legacy_rows == batch_rows
+    del legacy_rows, batch_rows
+
+    t_legacy = _best_of(
+        lambda: [legacy_row(p, category) for p in products], repeat
+    )
+    t_batch = _best_of(
+        lambda: list(builder.iter_rows(products)), repeat
+    )
+    return {
+        'products': n_products,
+        'repeat': repeat,
+        'identical_output': identical,
+        'legacy_seconds': round(t_legacy, 4),
+        'batch_seconds': round(t_batch, 4),
+        'legacy_rows_per_sec': round(n_products / t_legacy),
+        'batch_rows_per_sec': round(n_products / t_batch),
+        'speedup': round(t_legacy / t_batch, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--products', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help="Scrie rezultatul într-un fișier")
+    args = parser.parse_args(argv)
+
+    result = run(args.products, args.repeat)
+    print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    return 0 if result['identical_output'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
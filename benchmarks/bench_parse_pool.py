@@ -0,0 +1,119 @@
+# benchmarks/bench_parse_pool.py
+"""
+Benchmark: etapa CPU din scrapers.pipeline (parsare + extragere).
+
+Paginile înregistrate din benchmarks/fixtures sunt parsate de
+scrape()-ul fiecărui scraper, fără browser și fără rețea:
+- serial, în procesul curent (ca bucla veche din app.py)
+- în ProcessPoolExecutor cu 1, 2, 4 ... N procese
+Raportează pagini/secundă și accelerarea față de rularea serială.
+
+Rulare:
+    python -m benchmarks.bench_parse_pool --pages 240
+    python -m benchmarks.bench_parse_pool --workers 1 4 16 --json r.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.replay import FIXTURES_DIR
+from scrapers import registry
+from scrapers.pipeline import parse_page, _init_worker
+
+
+def load_jobs(pages: int) -> list:
+    """[(scraper, url, html bytes)] repetate până la `pages` pagini."""
+    with open(os.path.join(FIXTURES_DIR, 'manifest.json'),
+              encoding='utf-8') as f:
+        manifest = json.load(f)
+    registry.ensure_loaded()
+    base = []
+    for supplier, item in sorted(manifest.items()):
+        name = registry.resolve(item['url'])
+        cls = registry._scrapers.get(name)
+        if cls is None or not cls.SPLIT_STAGES:
+            continue
+        with open(os.path.join(FIXTURES_DIR, item['file']), 'rb') as f:
+            base.append((name, item['url'], f.read()))
+    return [base[i % len(base)] for i in range(pages)]
+
+
+def run_serial(jobs: list) -> float:
+    t0 = time.perf_counter()
+    for name, url, html in jobs:
+        parse_page(name, url, html)
+    return time.perf_counter() - t0
+
+
+def run_pool(jobs: list, workers: int) -> float:
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    ) as pool:
+        # Pornim procesele înainte de cronometrare
+        list(pool.map(parse_page, *zip(*jobs[:workers])))
+        t0 = time.perf_counter()
+        futures = [pool.submit(parse_page, *job) for job in jobs]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=240)
+    parser.add_argument(
+        '--workers', type=int, nargs='+',
+        help="Numărul de procese (implicit 1, 2, 4 ... nuclee)",
+    )
+    parser.add_argument('--json', help="Salvează raportul JSON")
+    args = parser.parse_args(argv)
+
+    import streamlit.logger
+    streamlit.logger.set_log_level('error')
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted(
+        {w for w in (1, 2, 4, 8, 16, cpus) if w <= cpus}
+    )
+    jobs = load_jobs(args.pages)
+
+    run_serial(jobs[:len(jobs) // 10 or 1])   # încălzire
+    serial_s = run_serial(jobs)
+    report = {
+        'pages': len(jobs),
+        'cpus': cpus,
+        'serial': {'seconds': round(serial_s, 3),
+                   'pages_per_s': round(len(jobs) / serial_s, 1)},
+        'pool': [],
+    }
+    print(f"{len(jobs)} pagini, {cpus} nuclee")
+    print(f"{'mod':<12}{'s':>10}{'pagini/s':>12}{'x serial':>10}")
+    print(f"{'serial':<12}{serial_s:>10.2f}"
+          f"{len(jobs) / serial_s:>12.1f}{1.0:>10.2f}")
+    for w in workers:
+        pool_s = run_pool(jobs, w)
+        report['pool'].append({
+            'workers': w,
+            'seconds': round(pool_s, 3),
+            'pages_per_s': round(len(jobs) / pool_s, 1),
+            'speedup': round(serial_s / pool_s, 2),
+        })
+        print(f"{f'pool x{w}':<12}{pool_s:>10.2f}"
+              f"{len(jobs) / pool_s:>12.1f}{serial_s / pool_s:>10.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
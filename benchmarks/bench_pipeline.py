@@ -0,0 +1,352 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark end-to-end: scrapere → traducere → export Gomag, offline.
+
+Pentru fiecare furnizor din benchmarks/fixtures/manifest.json
+(11 scrapere dedicate + generic) pagina înregistrată e servită de un
+server HTTP local, iar scraperul primește un ReplayDriver în locul
+Chrome. Traducerea e un stub, time.sleep doar înregistrează pauza cerută.
+
+Etape cronometrate (mediana pe --repeat rulări):
+    fetch     - round-trip-uri către "browser" / HTTP
+    parse     - construcția BeautifulSoup
+    extract   - restul timpului din scrape() (selectori, regex, produs)
+    translate - translate_product_data (stub, fără rețea)
+    export    - CSV + XLSX Gomag pentru toate produsele
+
+Raportul JSON poate fi comparat între commit-uri:
+    python -m benchmarks.bench_pipeline --json bench.json
+    python -m benchmarks.bench_pipeline --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import logging
+import platform
+import statistics
+import subprocess
+import argparse
+from datetime import datetime
+
+from benchmarks.replay import (
+    FIXTURES_DIR, ReplayServer, ReplayDriver, StageClock,
+    replay_environment,
+)
+
+
+SCRAPE_STAGES = ('fetch', 'parse', 'extract', 'translate')
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+def _as_list(result) -> list:
+    if isinstance(result, list):
+        return [p for p in result if isinstance(p, dict)]
+    return [result] if isinstance(result, dict) else []
+
+
+def _field_checks(products: list) -> dict:
+    """Calitatea extragerii: ce câmpuri a găsit scraperul."""
+    if not products:
+        return {'products': 0}
+    p = products[0]
+    return {
+        'products': len(products),
+        'name': bool(p.get('name')),
+        'sku': p.get('sku', ''),
+        'price': p.get('original_price', 0),
+        'images': len(p.get('images') or []),
+        'colors': len(p.get('colors') or []),
+        'specifications': len(p.get('specifications') or {}),
+        'description_chars': len(p.get('description') or ''),
+    }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+# ══════════════════════════════════════════
+# RULARE
+# ══════════════════════════════════════════
+
+def run_supplier(supplier: str, url: str, server: ReplayServer,
+                 real_sleeps: bool = False) -> dict:
+    """O rulare completă (scrape + traducere) pentru un furnizor."""
+    from scrapers import get_scraper
+    from utils.helpers import match_scraper
+    import utils.translator as translator
+
+    clock = StageClock()
+    scraper_name = match_scraper(url)
+    scraper = get_scraper(scraper_name)
+    driver = ReplayDriver(server, clock)
+    scraper.driver = driver
+    # Fiecare repetare măsoară un fetch real, nu cache-ul de pagini
+    scraper.use_page_cache = False
+
+    parse_modules = {
+        sys.modules[type(scraper).__module__],
+        sys.modules['scrapers.base_scraper'],
+    }
+    with replay_environment(server, clock, real_sleeps,
+                            parse_modules):
+        t0 = time.perf_counter()
+        try:
+            result = scraper.scrape(url)
+        except Exception as e:
+            result = None
+            logging.getLogger(__name__).warning(
+                "%s: %s: %s", supplier, type(e).__name__, e
+            )
+        scrape_s = time.perf_counter() - t0
+
+        translator._translation_cache.clear()
+        products = _as_list(result)
+        with clock.measure('translate'):
+            products = [
+                translator.translate_product_data(p) for p in products
+            ]
+    scraper.driver = None
+
+    extract_s = max(
+        0.0,
+        scrape_s - clock.get('fetch') - clock.get('parse')
+        - clock.get('sleep'),
+    )
+    return {
+        'scraper': scraper_name,
+        'stages': {
+            'fetch': clock.get('fetch'),
+            'parse': clock.get('parse'),
+            'extract': extract_s,
+            'translate': clock.get('translate'),
+        },
+        'scrape_seconds': scrape_s,
+        'sleep_requested_s': round(clock.get('sleep_requested'), 2),
+        'sleep_calls': clock.count('sleep_requested'),
+        'translate_calls': clock.count('translate_calls'),
+        'driver_calls': dict(driver.calls),
+        'fields': _field_checks(products),
+        'products': products,
+    }
+
+
+def run(repeat: int = 5, suppliers: list = None,
+        real_sleeps: bool = False) -> dict:
+    from gomag.importer import GomagImporter
+
+    runs = {}
+    export_runs = []
+    with ReplayServer(FIXTURES_DIR) as server:
+        manifest = server.manifest
+        names = [s for s in manifest if not suppliers or s in suppliers]
+        # Prima trecere e de încălzire (importuri lazy, regex-uri)
+        for supplier in names:
+            run_supplier(supplier, manifest[supplier]['url'], server)
+        for _ in range(repeat):
+            all_products = []
+            for supplier in names:
+                res = run_supplier(
+                    supplier, manifest[supplier]['url'], server,
+                    real_sleeps,
+                )
+                runs.setdefault(supplier, []).append(res)
+                all_products.extend(res['products'])
+
+            importer = GomagImporter()
+            t0 = time.perf_counter()
+            csv_bytes = importer.generate_csv_file(all_products)
+            xlsx_bytes = importer.generate_excel_file(all_products)
+            export_runs.append({
+                'seconds': time.perf_counter() - t0,
+                'rows': len(all_products),
+                'csv_bytes': len(csv_bytes),
+                'xlsx_bytes': len(xlsx_bytes),
+            })
+        http_requests = server.requests
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'real_sleeps': real_sleeps,
+        },
+        'suppliers': {},
+        'totals': {},
+    }
+    totals = dict.fromkeys(SCRAPE_STAGES, 0.0)
+    sleep_total = 0.0
+    for supplier, rs in runs.items():
+        stages = {
+            stage: statistics.median(r['stages'][stage] for r in rs)
+            for stage in SCRAPE_STAGES
+        }
+        for stage, val in stages.items():
+            totals[stage] += val
+        last = rs[-1]
+        sleep_total += last['sleep_requested_s']
+        report['suppliers'][supplier] = {
+            'scraper': last['scraper'],
+            'stages_ms': {k: _ms(v) for k, v in stages.items()},
+            'total_ms': _ms(sum(stages.values())),
+            'sleep_requested_s': last['sleep_requested_s'],
+            'sleep_calls': last['sleep_calls'],
+            'translate_calls': last['translate_calls'],
+            'driver_calls': last['driver_calls'],
+            'fields': last['fields'],
+        }
+
+    export_s = statistics.median(e['seconds'] for e in export_runs)
+    totals['export'] = export_s
+    report['totals'] = {
+        'stages_ms': {k: _ms(v) for k, v in totals.items()},
+        'total_ms': _ms(sum(totals.values())),
+        'sleep_requested_s': round(sleep_total, 2),
+        'products': export_runs[-1]['rows'] if export_runs else 0,
+        'csv_bytes': export_runs[-1]['csv_bytes'] if export_runs else 0,
+        'xlsx_bytes': export_runs[-1]['xlsx_bytes'] if export_runs else 0,
+        'http_requests': http_requests,
+    }
+    return report
+
+
+# ══════════════════════════════════════════
+# AFIȘARE / COMPARARE
+# ══════════════════════════════════════════
+
+def format_report(report: dict) -> str:
+    head = (
+        f"{'furnizor':<13}" + ''.join(f"{s:>11}" for s in SCRAPE_STAGES)
+        + f"{'total':>11}{'sleep(s)':>10}{'js':>5}  câmpuri"
+    )
+    lines = [head, '-' * len(head)]
+    for supplier, r in report['suppliers'].items():
+        f = r['fields']
+        fields = (
+            f"n={f.get('products', 0)} img={f.get('images', 0)} "
+            f"spec={f.get('specifications', 0)} "
+            f"pret={f.get('price', 0)}"
+        )
+        lines.append(
+            f"{supplier:<13}"
+            + ''.join(f"{r['stages_ms'][s]:>11.2f}" for s in SCRAPE_STAGES)
+            + f"{r['total_ms']:>11.2f}{r['sleep_requested_s']:>10.1f}"
+            + f"{r['driver_calls'].get('execute_script', 0):>5}  {fields}"
+        )
+    t = report['totals']
+    lines.append('-' * len(head))
+    lines.append(
+        f"{'TOTAL':<13}"
+        + ''.join(f"{t['stages_ms'][s]:>11.2f}" for s in SCRAPE_STAGES)
+        + f"{t['total_ms']:>11.2f}{t['sleep_requested_s']:>10.1f}"
+    )
+    lines.append(
+        f"export: {t['stages_ms']['export']:.2f} ms pentru "
+        f"{t['products']} produse (CSV {t['csv_bytes']} B, "
+        f"XLSX {t['xlsx_bytes']} B)"
+    )
+    return '\n'.join(lines)
+
+
+def compare(report: dict, baseline: dict) -> tuple:
+    """
+    Compară cu un raport anterior.
+    Returnează (text, regresia maximă în % pe total_ms per furnizor).
+    """
+    lines = [
+        f"baseline {baseline['meta'].get('commit') or '?'} → "
+        f"curent {report['meta'].get('commit') or '?'}"
+    ]
+    worst = 0.0
+    for supplier, r in report['suppliers'].items():
+        b = baseline['suppliers'].get(supplier)
+        if not b:
+            lines.append(f"{supplier:<13} (nou)")
+            continue
+        delta = r['total_ms'] - b['total_ms']
+        pct = 100.0 * delta / b['total_ms'] if b['total_ms'] else 0.0
+        worst = max(worst, pct)
+        sleep_delta = r['sleep_requested_s'] - b['sleep_requested_s']
+        line = (
+            f"{supplier:<13}{b['total_ms']:>10.2f} → "
+            f"{r['total_ms']:>10.2f} ms ({pct:+6.1f}%)"
+            f"  sleep {sleep_delta:+.1f}s"
+        )
+        changed = [
+            k for k, v in r['fields'].items()
+            if b['fields'].get(k) != v
+        ]
+        if changed:
+            line += f"  câmpuri modificate: {', '.join(changed)}"
+        lines.append(line)
+    bt = baseline['totals']['total_ms']
+    ct = report['totals']['total_ms']
+    lines.append(
+        f"{'TOTAL':<13}{bt:>10.2f} → {ct:>10.2f} ms "
+        f"({100.0 * (ct - bt) / bt if bt else 0.0:+6.1f}%)"
+    )
+    return '\n'.join(lines), worst
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--supplier', action='append',
+        help="Doar furnizorii dați (se poate repeta)",
+    )
+    parser.add_argument(
+        '--real-sleeps', action='store_true',
+        help="Execută efectiv pauzele time.sleep din scrapere",
+    )
+    parser.add_argument('--json', help="Scrie raportul într-un fișier")
+    parser.add_argument('--compare', help="Raport JSON anterior")
+    parser.add_argument(
+        '--max-regression', type=float, default=None,
+        help="Cod de ieșire 1 dacă un furnizor e mai lent cu peste N%%",
+    )
+    args = parser.parse_args(argv)
+
+    # Cache-urile învățate (selectori, pagini) nu ating cele reale
+    os.environ.setdefault(
+        'PRODUCT_IMPORTER_CACHE', tempfile.mkdtemp(prefix='bench-cache-')
+    )
+    try:
+        from streamlit import logger as st_logger
+        st_logger.set_log_level('error')
+    except Exception:
+        logging.getLogger('streamlit').setLevel(logging.ERROR)
+    report = run(args.repeat, args.supplier, args.real_sleeps)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        text, worst = compare(report, baseline)
+        print()
+        print(text)
+        if args.max_regression is not None and worst > args.max_regression:
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# benchmarks/bench_profiles.py
+"""
+Benchmark: profil Chrome persistent (utils.browser_profiles), rece vs cald.
+
+Aceleași pagini se încarcă de --runs ori, de fiecare dată într-un Chrome
+nou pe același profil: prima rulare pornește de la un profil gol, cele
+următoare găsesc JS-ul, CSS-ul și fonturile în cache-ul de pe disc.
+Se măsoară timpul driver.get și octeții transferați prin rețea
+(PerformanceResourceTiming.transferSize; 0 = servit din cache).
+
+Implicit paginile vin de la un server local cu --assets resurse statice
+de --asset-kb KB per pagină și --latency-ms întârziere per resursă
+(Cache-Control: max-age, ca un CDN). Cu --url se măsoară site-uri reale.
+Necesită Chrome / Chromium local.
+
+Rulare:
+    python -m benchmarks.bench_profiles --pages 10 --latency-ms 80
+    python -m benchmarks.bench_profiles --url https://... --url https://...
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+TRANSFER_JS = """
+return performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce((total, e) => total + (e.transferSize || 0), 0);
+"""
+
+
+def serve_site(assets: int, asset_kb: int, latency_ms: float):
+    """Server local: /p/<n> = pagină cu `assets` scripturi și stiluri comune."""
+    body = b'/*' + b'x' * (asset_kb * 1024) + b'*/'
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.startswith('/static/'):
+                time.sleep(latency_ms / 1000)
+                ctype = ('text/css' if self.path.endswith('.css')
+                         else 'application/javascript')
+                self._send(body, ctype, 'public, max-age=86400')
+                return
+            links = ''.join(
+                f'<link rel="stylesheet" href="/static/s{i}.css">'
+                f'<script src="/static/a{i}.js"></script>'
+                for i in range(assets)
+            )
+            page = (f"<html><head>{links}</head><body>"
+                    f"<h1>Produs {self.path}</h1></body></html>")
+            self._send(page.encode(), 'text/html', 'no-cache')
+
+        def _send(self, data, ctype, cache_control):
+            self.send_response(200)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            self.wfile.write(data)
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def load_pages(urls: list) -> dict:
+    """Un Chrome nou pe profilul furnizorului 'bench_profiles'."""
+    from scrapers.base_scraper import BaseScraper
+
+    scraper = BaseScraper()
+    scraper.name = 'bench_profiles'
+    scraper.driver = scraper._launch_driver()
+    seconds = 0.0
+    transferred = 0
+    try:
+        for url in urls:
+            t0 = time.perf_counter()
+            scraper.driver.get(url)
+            seconds += time.perf_counter() - t0
+            transferred += scraper.driver.execute_script(TRANSFER_JS) or 0
+    finally:
+        scraper.close()
+    return {'seconds': round(seconds, 3), 'bytes': transferred}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', action='append', default=[])
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--assets', type=int, default=8)
+    parser.add_argument('--asset-kb', type=int, default=150)
+    parser.add_argument('--latency-ms', type=float, default=80)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--json', help="Salvează raportul JSON")
+    args = parser.parse_args(argv)
+
+    # Profiluri într-un folder temporar: prima rulare e garantat rece
+    folder = tempfile.mkdtemp(prefix='bench_profiles_')
+    os.environ['PRODUCT_IMPORTER_CACHE'] = folder
+    os.environ['PRODUCT_IMPORTER_CHROME_PROFILES'] = '1'
+    httpd = None
+    urls = args.url
+    if not urls:
+        httpd = serve_site(args.assets, args.asset_kb, args.latency_ms)
+        host, port = httpd.server_address[:2]
+        urls = [f"http://{host}:{port}/p/{i}" for i in range(args.pages)]
+
+    report = {'pages': len(urls), 'runs': []}
+    print(f"{len(urls)} pagini, {args.runs} rulări pe același profil")
+    print(f"{'rulare':<10}{'s':>10}{'KB rețea':>12}{'x rece':>10}")
+    cold = None
+    try:
+        for run in range(args.runs):
+            result = load_pages(urls)
+            cold = cold or result['seconds']
+            speedup = cold / max(result['seconds'], 1e-9)
+            report['runs'].append({**result, 'speedup': round(speedup, 2)})
+            label = 'rece' if run == 0 else f'cald {run}'
+            print(f"{label:<10}{result['seconds']:>10.2f}"
+                  f"{result['bytes'] / 1024:>12.0f}{speedup:>10.2f}")
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
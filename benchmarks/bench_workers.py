@@ -0,0 +1,111 @@
+# benchmarks/bench_workers.py
+"""
+Benchmark: scalarea workerilor distribuiți (scrapers.worker).
+
+Sarcinile din coadă sunt servite de un scraper sintetic ('bench_sleep')
+care doar așteaptă --page-ms milisecunde, ca o pagină încărcată în
+browser. Pentru 1, 2, 4, 8 procese worker pe aceeași coadă SQLite se
+măsoară pagini/secundă de la enqueue până la ultima sarcină terminată;
+la o scalare liniară, accelerarea ≈ numărul de procese.
+
+Rulare:
+    python -m benchmarks.bench_workers --pages 400 --page-ms 100
+    python -m benchmarks.bench_workers --processes 1 4 16 --json r.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+from scrapers.registry import register_scraper
+from scrapers.work_queue import open_queue
+from scrapers.worker import start_local_workers
+
+
+# Domenii distincte, ca limita per domeniu să nu fie gâtul de sticlă
+DOMAINS = 32
+PAGE_SECONDS = float(os.environ.get('BENCH_PAGE_SECONDS', '0.1'))
+
+
+@register_scraper('bench_sleep', 'bench.invalid')
+class SleepScraper:
+    """Scraper sintetic: o pauză fixă, un produs."""
+
+    def scrape(self, url):
+        time.sleep(PAGE_SECONDS)
+        return {'name': url.rsplit('/', 1)[-1], 'source_url': url}
+
+    def close(self):
+        pass
+
+
+def run(processes: int, pages: int, page_ms: float) -> float:
+    folder = tempfile.mkdtemp(prefix='bench_workers_')
+    queue_url = 'sqlite:///' + os.path.join(folder, 'queue.sqlite')
+    os.environ['BENCH_PAGE_SECONDS'] = str(page_ms / 1000)
+    queue = open_queue(queue_url)
+    workers = start_local_workers(
+        processes, queue_url, idle_exit=None, per_domain=processes,
+        plugins=['benchmarks.bench_workers'],
+    )
+    try:
+        # Procesele pornesc (import, spawn) înainte de cronometrare
+        time.sleep(3)
+        t0 = time.perf_counter()
+        queue.enqueue('bench', [
+            (f"https://s{i % DOMAINS}.bench.invalid/p/{i}", 'bench_sleep')
+            for i in range(pages)
+        ])
+        collected = 0
+        while collected < pages:
+            collected += len(queue.collect('bench', limit=1000))
+            time.sleep(0.01)
+        seconds = time.perf_counter() - t0
+    finally:
+        # SIGTERM: workerii termină sarcina curentă și ies
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join(timeout=10)
+        queue.close()
+        shutil.rmtree(folder, ignore_errors=True)
+    return seconds
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--page-ms', type=float, default=100)
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    parser.add_argument('--json', help="Salvează raportul JSON")
+    args = parser.parse_args(argv)
+
+    report = {'pages': args.pages, 'page_ms': args.page_ms, 'runs': []}
+    print(f"{args.pages} pagini x {args.page_ms:.0f} ms")
+    print(f"{'procese':<10}{'s':>10}{'pagini/s':>12}{'x 1 proces':>12}")
+    base = None
+    for count in args.processes:
+        seconds = run(count, args.pages, args.page_ms)
+        rate = args.pages / seconds
+        base = base or rate
+        report['runs'].append({
+            'processes': count,
+            'seconds': round(seconds, 3),
+            'pages_per_s': round(rate, 1),
+            'speedup': round(rate / base, 2),
+        })
+        print(f"{count:<10}{seconds:>10.2f}{rate:>12.1f}"
+              f"{rate / base:>12.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
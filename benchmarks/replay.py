@@ -0,0 +1,456 @@
+# benchmarks/replay.py
+"""
+Infrastructură de replay pentru benchmark-ul end-to-end.
+- Server HTTP local care servește paginile înregistrate din
+  benchmarks/fixtures (manifest.json: furnizor → URL → fișier)
+- ReplayDriver: imită API-ul WebDriver folosit de scrapere
+  (get, page_source, execute_script, find_element(s)) peste serverul local
+- Toate request-urile `requests`/cloudscraper sunt redirecționate
+  către serverul local; imaginile primesc un PNG minim
+- Traducerea și time.sleep sunt înlocuite cu stub-uri care doar numără
+- StageClock acumulează timpul pe etape (fetch / parse / sleep ...)
+Nimic nu iese în rețea: benchmark-ul rulează complet offline.
+"""
+import os
+import re
+import json
+import time
+import struct
+import zlib
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+_IMAGE_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp|svg)$', re.IGNORECASE)
+_TAG_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>|<[^>]+>', re.DOTALL)
+_WS_RE = re.compile(r'[ \t]+')
+_INNER_TEXT_RE = re.compile(
+    r'^\s*return\s+\(?\s*document\.body\.innerText', re.IGNORECASE
+)
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36'
+)
+
+
+def _tiny_png() -> bytes:
+    """PNG valid 1x1 (trece de Image.verify())."""
+    def chunk(tag, data):
+        body = tag + data
+        return (
+            struct.pack('>I', len(data)) + body
+            + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+        )
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff'))
+        + chunk(b'IEND', b'')
+    )
+
+
+PNG_STUB = _tiny_png()
+
+
+def load_manifest(fixtures_dir: str = FIXTURES_DIR) -> dict:
+    with open(os.path.join(fixtures_dir, 'manifest.json'),
+              encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _route_key(url: str) -> str:
+    """host + cale + query, fără schemă (cheia din server)."""
+    parts = urlsplit(url)
+    key = parts.netloc.lower() + (parts.path or '/')
+    if parts.query:
+        key += '?' + parts.query
+    return key
+
+
+# ══════════════════════════════════════════
+# CRONOMETRU PE ETAPE
+# ══════════════════════════════════════════
+
+class StageClock:
+    """Acumulează secunde și contoare pe etape (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds = {}
+        self.counts = {}
+
+    def add(self, stage: str, seconds: float, count: int = 1):
+        with self._lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + count
+
+    @contextmanager
+    def measure(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - t0)
+
+    def reset(self):
+        with self._lock:
+            self.seconds = {}
+            self.counts = {}
+
+    def get(self, stage: str) -> float:
+        return self.seconds.get(stage, 0.0)
+
+    def count(self, stage: str) -> int:
+        return self.counts.get(stage, 0)
+
+
+# ══════════════════════════════════════════
+# SERVER LOCAL
+# ══════════════════════════════════════════
+
+class ReplayServer:
+    """
+    Servește fixture-urile pe 127.0.0.1 (port liber ales de OS).
+    URL-ul original https://host/cale?q devine http://127.0.0.1:port/host/cale?q
+    """
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR):
+        self.fixtures_dir = fixtures_dir
+        self.manifest = load_manifest(fixtures_dir)
+        self.pages = {}
+        self.pages_by_path = {}
+        for entry in self.manifest.values():
+            with open(os.path.join(fixtures_dir, entry['file']),
+                      'rb') as f:
+                body = f.read()
+            key = _route_key(entry['url'])
+            self.pages[key] = body
+            # Variante (?variantId=...) primesc aceeași pagină
+            self.pages_by_path[key.split('?', 1)[0]] = body
+        self.requests = 0
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def local_url(self, url: str) -> str:
+        return f"{self.base}/{_route_key(url)}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.requests += 1
+                key = self.path.lstrip('/')
+                body = server.pages.get(key)
+                if body is None:
+                    body = server.pages_by_path.get(key.split('?', 1)[0])
+                ctype = 'text/html; charset=utf-8'
+                status = 200
+                if body is None and _IMAGE_EXT_RE.search(
+                    key.split('?', 1)[0]
+                ):
+                    body, ctype = PNG_STUB, 'image/png'
+                if body is None:
+                    body, status = b'<html><body></body></html>', 404
+                self.send_response(status)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'ReplayServer':
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='replay-server',
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ══════════════════════════════════════════
+# WEBDRIVER DE REPLAY
+# ══════════════════════════════════════════
+
+class ReplayElement:
+    """Element minimal (text, atribute, click no-op)."""
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    @property
+    def text(self) -> str:
+        return self._tag.get_text(' ', strip=True)
+
+    def get_attribute(self, name: str):
+        value = self._tag.get(name)
+        if isinstance(value, list):
+            return ' '.join(value)
+        return value
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def click(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def send_keys(self, *keys):
+        pass
+
+
+class ReplayDriver:
+    """
+    Imită subsetul din WebDriver folosit de scrapere.
+    Fiecare apel contează ca un round-trip către browser (etapa 'fetch').
+    JavaScript-ul nu este executat: `return document.body.innerText`
+    primește textul paginii, PAGE_BUNDLE_JS un bundle echivalent
+    construit în Python, restul scripturilor returnează None.
+    """
+
+    def __init__(self, server: ReplayServer, clock: StageClock):
+        self.server = server
+        self.clock = clock
+        self.current_url = ''
+        self.page_source = ''
+        self._soup = None
+        self._text = None
+        self.calls = {}
+
+    def _count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def get(self, url: str):
+        self._count('get')
+        with self.clock.measure('fetch'):
+            try:
+                with urllib.request.urlopen(
+                    self.server.local_url(url), timeout=30
+                ) as r:
+                    html = r.read().decode('utf-8', 'replace')
+            except urllib.error.HTTPError as e:
+                html = e.read().decode('utf-8', 'replace')
+            self.current_url = url
+            self.page_source = html
+            self._soup = None
+            self._text = None
+
+    def _page_soup(self):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.page_source, 'html.parser')
+        return self._soup
+
+    def _inner_text(self) -> str:
+        if self._text is None:
+            text = _TAG_RE.sub('\n', self.page_source)
+            self._text = '\n'.join(
+                line for line in (
+                    _WS_RE.sub(' ', x).strip() for x in text.splitlines()
+                ) if line
+            )
+        return self._text
+
+    def execute_script(self, script: str, *args):
+        self._count('execute_script')
+        with self.clock.measure('fetch'):
+            if _INNER_TEXT_RE.match(script or ''):
+                return self._inner_text()
+            if 'navigator.userAgent' in (script or ''):
+                return USER_AGENT
+            return None
+
+    def execute_async_script(self, script: str, *args):
+        self._count('execute_async_script')
+        with self.clock.measure('fetch'):
+            if '// page-bundle' not in (script or ''):
+                return None
+            opts = args[0] if args and isinstance(args[0], dict) else {}
+            return self._bundle(opts.get('variant_pattern'))
+
+    def _bundle(self, variant_pattern: str = None) -> dict:
+        soup = self._page_soup()
+        images = []
+        for img in soup.select('img'):
+            for attr in ('src', 'data-src', 'data-lazy', 'data-original'):
+                src = img.get(attr)
+                if src and src not in images:
+                    images.append(urljoin(self.current_url, src))
+        variants = []
+        if variant_pattern:
+            vid_re = re.compile(variant_pattern)
+            for sel in soup.select('select'):
+                meta = f"{sel.get('id', '')} {sel.get('name', '')}".lower()
+                if not re.search(r'colou?r', meta):
+                    continue
+                for opt in sel.select('option'):
+                    vid = (opt.get('value') or '').strip()
+                    if vid_re.match(vid):
+                        variants.append({
+                            'variantId': vid.upper(),
+                            'color': opt.get_text(strip=True),
+                        })
+        return {
+            'url': self.current_url,
+            'html': self.page_source,
+            'text': self._inner_text(),
+            'images': images,
+            'variants': variants,
+            'specs': {},
+            'description_text': '',
+        }
+
+    def find_elements(self, by, value):
+        self._count('find_elements')
+        with self.clock.measure('fetch'):
+            if by != 'css selector':
+                return []
+            try:
+                return [
+                    ReplayElement(t)
+                    for t in self._page_soup().select(value)
+                ]
+            except Exception:
+                return []
+
+    def find_element(self, by, value):
+        self._count('find_element')
+        with self.clock.measure('fetch'):
+            tag = None
+            if by == 'css selector':
+                try:
+                    tag = self._page_soup().select_one(value)
+                except Exception:
+                    tag = None
+            if tag is None:
+                raise NoSuchElementException(f"{by}={value}")
+            return ReplayElement(tag)
+
+    def get_cookies(self) -> list:
+        return []
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_cdp_cmd(self, cmd: str, params: dict):
+        return {}
+
+    def quit(self):
+        pass
+
+
+# ══════════════════════════════════════════
+# PATCH-URI (request-uri, sleep, traducere, parsare)
+# ══════════════════════════════════════════
+
+class _TranslatorStub:
+    """Înlocuiește GoogleTranslator: întoarce textul, numără apelurile."""
+
+    clock = None
+
+    def __init__(self, source='auto', target='ro'):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        if self.clock:
+            self.clock.add('translate_calls', 0.0)
+        return text
+
+
+@contextmanager
+def replay_environment(server: ReplayServer, clock: StageClock,
+                       real_sleeps: bool = False, parse_modules=()):
+    """
+    Activează redirecționarea HTTP, stub-urile și contorizarea.
+    - time.sleep: înregistrează durata cerută ('sleep_requested');
+      doarme efectiv doar cu real_sleeps=True
+    - BeautifulSoup din `parse_modules` e cronometrat ca 'parse'
+    """
+    import requests.adapters
+    import utils.translator as translator
+
+    original_send = requests.adapters.HTTPAdapter.send
+    original_sleep = time.sleep
+    original_translator = translator.GoogleTranslator
+    parse_modules = [
+        m for m in parse_modules if hasattr(m, 'BeautifulSoup')
+    ]
+    original_bs = {m: m.BeautifulSoup for m in parse_modules}
+
+    def send(adapter, request, *args, **kwargs):
+        request.url = server.local_url(request.url)
+        with clock.measure('fetch'):
+            return original_send(adapter, request, *args, **kwargs)
+
+    def sleep(seconds):
+        clock.add('sleep_requested', seconds)
+        if real_sleeps:
+            with clock.measure('sleep'):
+                original_sleep(seconds)
+
+    def timed_soup(*args, **kwargs):
+        with clock.measure('parse'):
+            return BeautifulSoup(*args, **kwargs)
+
+    requests.adapters.HTTPAdapter.send = send
+    time.sleep = sleep
+    _TranslatorStub.clock = clock
+    translator.GoogleTranslator = _TranslatorStub
+    for module in parse_modules:
+        module.BeautifulSoup = timed_soup
+    try:
+        yield
+    finally:
+        requests.adapters.HTTPAdapter.send = original_send
+        time.sleep = original_sleep
+        translator.GoogleTranslator = original_translator
+        _TranslatorStub.clock = None
+        for module, bs in original_bs.items():
+            module.BeautifulSoup = bs
@@ -1,2 +1,7 @@
 # gomag/__init__.py
 from gomag.importer import GomagImporter
+from gomag.batch_upload import GomagBatchUploader
+from gomag.writer import GomagExportWriter
+from gomag.import_monitor import GomagImportMonitor
+from gomag.category_index import CategoryIndex
+from gomag.catalog_diff import GomagCatalog
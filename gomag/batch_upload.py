@@ -0,0 +1,301 @@
+# gomag/batch_upload.py
+"""
+Upload în loturi (chunk-uri) pentru Gomag.ro
+- Împarte produsele în fișiere XLSX dimensionate după limitele
+  de import Gomag (număr de rânduri + mărime fișier)
+- Încarcă toate loturile printr-o singură sesiune de browser
+- Urmărește statusul fiecărui lot și reîncearcă DOAR loturile eșuate
+- Cât timp Gomag procesează un lot (urmărit prin HTTP),
+  browserul încarcă deja lotul următor
+"""
+import math
+import time
+import streamlit as st
+
+
+# Limite implicite pentru un fișier de import Gomag.
+# Pot fi suprascrise din Secrets: [GOMAG] IMPORT_MAX_ROWS / IMPORT_MAX_MB
+DEFAULT_MAX_ROWS = 250
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# Overhead estimat per rând pentru coloanele fixe (TVA, stoc, SEO etc.)
+_ROW_OVERHEAD_BYTES = 1024
+
+
+def _estimate_row_bytes(product: dict) -> int:
+    """
+    Estimare ieftină a mărimii unui rând în fișierul de import,
+    fără a construi efectiv rândul.
+    """
+    size = _ROW_OVERHEAD_BYTES
+    # Descrierea apare de mai multe ori (completă, scurtă, feed, meta)
+    size += 2 * len(product.get('description', '') or '')
+    size += 3 * len(product.get('name', '') or '')
+    for key, val in (product.get('specifications') or {}).items():
+        size += 2 * (len(str(key)) + len(str(val)) + 30)
+    for img in (product.get('images') or [])[:10]:
+        size += len(img) + 1
+    for color in product.get('colors') or []:
+        size += 2 * (len(color) + 2)
+    size += len(product.get('source_url', '') or '')
+    return size
+
+
+class GomagBatchUploader:
+    """Încarcă produse în Gomag în loturi, printr-o singură sesiune."""
+
+    def __init__(
+        self, importer,
+        max_rows: int = None,
+        max_bytes: int = None,
+        max_retries: int = 2,
+    ):
+        self.importer = importer
+        limits = self._get_limits()
+        self.max_rows = max(1, max_rows or limits['max_rows'])
+        self.max_bytes = max(1, max_bytes or limits['max_bytes'])
+        self.max_retries = max_retries
+        self.chunks = []
+        self._products = []
+        self._category_name = ""
+        self._brand = ""
+
+    def _get_limits(self) -> dict:
+        try:
+            gomag_secrets = st.secrets.get("GOMAG", {})
+            max_rows = int(
+                gomag_secrets.get("IMPORT_MAX_ROWS", DEFAULT_MAX_ROWS)
+            )
+            max_mb = float(
+                gomag_secrets.get(
+                    "IMPORT_MAX_MB",
+                    DEFAULT_MAX_BYTES / (1024 * 1024)
+                )
+            )
+            return {
+                'max_rows': max_rows,
+                'max_bytes': int(max_mb * 1024 * 1024),
+            }
+        except Exception:
+            return {
+                'max_rows': DEFAULT_MAX_ROWS,
+                'max_bytes': DEFAULT_MAX_BYTES,
+            }
+
+    # ══════════════════════════════════════════
+    # PLANIFICARE LOTURI
+    # ══════════════════════════════════════════
+
+    def plan(
+        self, products: list,
+        category_name: str = "", brand: str = "",
+    ) -> list:
+        """
+        Împarte produsele în loturi echilibrate.
+        Numărul de loturi e minimul care respectă ambele limite;
+        produsele sunt apoi distribuite uniform după mărime.
+        """
+        self._products = list(products)
+        self._category_name = category_name
+        self._brand = brand
+        self.chunks = []
+
+        if not self._products:
+            return self.chunks
+
+        sizes = [_estimate_row_bytes(p) for p in self._products]
+        total_bytes = sum(sizes)
+        n_chunks = max(
+            math.ceil(len(self._products) / self.max_rows),
+            math.ceil(total_bytes / self.max_bytes),
+            1,
+        )
+        target_rows = math.ceil(len(self._products) / n_chunks)
+        target_bytes = math.ceil(total_bytes / n_chunks)
+
+        start = 0
+        cur_rows = 0
+        cur_bytes = 0
+        for i, size in enumerate(sizes):
+            if cur_rows and (
+                cur_rows >= target_rows
+                or cur_rows >= self.max_rows
+                or cur_bytes + size > self.max_bytes
+                or (
+                    cur_bytes >= target_bytes
+                    and len(self.chunks) < n_chunks - 1
+                )
+            ):
+                self._add_chunk(start, i, cur_bytes)
+                start = i
+                cur_rows = 0
+                cur_bytes = 0
+            cur_rows += 1
+            cur_bytes += size
+        self._add_chunk(start, len(sizes), cur_bytes)
+
+        return self.chunks
+
+    def _add_chunk(self, start: int, end: int, est_bytes: int):
+        self.chunks.append({
+            'index': len(self.chunks) + 1,
+            'start': start,
+            'end': end,
+            'count': end - start,
+            'estimated_bytes': est_bytes,
+            'skus': [
+                p.get('sku', '') for p in self._products[start:end]
+            ],
+            'status': 'pending',
+            'attempts': 0,
+            'error': '',
+            'duration': 0.0,
+            'result': None,
+        })
+
+    # ══════════════════════════════════════════
+    # UPLOAD
+    # ══════════════════════════════════════════
+
+    def _upload_chunk(self, chunk: dict) -> bool:
+        chunk['status'] = 'uploading'
+        chunk['attempts'] += 1
+        chunk['result'] = None
+        t0 = time.time()
+        try:
+            file_bytes = self.importer.generate_excel_file(
+                self._products[chunk['start']:chunk['end']],
+                self._category_name, self._brand,
+            )
+            self.importer.last_import_future = None
+            self.importer.last_import_result = None
+            ok = self.importer.upload_csv_to_gomag(
+                file_bytes, wait=False
+            )
+            future = self.importer.last_import_future
+            if ok and future is not None:
+                # Job-ul e urmărit prin HTTP în fundal;
+                # browserul trece direct la lotul următor
+                chunk['status'] = 'processing'
+                chunk['future'] = future
+                chunk['started'] = t0
+                return True
+            self._apply_result(
+                chunk, ok, self.importer.last_import_result
+            )
+        except Exception as e:
+            chunk['status'] = 'failed'
+            chunk['error'] = f"{type(e).__name__}: {str(e)[:150]}"
+        chunk['duration'] = round(time.time() - t0, 1)
+        return chunk['status'] == 'done'
+
+    @staticmethod
+    def _apply_result(chunk: dict, ok: bool, result: dict | None):
+        chunk['result'] = result
+        if result and result['status'] == 'failed':
+            ok = False
+        chunk['status'] = 'done' if ok else 'failed'
+        chunk['error'] = '' if ok else (
+            (result or {}).get('message') or 'upload eșuat'
+        )
+
+    def _collect_processing(self):
+        """Așteaptă job-urile de import urmărite în fundal."""
+        for chunk in self.chunks:
+            future = chunk.pop('future', None)
+            if future is None:
+                continue
+            try:
+                result = future.result()
+                self._apply_result(
+                    chunk, result['status'] != 'failed', result
+                )
+            except Exception as e:
+                chunk['status'] = 'failed'
+                chunk['error'] = f"{type(e).__name__}: {str(e)[:150]}"
+            chunk['duration'] = round(
+                time.time() - chunk.pop('started', time.time()), 1
+            )
+
+    def _run_pending(self, progress_callback=None):
+        todo = [
+            c for c in self.chunks
+            if c['status'] in ('pending', 'failed')
+        ]
+        for n, chunk in enumerate(todo):
+            if progress_callback:
+                progress_callback(n, len(todo), chunk)
+            self._upload_chunk(chunk)
+        self._collect_processing()
+        if progress_callback and todo:
+            progress_callback(len(todo), len(todo), None)
+
+    def upload(
+        self, products: list,
+        category_name: str = "", brand: str = "",
+        progress_callback=None,
+    ) -> list:
+        """
+        Planifică și încarcă toate loturile.
+        Loturile eșuate sunt reîncercate de până la max_retries ori.
+        Returnează lista de loturi cu status.
+        """
+        self.plan(products, category_name, brand)
+        if not self.chunks:
+            return self.chunks
+
+        if not self.importer.login():
+            for chunk in self.chunks:
+                chunk['status'] = 'failed'
+                chunk['error'] = 'login eșuat'
+            return self.chunks
+
+        st.info(
+            f"📦 {len(self._products)} produse → "
+            f"{len(self.chunks)} fișiere de import"
+        )
+        self._run_pending(progress_callback)
+
+        for _ in range(self.max_retries):
+            if not self.failed_chunks():
+                break
+            self.retry_failed(progress_callback)
+
+        return self.chunks
+
+    def retry_failed(self, progress_callback=None) -> list:
+        """Reîncarcă doar loturile cu status 'failed'."""
+        failed = self.failed_chunks()
+        if not failed:
+            return self.chunks
+        st.info(f"🔁 Reîncerc {len(failed)} loturi eșuate...")
+        if not self.importer.logged_in:
+            if not self.importer.login():
+                return self.chunks
+        self._run_pending(progress_callback)
+        return self.chunks
+
+    def failed_chunks(self) -> list:
+        return [c for c in self.chunks if c['status'] == 'failed']
+
+    def imported_skus(self) -> list:
+        skus = []
+        for chunk in self.chunks:
+            if chunk['status'] == 'done':
+                skus.extend(chunk['skus'])
+        return skus
+
+    def summary(self) -> dict:
+        results = [c['result'] for c in self.chunks if c['result']]
+        return {
+            'created': sum(r['created'] for r in results),
+            'updated': sum(r['updated'] for r in results),
+            'failed_rows': sum(r['failed'] for r in results),
+            'chunks': len(self.chunks),
+            'done': sum(
+                1 for c in self.chunks if c['status'] == 'done'
+            ),
+            'failed': len(self.failed_chunks()),
+            'products': len(self._products),
+            'imported_products': len(self.imported_skus()),
+        }
@@ -0,0 +1,330 @@
+# gomag/catalog_diff.py
+"""
+Export incremental față de catalogul existent în Gomag.
+- Exportul de produse din Gomag (CSV / XLSX) e citit în flux într-un
+  index cheiat după 'Cod Produs (SKU)' și 'Produs: Cod extern';
+  pentru fiecare celulă se păstrează doar un digest de 8 octeți
+- Rândurile noi (GomagRowBuilder) sunt comparate celulă cu celulă,
+  după normalizare (numere, HTML → text, număr de imagini)
+- Rezultat: produsele noi (toate coloanele) și produsele modificate
+  (SKU + doar coloanele schimbate); valorile nemodificate din aceste
+  coloane sunt copiate din export, deci nu schimbă nimic în Gomag
+"""
+import io
+import re
+import csv
+import hashlib
+from html import unescape
+from collections import Counter
+
+
+SKU_COLUMN = 'Cod Produs (SKU)'
+EXTERNAL_COLUMN = 'Produs: Cod extern'
+
+# Coloanele completate din datele produsului. Constantele (TVA, stoc,
+# livrare) și categoria pot fi schimbate intenționat în Gomag.
+DIFF_COLUMNS = [
+    'Denumire Produs',
+    'Descriere Produs',
+    'Descriere Scurta a Produsului',
+    'URL Poza de Produs',
+    'Descriere pt feed-uri',
+    'Atribute: Culoare (variante de produs)',
+    'Cuvinte Cautare',
+    'Pret Produs: Descriere',
+    'Produs: Cod extern',
+    'Pret de Achizitie',
+    'Greutate (Kg)',
+    'Marca (Brand)',
+    'Titlu Meta',
+    'Descriere Meta',
+    'Cuvinte Cheie',
+    'Titlul Imaginii Principale',
+]
+
+# Antete din exportul Gomag care diferă de șablonul de import
+HEADER_ALIASES = {
+    'sku': SKU_COLUMN,
+    'cod produs': SKU_COLUMN,
+    'cod extern': EXTERNAL_COLUMN,
+    'denumire': 'Denumire Produs',
+    'pret': 'Pret Produs: Descriere',
+    'pret produs': 'Pret Produs: Descriere',
+}
+
+IMAGE_COLUMNS = {'URL Poza de Produs'}
+HTML_COLUMNS = {
+    'Descriere Produs', 'Descriere Scurta a Produsului',
+    'Descriere pt feed-uri', 'Descriere Meta',
+}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_NUMBER_RE = re.compile(r'^-?\d+(?:[.,]\d+)?$')
+_IMAGE_SEP_RE = re.compile(r'[|,\s]+')
+
+
+# ══════════════════════════════════════════
+# NORMALIZARE
+# ══════════════════════════════════════════
+
+def normalize_cell(column: str, value) -> str:
+    """Forma comparabilă a unei celule (export Gomag vs. rând nou)."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    if not text:
+        return ''
+    if column in IMAGE_COLUMNS:
+        # Gomag re-găzduiește pozele: URL-urile diferă, numărul nu
+        return str(len([u for u in _IMAGE_SEP_RE.split(text) if u]))
+    if column in HTML_COLUMNS:
+        text = _TAG_RE.sub(' ', unescape(text))
+    text = _WS_RE.sub(' ', text).strip()
+    if _NUMBER_RE.match(text):
+        number = float(text.replace(',', '.'))
+        # Prețul de achiziție 0 e exportat gol
+        return f"{number:.4f}" if number else ''
+    if column == EXTERNAL_COLUMN:
+        return normalize_external(text)
+    return text
+
+
+def normalize_sku(value) -> str:
+    return str(value or '').strip().upper()
+
+
+def normalize_external(url: str) -> str:
+    """URL-ul sursă fără schemă, www., slash final și fragment."""
+    url = (url or '').strip().split('#', 1)[0].rstrip('/')
+    url = re.sub(r'^[a-z]+://', '', url, flags=re.I)
+    if url.lower().startswith('www.'):
+        url = url[4:]
+    host, _, path = url.partition('/')
+    return f"{host.lower()}/{path}" if path else host.lower()
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+# ══════════════════════════════════════════
+# CITIRE EXPORT GOMAG
+# ══════════════════════════════════════════
+
+def _canonical_header(name) -> str:
+    name = str(name or '').strip()
+    return HEADER_ALIASES.get(name.lower(), name)
+
+
+def _decode(data: bytes) -> str:
+    for encoding in ('utf-8-sig', 'cp1250'):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('latin-1')
+
+
+def iter_export_rows(data: bytes, filename: str = ''):
+    """Antetul, apoi rândurile unui export Gomag (CSV sau XLSX)."""
+    if filename.lower().endswith(('.xlsx', '.xlsm')) or data[:2] == b'PK':
+        from openpyxl import load_workbook
+        wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+        try:
+            for row in wb.worksheets[0].iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            wb.close()
+        return
+    text = _decode(data)
+    try:
+        dialect = csv.Sniffer().sniff(text[:8192], delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    yield from csv.reader(io.StringIO(text), dialect)
+
+
+class GomagCatalog:
+    """
+    catalog = GomagCatalog.from_export(data, 'produse.csv')
+    catalog.match(sku, source_url) → cheia SKU din Gomag sau None
+    """
+
+    def __init__(self, columns: list = None):
+        # Coloanele comparate = DIFF_COLUMNS prezente în export
+        self.columns = list(columns or DIFF_COLUMNS)
+        self.by_sku = {}
+        self.by_external = {}
+        self._data = b''
+        self._filename = ''
+
+    @classmethod
+    def from_export(cls, data: bytes, filename: str = '') -> 'GomagCatalog':
+        catalog = cls()
+        catalog.load(data, filename)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.by_sku)
+
+    def _header_index(self, header: list) -> dict:
+        index = {}
+        for i, name in enumerate(header):
+            index.setdefault(_canonical_header(name), i)
+        if SKU_COLUMN not in index:
+            raise ValueError(
+                f"Exportul Gomag nu are coloana '{SKU_COLUMN}'"
+            )
+        return index
+
+    def load(self, data: bytes, filename: str = ''):
+        rows = iter_export_rows(data, filename)
+        index = self._header_index(next(rows, []))
+        self.columns = [c for c in self.columns if c in index]
+        positions = [index[c] for c in self.columns]
+        i_sku = index[SKU_COLUMN]
+        i_ext = index.get(EXTERNAL_COLUMN)
+        for row in rows:
+            if i_sku >= len(row):
+                continue
+            sku = str(row[i_sku] or '').strip()
+            key = normalize_sku(sku)
+            if not key:
+                continue
+            self.by_sku[key] = (sku, tuple(
+                _digest(normalize_cell(
+                    column, row[i] if i < len(row) else ''
+                ))
+                for column, i in zip(self.columns, positions)
+            ))
+            if i_ext is not None and i_ext < len(row) and row[i_ext]:
+                external = normalize_external(str(row[i_ext]))
+                self.by_external.setdefault(external, key)
+        # Exportul rămâne doar pentru valorile de completare (raw_values)
+        self._data = data
+        self._filename = filename
+
+    def match(self, sku: str, source_url: str = '') -> str | None:
+        key = normalize_sku(sku)
+        if key in self.by_sku:
+            return key
+        if source_url:
+            return self.by_external.get(normalize_external(source_url))
+        return None
+
+    def raw_values(self, needed: dict) -> dict:
+        """
+        {cheie SKU: {coloană: valoare din export}} doar pentru celulele
+        cerute ({cheie SKU: set(coloane)}); a doua trecere prin export.
+        """
+        found = {}
+        if not needed:
+            return found
+        rows = iter_export_rows(self._data, self._filename)
+        index = self._header_index(next(rows, []))
+        i_sku = index[SKU_COLUMN]
+        for row in rows:
+            if i_sku >= len(row):
+                continue
+            key = normalize_sku(row[i_sku])
+            if key not in needed or key in found:
+                continue
+            found[key] = {
+                column: _export_text(row, index.get(column))
+                for column in needed[key]
+            }
+            if len(found) == len(needed):
+                break
+        return found
+
+
+def _export_text(row: list, i) -> str:
+    if i is None or i >= len(row) or row[i] is None:
+        return ''
+    value = row[i]
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+# ══════════════════════════════════════════
+# DIFERENȚE
+# ══════════════════════════════════════════
+
+class CatalogDiff:
+    """
+    Împarte rândurile Gomag în noi / modificate / neschimbate.
+    diff = CatalogDiff(catalog, GomagImporter.GOMAG_COLUMNS)
+    for row in diff.new_rows(rows): ...   # rândurile noi, complete
+    diff.update_table() → (antet, rânduri) pentru produsele modificate
+    """
+
+    def __init__(self, catalog: GomagCatalog, columns: list):
+        self.catalog = catalog
+        self.columns = list(columns)
+        idx = {c: i for i, c in enumerate(self.columns)}
+        self._i_sku = idx[SKU_COLUMN]
+        self._i_ext = idx.get(EXTERNAL_COLUMN)
+        self._compare = [
+            (pos, column, idx[column])
+            for pos, column in enumerate(catalog.columns)
+            if column in idx
+        ]
+        self.changed = {}
+        self.stats = {'new': 0, 'changed': 0, 'unchanged': 0}
+        self.changed_columns = Counter()
+
+    def _changes(self, row: list, digests: tuple) -> dict:
+        changes = {}
+        for pos, column, i in self._compare:
+            value = row[i]
+            if _digest(normalize_cell(column, value)) != digests[pos]:
+                changes[column] = value
+        return changes
+
+    def new_rows(self, rows):
+        """
+        Generator: rândurile produselor care nu există în Gomag.
+        Modificările produselor existente sunt reținute în self.changed.
+        """
+        for row in rows:
+            external = row[self._i_ext] if self._i_ext is not None else ''
+            key = self.catalog.match(row[self._i_sku], external)
+            if key is None:
+                self.stats['new'] += 1
+                yield row
+                continue
+            changes = self._changes(row, self.catalog.by_sku[key][1])
+            if not changes:
+                self.stats['unchanged'] += 1
+                continue
+            self.stats['changed'] += 1
+            self.changed_columns.update(changes.keys())
+            self.changed[key] = changes
+
+    def update_table(self) -> tuple:
+        """
+        Antetul (SKU + coloanele schimbate) și rândurile de actualizare.
+        SKU-ul e cel din Gomag (potrivirea poate veni din Cod extern).
+        """
+        columns = [
+            c for c in self.catalog.columns if c in self.changed_columns
+        ]
+        needed = {
+            key: {c for c in columns if c not in changes}
+            for key, changes in self.changed.items()
+        }
+        current = self.catalog.raw_values(
+            {k: v for k, v in needed.items() if v}
+        )
+        rows = []
+        for key, changes in self.changed.items():
+            existing = current.get(key, {})
+            rows.append([self.catalog.by_sku[key][0]] + [
+                changes[c] if c in changes else existing.get(c, '')
+                for c in columns
+            ])
+        return [SKU_COLUMN] + columns, rows
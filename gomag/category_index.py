@@ -0,0 +1,321 @@
+# gomag/category_index.py
+"""
+Index persistent al categoriilor Gomag.
+- Arborele de categorii (id, nume, cale completă, părinte) e salvat
+  pe disc cu TTL, deci supraviețuiește rerun-urilor Streamlit
+- Reîmprospătarea rulează într-un fir de execuție în fundal
+- Căutare fuzzy după nume pentru maparea automată produs → categorie
+"""
+import os
+import re
+import json
+import time
+import difflib
+import tempfile
+import threading
+import unicodedata
+
+from utils.helpers import get_cache_dir
+
+
+DEFAULT_TTL = 24 * 3600
+# După o reîmprospătare eșuată (login, timeout), cele automate
+# așteaptă atât: fiecare încercare pornește un Chrome și un login
+FAILURE_BACKOFF = 15 * 60
+PATH_SEPARATOR = ' > '
+
+_PATH_SPLIT_RE = re.compile(r'\s*(?:>|»|/|\\)\s*')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# O singură reîmprospătare în fundal per fișier de index
+_refresh_lock = threading.Lock()
+_refresh_threads = {}
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, fără diacritice, spații normalizate."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+
+def _word_overlap(q_words: set, words: set) -> float:
+    """
+    Fracția de cuvinte comune; "rucsac" se potrivește cu "rucsacuri"
+    (prefix de minim 4 litere).
+    """
+    if not q_words or not words:
+        return 0.0
+    common = 0
+    for w in words:
+        if w in q_words or (
+            len(w) >= 4
+            and any(
+                len(q) >= 4 and (q.startswith(w) or w.startswith(q))
+                for q in q_words
+            )
+        ):
+            common += 1
+    return common / min(len(q_words), len(words))
+
+
+def build_tree(rows: list) -> list:
+    """
+    Completează 'path' și 'parent' pentru rândurile extrase din Gomag.
+    Acceptă fie 'parent' (id), fie 'level' (adâncime în listă),
+    fie un nume care conține deja calea ("Genti > Rucsacuri").
+    """
+    categories = []
+    by_id = {}
+    stack = []  # (level, category) pentru liste indentate
+
+    for row in rows:
+        raw_name = (row.get('name') or '').strip()
+        if not raw_name:
+            continue
+        parts = [p for p in _PATH_SPLIT_RE.split(raw_name) if p]
+        name = parts[-1] if parts else raw_name
+        cat = {
+            'id': str(row.get('id') or ''),
+            'name': name,
+            'path': '',
+            'parent': str(row.get('parent') or ''),
+        }
+
+        if len(parts) > 1:
+            cat['path'] = PATH_SEPARATOR.join(parts)
+        elif row.get('level') is not None:
+            level = int(row['level'])
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            if stack:
+                parent = stack[-1][1]
+                cat['parent'] = cat['parent'] or parent['id']
+                cat['path'] = parent['path'] + PATH_SEPARATOR + name
+            elif not cat['parent']:
+                cat['path'] = name
+            stack.append((level, cat))
+
+        categories.append(cat)
+        if cat['id']:
+            by_id[cat['id']] = cat
+
+    # Căi din lanțul de părinți (id → părinte)
+    for cat in categories:
+        if cat['path']:
+            continue
+        names = [cat['name']]
+        seen = {cat['id']}
+        parent = by_id.get(cat['parent'])
+        while parent and parent['id'] not in seen:
+            names.append(parent['name'])
+            seen.add(parent['id'])
+            parent = by_id.get(parent['parent'])
+        cat['path'] = PATH_SEPARATOR.join(reversed(names))
+
+    return categories
+
+
+class CategoryIndex:
+    """Index de categorii Gomag salvat pe disc, cu TTL."""
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL):
+        self.path = path or os.path.join(
+            get_cache_dir('gomag'), 'categories.json'
+        )
+        self.ttl = ttl
+        self.updated_at = 0.0
+        self.categories = []
+        self._norm = []
+        self._by_norm = {}
+        self._mtime = None
+        self.load()
+
+    # ══════════════════════════════════════════
+    # PERSISTENȚĂ
+    # ══════════════════════════════════════════
+
+    def load(self) -> bool:
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return True
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self._set(data.get('categories', []), data.get('updated_at', 0))
+            self._mtime = mtime
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def save(self):
+        """Scriere atomică (fișier temporar + rename)."""
+        folder = os.path.dirname(self.path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'updated_at': self.updated_at,
+                 'categories': self.categories},
+                f, ensure_ascii=False,
+            )
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def _set(self, categories: list, updated_at: float):
+        self.categories = categories
+        self.updated_at = updated_at
+        self._norm = [
+            (normalize_name(c['name']), normalize_name(c['path']), c)
+            for c in categories
+        ]
+        self._by_norm = {}
+        for name_n, path_n, cat in self._norm:
+            self._by_norm.setdefault(name_n, cat)
+            self._by_norm.setdefault(path_n, cat)
+
+    def replace(self, rows: list):
+        self._set(build_tree(rows), time.time())
+        self.save()
+
+    def is_stale(self) -> bool:
+        self.load()
+        return (
+            not self.categories
+            or time.time() - self.updated_at > self.ttl
+        )
+
+    def age(self) -> float:
+        return time.time() - self.updated_at if self.updated_at else -1
+
+    # ══════════════════════════════════════════
+    # REÎMPROSPĂTARE ÎN FUNDAL
+    # ══════════════════════════════════════════
+
+    @property
+    def _failed_path(self) -> str:
+        # mtime-ul marcajului = ultima încercare eșuată (între procese)
+        return self.path + '.failed'
+
+    def _mark_failed(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self._failed_path, 'a'):
+                os.utime(self._failed_path)
+        except OSError:
+            pass
+
+    def retry_in(self) -> float:
+        """Secunde până la următoarea reîmprospătare automată (0 = acum)."""
+        try:
+            failed_at = os.path.getmtime(self._failed_path)
+        except OSError:
+            return 0.0
+        return max(FAILURE_BACKOFF - (time.time() - failed_at), 0.0)
+
+    def refresh(self, fetcher) -> bool:
+        """fetcher() → listă de rânduri {'id','name','parent'/'level'}."""
+        try:
+            rows = fetcher()
+        except Exception:
+            self._mark_failed()
+            raise
+        if not rows:
+            self._mark_failed()
+            return False
+        self.replace(rows)
+        try:
+            os.remove(self._failed_path)
+        except OSError:
+            pass
+        return True
+
+    def refresh_in_background(self, fetcher, force: bool = False) -> bool:
+        """
+        Pornește reîmprospătarea într-un thread daemon.
+        Returnează False dacă una e deja în curs pentru acest index
+        sau dacă ultima a eșuat de curând (fără force).
+        """
+        if not force and self.retry_in() > 0:
+            return False
+        with _refresh_lock:
+            running = _refresh_threads.get(self.path)
+            if running and running.is_alive():
+                return False
+
+            def _worker():
+                try:
+                    self.refresh(fetcher)
+                except Exception:
+                    pass
+
+            t = threading.Thread(
+                target=_worker, name='gomag-category-refresh',
+                daemon=True,
+            )
+            _refresh_threads[self.path] = t
+            t.start()
+            return True
+
+    def is_refreshing(self) -> bool:
+        t = _refresh_threads.get(self.path)
+        return bool(t and t.is_alive())
+
+    # ══════════════════════════════════════════
+    # CĂUTARE
+    # ══════════════════════════════════════════
+
+    def get(self, cat_id: str) -> dict | None:
+        for cat in self.categories:
+            if cat['id'] == str(cat_id):
+                return cat
+        return None
+
+    def lookup(
+        self, name: str, limit: int = 5, cutoff: float = 0.5,
+    ) -> list:
+        """
+        Căutare fuzzy după nume sau cale.
+        Returnează [(scor, categorie)] sortat descrescător.
+        """
+        query = normalize_name(name)
+        if not query or not self._norm:
+            return []
+        exact = self._by_norm.get(query)
+        if exact:
+            return [(1.0, exact)]
+
+        q_words = set(query.split())
+        scored = []
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq2(query)
+        for name_n, path_n, cat in self._norm:
+            overlap = max(
+                _word_overlap(q_words, set(name_n.split())),
+                _word_overlap(q_words, set(path_n.split())),
+            )
+            if overlap == 0 and query[:3] not in name_n:
+                continue
+            matcher.set_seq1(name_n)
+            ratio = matcher.quick_ratio()
+            if ratio < cutoff and overlap < cutoff:
+                continue
+            ratio = matcher.ratio()
+            score = max(ratio, 0.4 * ratio + 0.6 * overlap)
+            if score >= cutoff:
+                scored.append((round(score, 3), cat))
+        scored.sort(key=lambda x: (-x[0], len(x[1]['path'])))
+        return scored[:limit]
+
+    def best_match(self, name: str, cutoff: float = 0.5) -> dict | None:
+        matches = self.lookup(name, limit=1, cutoff=cutoff)
+        return matches[0][1] if matches else None
+
+    def match_product(self, product: dict, cutoff: float = 0.4) -> dict | None:
+        """Categoria potrivită pentru un produs (categorie sursă, apoi nume)."""
+        for text in (product.get('category'), product.get('name')):
+            if text:
+                cat = self.best_match(text, cutoff)
+                if cat:
+                    return cat
+        return None
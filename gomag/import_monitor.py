@@ -0,0 +1,387 @@
+# gomag/import_monitor.py
+"""
+Monitorizare status import Gomag prin HTTP.
+- Descoperă endpoint-ul de status al job-ului de import din
+  pagina de admin (URL curent, atribute data-*, URL-uri din JS)
+- Interoghează endpoint-ul printr-o sesiune HTTP autentificată
+  cu cookie-urile din Selenium, cu backoff exponențial
+- Returnează rezultat structurat: created / updated / failed + rânduri
+- Browserul rămâne liber pentru următorul fișier cât timp se așteaptă
+"""
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import requests
+
+
+SUCCESS_MESSAGES = [
+    'import finalizat',
+    'import complet',
+    'importul a fost finalizat',
+    'produse importate',
+    'import successful',
+    'successfully imported',
+    'produse adaugate',
+]
+
+ERROR_MESSAGES = [
+    'eroare import',
+    'import error',
+    'import failed',
+    'eroare la import',
+]
+
+_DONE_STATES = {
+    'done', 'finished', 'complete', 'completed', 'success',
+    'succeeded', 'finalizat',
+}
+_FAILED_STATES = {'error', 'failed', 'failure', 'eroare', 'canceled'}
+
+# URL-ul paginii după Start Import conține de obicei ID-ul job-ului
+_JOB_URL_RE = re.compile(
+    r'/gomag/product/import/(?:view|status|progress|details|log)/(\d+)',
+    re.IGNORECASE,
+)
+_STATUS_ATTR_RE = re.compile(
+    r'data-(?:status|progress|poll|check)-url\s*=\s*["\']([^"\']+)["\']',
+    re.IGNORECASE,
+)
+_STATUS_JS_RE = re.compile(
+    r'["\']((?:https?://[^"\']+)?/gomag/[^"\'\s]*import[^"\'\s]*'
+    r'(?:status|progress|check|poll)[^"\'\s]*)["\']',
+    re.IGNORECASE,
+)
+_JOB_ID_RE = re.compile(
+    r'import[_-]?id["\'\s:=]+["\']?(\d+)', re.IGNORECASE
+)
+
+_COUNT_PATTERNS = {
+    'created': re.compile(
+        r'(\d+)\s*(?:produse\s+)?(?:adaugate|adăugate|create|noi|'
+        r'created|added|inserted)',
+        re.IGNORECASE,
+    ),
+    'updated': re.compile(
+        r'(\d+)\s*(?:produse\s+)?(?:actualizate|modificate|updated)',
+        re.IGNORECASE,
+    ),
+    'failed': re.compile(
+        r'(\d+)\s*(?:produse\s+)?(?:erori|eșuate|esuate|failed|errors)',
+        re.IGNORECASE,
+    ),
+}
+_ROW_RE = re.compile(r'<tr[^>]*>(.*?)</tr>', re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(r'<t[dh][^>]*>(.*?)</t[dh]>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Pool comun per proces pentru polling în fundal
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix='gomag-import-monitor'
+)
+
+
+# Cuvinte întregi: "address" nu e "add", "0 errors" nu e o eroare
+_OUTCOME_RES = [
+    ('failed', re.compile(
+        r'\b(?:errors?|eroare|erori|fail(?:ed|ure)?|e[sș]uat[aăe]?|'
+        r'invalid[aăe]?|respins[aăe]?)\b', re.IGNORECASE,
+    )),
+    ('updated', re.compile(
+        r'\b(?:updated?|actualizat[aăe]?|actualizare|modificat[aăe]?)\b',
+        re.IGNORECASE,
+    )),
+    ('created', re.compile(
+        r'\b(?:added|created|inserted|new|ad[aă]ugat[aăe]?|'
+        r'creat[aăe]?|inserat[aăe]?|nou[aă]?)\b', re.IGNORECASE,
+    )),
+]
+_ZERO_COUNT_RE = re.compile(r'\b0\s+\w+', re.UNICODE)
+
+
+def _classify(text: str) -> str:
+    text = _ZERO_COUNT_RE.sub(' ', text or '')
+    for outcome, pattern in _OUTCOME_RES:
+        if pattern.search(text):
+            return outcome
+    return ''
+
+
+def empty_result(status: str = 'unknown', status_url: str = '') -> dict:
+    return {
+        'status': status,
+        'created': 0,
+        'updated': 0,
+        'failed': 0,
+        'rows': [],
+        'message': '',
+        'status_url': status_url,
+        'polls': 0,
+        'elapsed': 0.0,
+    }
+
+
+class GomagImportMonitor:
+    """Urmărește un job de import Gomag fără a ține browserul ocupat."""
+
+    def __init__(
+        self, driver, base_url: str,
+        timeout: float = 300,
+        initial_delay: float = 0.5,
+        max_delay: float = 15,
+        backoff: float = 2.0,
+    ):
+        self.driver = driver
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.session = self._http_session()
+
+    def _http_session(self) -> requests.Session:
+        """Sesiune HTTP cu cookie-urile și User-Agent-ul din Selenium."""
+        session = requests.Session()
+        if not self.driver:
+            return session
+        try:
+            for c in self.driver.get_cookies():
+                session.cookies.set(
+                    c['name'], c['value'],
+                    domain=c.get('domain'), path=c.get('path', '/'),
+                )
+            ua = self.driver.execute_script("return navigator.userAgent")
+            if ua:
+                session.headers['User-Agent'] = ua
+        except Exception:
+            pass
+        session.headers.update({
+            'Accept': 'application/json, text/html;q=0.9, */*;q=0.8',
+            'X-Requested-With': 'XMLHttpRequest',
+        })
+        return session
+
+    # ══════════════════════════════════════════
+    # DESCOPERIRE ENDPOINT
+    # ══════════════════════════════════════════
+
+    def discover_status_url(self) -> str | None:
+        """Caută endpoint-ul de status în pagina curentă de admin."""
+        try:
+            current_url = self.driver.current_url or ''
+            page = self.driver.page_source or ''
+        except Exception:
+            return None
+
+        m = _JOB_URL_RE.search(current_url)
+        if m:
+            return current_url
+
+        for regex in (_STATUS_ATTR_RE, _STATUS_JS_RE):
+            m = regex.search(page)
+            if m:
+                return urljoin(current_url or self.base_url, m.group(1))
+
+        m = _JOB_ID_RE.search(page) or _JOB_URL_RE.search(page)
+        if m:
+            candidate = (
+                f"{self.base_url}/gomag/product/import/status/{m.group(1)}"
+            )
+            try:
+                r = self.session.get(candidate, timeout=10)
+                if r.ok:
+                    return candidate
+            except Exception:
+                pass
+        return None
+
+    # ══════════════════════════════════════════
+    # INTERPRETARE RĂSPUNS
+    # ══════════════════════════════════════════
+
+    def parse_json(self, data: dict) -> dict:
+        result = empty_result('running')
+        if not isinstance(data, dict):
+            return result
+        payload = data.get('data') if isinstance(data.get('data'), dict) else data
+
+        state = str(
+            payload.get('status') or payload.get('state') or ''
+        ).lower()
+        progress = payload.get('progress') or payload.get('percent')
+        if state in _DONE_STATES:
+            result['status'] = 'done'
+        elif state in _FAILED_STATES:
+            result['status'] = 'failed'
+        else:
+            try:
+                if progress is not None and float(progress) >= 100:
+                    result['status'] = 'done'
+            except (TypeError, ValueError):
+                pass
+
+        for key, aliases in {
+            'created': ('created', 'added', 'inserted', 'new'),
+            'updated': ('updated', 'modified'),
+            'failed': ('failed', 'errors', 'error_count'),
+        }.items():
+            for alias in aliases:
+                val = payload.get(alias)
+                if isinstance(val, list):
+                    val = len(val)
+                try:
+                    result[key] = int(val)
+                    break
+                except (TypeError, ValueError):
+                    continue
+
+        rows = []
+        for list_key in ('rows', 'items', 'results', 'log', 'lines'):
+            items = payload.get(list_key)
+            if isinstance(items, list):
+                rows = items
+                break
+        for n, item in enumerate(rows, 1):
+            if not isinstance(item, dict):
+                continue
+            outcome = _classify(
+                str(item.get('status') or item.get('action')
+                    or item.get('result') or '')
+            )
+            result['rows'].append({
+                'row': item.get('row') or item.get('line') or n,
+                'sku': str(item.get('sku') or item.get('code') or ''),
+                'result': outcome or 'unknown',
+                'message': str(
+                    item.get('message') or item.get('error') or ''
+                ),
+            })
+        self._fill_counts_from_rows(result)
+        result['message'] = str(payload.get('message') or '')
+        return result
+
+    def parse_html(self, html: str) -> dict:
+        result = empty_result('running')
+        low = (html or '').lower()
+        if any(msg in low for msg in ERROR_MESSAGES):
+            result['status'] = 'failed'
+        elif any(msg in low for msg in SUCCESS_MESSAGES):
+            result['status'] = 'done'
+
+        text = _TAG_RE.sub(' ', html or '')
+        for key, regex in _COUNT_PATTERNS.items():
+            m = regex.search(text)
+            if m:
+                result[key] = int(m.group(1))
+
+        for n, row_html in enumerate(_ROW_RE.findall(html or ''), 1):
+            cells = [
+                _TAG_RE.sub('', c).strip()
+                for c in _CELL_RE.findall(row_html)
+            ]
+            if len(cells) < 2:
+                continue
+            outcome = _classify(' '.join(cells[1:]))
+            if not outcome:
+                continue
+            result['rows'].append({
+                'row': n,
+                'sku': cells[0],
+                'result': outcome,
+                'message': ' '.join(cells[1:])[:200],
+            })
+        self._fill_counts_from_rows(result)
+        return result
+
+    @staticmethod
+    def _fill_counts_from_rows(result: dict):
+        if not result['rows']:
+            return
+        for key in ('created', 'updated', 'failed'):
+            if not result[key]:
+                result[key] = sum(
+                    1 for r in result['rows'] if r['result'] == key
+                )
+
+    def fetch_status(self, status_url: str) -> dict:
+        r = self.session.get(status_url, timeout=15)
+        r.raise_for_status()
+        ctype = r.headers.get('Content-Type', '')
+        if 'json' in ctype:
+            return self.parse_json(r.json())
+        try:
+            return self.parse_json(json.loads(r.text))
+        except ValueError:
+            return self.parse_html(r.text)
+
+    # ══════════════════════════════════════════
+    # AȘTEPTARE
+    # ══════════════════════════════════════════
+
+    def _delays(self):
+        delay = self.initial_delay
+        while True:
+            yield delay
+            delay = min(delay * self.backoff, self.max_delay)
+
+    def wait(self, status_url: str) -> dict:
+        """Polling HTTP cu backoff exponențial până la final/timeout."""
+        t0 = time.time()
+        result = empty_result('running', status_url)
+        polls = 0
+        for delay in self._delays():
+            try:
+                result = self.fetch_status(status_url)
+            except Exception as e:
+                result = empty_result('running')
+                result['message'] = f"{type(e).__name__}: {str(e)[:100]}"
+            polls += 1
+            result['status_url'] = status_url
+            result['polls'] = polls
+            result['elapsed'] = round(time.time() - t0, 1)
+            if result['status'] in ('done', 'failed'):
+                return result
+            if time.time() - t0 + delay > self.timeout:
+                break
+            time.sleep(delay)
+        result['status'] = 'timeout'
+        return result
+
+    def start(self, status_url: str):
+        """Polling în fundal; returnează un Future cu rezultatul."""
+        return _EXECUTOR.submit(self.wait, status_url)
+
+    def wait_in_browser(self, timeout: float = 120) -> dict:
+        """
+        Fallback când nu există endpoint de status: urmărește pagina
+        din browser, tot cu backoff (fără pauză fixă de 5s).
+        """
+        t0 = time.time()
+        result = empty_result('running')
+        polls = 0
+        for delay in self._delays():
+            try:
+                page = self.driver.page_source
+                cur = self.driver.current_url.lower()
+                result = self.parse_html(page)
+                if (
+                    result['status'] == 'running'
+                    and 'import' not in cur
+                    and 'product' in cur
+                ):
+                    # Redirect după import
+                    result['status'] = 'done'
+                    result['message'] = 'redirect detectat'
+            except Exception:
+                pass
+            polls += 1
+            result['polls'] = polls
+            result['elapsed'] = round(time.time() - t0, 1)
+            if result['status'] in ('done', 'failed'):
+                return result
+            if time.time() - t0 + delay > timeout:
+                break
+            time.sleep(delay)
+        result['status'] = 'timeout'
+        return result
@@ -9,7 +9,6 @@ import os
 import io
 import re
 import time
-import csv
 import tempfile
 import pandas as pd
 import streamlit as st
@@ -24,6 +23,15 @@ from selenium.common.exceptions import (
     TimeoutException, NoSuchElementException,
     StaleElementReferenceException
 )
+from gomag.batch_upload import GomagBatchUploader
+from gomag.writer import GomagExportWriter
+from gomag.import_monitor import GomagImportMonitor
+from gomag.category_index import CategoryIndex
+from utils import metrics
+from gomag.row_builder import (
+    GomagRowBuilder, clean_description, build_full_description,
+    build_short_description, build_feed_description,
+)
 
 
 class GomagImporter:
@@ -93,6 +101,9 @@ class GomagImporter:
         self.logged_in = False
         self.base_url = ""
         self.categories_cache = []
+        self.last_export = None
+        self.last_import_result = None
+        self.last_import_future = None
 
     def _get_config(self) -> dict:
         try:
@@ -175,6 +186,7 @@ class GomagImporter:
         except Exception:
             pass
 
+    @metrics.timed('gomag_login', 'gomag')
     def login(self) -> bool:
         if self.logged_in:
             return True
@@ -264,336 +276,232 @@ class GomagImporter:
             st.error(f"❌ Eroare login Gomag: {str(e)}")
             return False
 
-    def get_categories(self) -> list:
-        if self.categories_cache:
+    def get_categories(self, force_refresh: bool = False) -> list:
+        """
+        Categoriile din indexul persistent (fără browser).
+        Browserul e folosit doar dacă indexul lipsește / a expirat
+        sau la force_refresh.
+        """
+        if self.categories_cache and not force_refresh:
             return self.categories_cache
+        index = CategoryIndex()
+        if force_refresh or index.is_stale():
+            try:
+                index.refresh(self._fetch_categories)
+            except Exception as e:
+                st.error(f"❌ Eroare categorii: {str(e)}")
+        self.categories_cache = index.categories
+        return self.categories_cache
+
+    def refresh_categories_async(self, force: bool = False) -> bool:
+        """
+        Reîmprospătează indexul de categorii în fundal, cu un
+        importer separat (browserul curent rămâne liber). După un
+        eșec, reîncercările automate așteaptă FAILURE_BACKOFF;
+        force (butonul din pagină) ignoră pauza.
+        """
+        def _fetch():
+            worker = GomagImporter()
+            try:
+                return worker._fetch_categories()
+            finally:
+                worker.close()
+
+        return CategoryIndex().refresh_in_background(_fetch, force=force)
+
+    @metrics.timed('gomag_categories', 'gomag')
+    def _fetch_categories(self) -> list:
+        """Citește arborele de categorii din /gomag/categories."""
         if not self.logged_in:
             if not self.login():
                 return []
+        self.driver.get(f"{self.base_url}/gomag/categories")
         try:
-            self.driver.get(f"{self.base_url}/gomag/categories")
-            time.sleep(4)
-            categories = []
-            try:
-                rows = self.driver.find_elements(
-                    By.CSS_SELECTOR, "table tbody tr"
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, "table tbody tr")
                 )
-                for row in rows:
-                    try:
-                        el = row.find_element(
-                            By.CSS_SELECTOR, "td a, td:first-child"
-                        )
-                        cat_name = el.text.strip()
-                        cat_href = el.get_attribute('href') or ''
-                        cat_id = ""
-                        m = re.search(r'/(\d+)', cat_href)
-                        if m:
-                            cat_id = m.group(1)
-                        if cat_name:
-                            categories.append({
-                                'id': cat_id,
-                                'name': cat_name,
-                                'path': cat_name,
-                            })
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-            self.categories_cache = categories
-            return categories
-        except Exception as e:
-            st.error(f"❌ Eroare categorii: {str(e)}")
+            )
+        except TimeoutException:
             return []
 
+        # Un singur apel JS în loc de 2-3 round trip-uri per rând
+        rows = self.driver.execute_script("""
+            var out = [];
+            document.querySelectorAll('table tbody tr').forEach(
+                function (row) {
+                    var el = row.querySelector('td a')
+                        || row.querySelector('td:first-child');
+                    if (!el) return;
+                    var cell = el.closest('td') || el;
+                    var pad = parseInt(
+                        window.getComputedStyle(cell).paddingLeft
+                    ) || 0;
+                    var lvl = row.getAttribute('data-level')
+                        || row.getAttribute('data-depth');
+                    var m = (row.className || '').match(/level-(\\d+)/);
+                    out.push({
+                        name: (el.innerText || '').trim(),
+                        href: el.getAttribute('href') || '',
+                        parent: row.getAttribute('data-parent-id')
+                            || row.getAttribute('data-parent') || '',
+                        level: lvl !== null ? parseInt(lvl)
+                            : (m ? parseInt(m[1]) : pad),
+                    });
+                }
+            );
+            return out;
+        """) or []
+
+        categories = []
+        for row in rows:
+            cat_id = ""
+            m = re.search(r'/(\d+)', row.get('href', ''))
+            if m:
+                cat_id = m.group(1)
+            if row.get('name'):
+                categories.append({
+                    'id': cat_id,
+                    'name': row['name'],
+                    'parent': row.get('parent', ''),
+                    'level': row.get('level'),
+                })
+        return categories
+
     # ══════════════════════════════════════════
     # CONSTRUCȚIE DESCRIERE PRODUS
     # ══════════════════════════════════════════
 
     def _build_full_description(self, product: dict) -> str:
         """Construiește descriere completă HTML."""
-        parts = []
-
-        raw_desc = product.get('description', '')
-        if raw_desc:
-            clean = re.sub(r'<[^>]+>', ' ', raw_desc)
-            clean = re.sub(r'\s+', ' ', clean).strip()
-            if clean and len(clean) > 10:
-                parts.append(f"<p>{clean}</p>")
-
-        specs = product.get('specifications', {})
-        if specs:
-            parts.append("<h3>Specificații</h3>")
-            parts.append("<ul>")
-            for key, val in specs.items():
-                if key and val:
-                    parts.append(
-                        f"<li><strong>{key}:</strong> {val}</li>"
-                    )
-            parts.append("</ul>")
-
-        if product.get('material'):
-            parts.append(
-                f"<p><strong>Material:</strong> "
-                f"{product['material']}</p>"
-            )
-        if product.get('dimensions'):
-            parts.append(
-                f"<p><strong>Dimensiuni:</strong> "
-                f"{product['dimensions']}</p>"
-            )
-        if product.get('weight'):
-            parts.append(
-                f"<p><strong>Greutate:</strong> "
-                f"{product['weight']}</p>"
-            )
-
-        colors = product.get('colors', [])
-        if colors:
-            parts.append(
-                f"<p><strong>Culori disponibile:</strong> "
-                f"{', '.join(colors)}</p>"
-            )
-
-        if not parts:
-            name = product.get('name', 'Produs importat')
-            parts.append(
-                f"<p>{name}. Produs de calitate superioară, "
-                f"ideal pentru protecția bunurilor personale.</p>"
-            )
-
-        return "\n".join(parts)
+        return build_full_description(
+            product, clean_description(product.get('description', ''))
+        )
 
     def _build_short_description(self, product: dict) -> str:
         """Construiește descriere scurtă (max 250 car)."""
-        parts = []
-
-        raw_desc = product.get('description', '')
-        if raw_desc:
-            clean = re.sub(r'<[^>]+>', ' ', raw_desc)
-            clean = re.sub(r'\s+', ' ', clean).strip()
-            if clean and len(clean) > 10:
-                first = clean.split('.')[0]
-                if len(first) > 20:
-                    parts.append(first.strip() + '.')
-
-        specs = product.get('specifications', {})
-        if specs and not parts:
-            sp = []
-            for k, v in list(specs.items())[:4]:
-                sp.append(f"{k}: {v}")
-            parts.append(" | ".join(sp))
-
-        if product.get('material') and not parts:
-            parts.append(f"Material: {product['material']}")
-
-        colors = product.get('colors', [])
-        if colors:
-            parts.append(
-                f"Disponibil în {len(colors)} culori: "
-                f"{', '.join(colors[:3])}"
-                + ("..." if len(colors) > 3 else "")
-            )
-
-        if not parts:
-            name = product.get('name', 'Produs importat')
-            parts.append(
-                f"{name} - produs cu protecție anti-furt."
-            )
-
-        return " | ".join(parts)[:250]
+        return build_short_description(
+            product, clean_description(product.get('description', ''))
+        )
 
     def _build_feed_description(self, product: dict) -> str:
         """Descriere feed-uri (max 200 car)."""
-        name = product.get('name', '')
-        colors = product.get('colors', [])
-        specs = product.get('specifications', {})
-        parts = [name]
-        if colors:
-            parts.append(f"Culori: {', '.join(colors[:3])}")
-        for k, v in list(specs.items())[:2]:
-            parts.append(f"{k}: {v}")
-        return ". ".join(parts)[:200]
+        return build_feed_description(product)
 
     # ══════════════════════════════════════════
     # GENERARE CSV/EXCEL COMPATIBIL GOMAG
     # ══════════════════════════════════════════
 
+    def row_builder(
+        self, category_name: str = "", brand: str = "",
+    ) -> GomagRowBuilder:
+        return GomagRowBuilder(
+            self.GOMAG_COLUMNS, category_name, brand
+        )
+
     def generate_gomag_csv(
         self, products: list,
         category_name: str = "", brand: str = "",
     ) -> pd.DataFrame:
-        rows = []
-        for product in products:
-            row = self._product_to_gomag_row(
-                product, category_name, brand
-            )
-            rows.append(row)
+        rows = list(
+            self.row_builder(category_name, brand).iter_rows(products)
+        )
         return pd.DataFrame(rows, columns=self.GOMAG_COLUMNS)
 
     def _product_to_gomag_row(
         self, product: dict,
         category_name: str = "", brand: str = "",
     ) -> list:
-        sku = product.get('sku', '')
-        name = product.get('name', 'Produs Importat')
-        description = self._build_full_description(product)
-        short_desc = self._build_short_description(product)
-        feed_desc = self._build_feed_description(product)
-
-        images = product.get('images', [])
-        images_url = '|'.join(images[:10]) if images else ''
-
-        colors = product.get('colors', [])
-        colors_str = ','.join(colors) if colors else ''
-
-        price = product.get('final_price', 1.0)
-        if price <= 0:
-            price = 1.0
-        price_str = f"{price:.2f}"
-
-        buy_price = product.get('original_price', 0)
-        buy_price_str = (
-            f"{buy_price:.2f}" if buy_price > 0 else ""
-        )
-
-        weight = product.get('weight', '')
-        weight_str = ""
-        if weight:
-            wm = re.search(r'([\d.]+)', str(weight))
-            if wm:
-                weight_str = wm.group(1)
-
-        kw_parts = [name.lower().replace('-', ' ')]
-        if 'anti' in name.lower():
-            kw_parts.extend(["anti-furt", "anti-theft"])
-        if (
-            'rucsac' in name.lower()
-            or 'backpack' in name.lower()
-        ):
-            kw_parts.extend(["rucsac", "ghiozdan"])
-        kw_parts.extend(["protectie", "siguranta"])
-        if colors:
-            kw_parts.extend(colors[:3])
-        keywords = ", ".join(kw_parts)
-
-        meta_desc = (
-            short_desc[:160] if short_desc else name[:160]
+        return self.row_builder(
+            category_name, brand
+        ).build_row(product)
+
+    def export_writer(
+        self, category_name: str = "", brand: str = "",
+    ) -> GomagExportWriter:
+        """Writer streaming; reține ultimul export pentru preview."""
+        self.last_export = GomagExportWriter(
+            self, category_name, brand
         )
+        return self.last_export
 
-        if not brand:
-            source = product.get('source_site', '')
-            brand_map = {
-                'xdconnects': 'XD Design',
-                'pfconcept': 'PF Concept',
-                'promobox': 'Promobox',
-                'andapresent': 'Anda Present',
-                'midocean': 'Midocean',
-                'sipec': 'Sipec',
-                'stricker': 'Stricker',
-                'stamina': 'Stamina',
-                'utteam': 'UT Team',
-                'clipper': 'Clipper',
-                'psi': 'PSI',
-            }
-            brand = brand_map.get(source, source)
-
-        return [
-            sku,                            # Cod Produs (SKU)
-            '',                             # Cod EAN
-            '',                             # Cod Grupa
-            '',                             # Varianta principala
-            name,                           # Denumire Produs
-            description,                    # Descriere Produs
-            short_desc,                     # Descriere Scurta
-            images_url,                     # URL Poza de Produs
-            '',                             # URL Video
-            '',                             # Pozitie in Listari
-            '',                             # Produse Cross-Sell
-            '',                             # Produse Up-Sell
-            feed_desc,                      # Descriere pt feed-uri
-            colors_str,                     # Atribute: Culoare
-            keywords,                       # Cuvinte Cautare
-            price_str,                      # Pret Produs: Descriere
-            '',                             # GEO
-            '',                             # Cantitate Totala
-            '',                             # UM Cantitate Totala
-            '',                             # Cantitate Unitara
-            '',                             # UM Cantitate Unitara
-            '',                             # Pret Special
-            '2-5 zile lucratoare',          # Durata de Livrare
-            'zile',                         # Tip Durata Livrare
-            '',                             # Cantitate Maxima
-            'buc',                          # Unitate de masura
-            product.get('source_url', ''),  # Cod extern
-            buy_price_str,                  # Pret de Achizitie
-            '',                             # Tag postari
-            '0',                            # Produs digital
-            '',                             # Data modif pret
-            '',                             # Cota TVA diferita PJ
-            '1',                            # Pretul Include TVA
-            '',                             # Cota TVA PJ
-            '',                             # Info siguranta
-            '19',                           # Cota TVA
-            'RON',                          # Moneda
-            '1',                            # Stoc Cantitativ
-            '',                             # Completare Stoc
-            'In Stoc',                      # Stare Stoc
-            '0',                            # Gestioneaza Auto Stoc
-            '0',                            # Se Aduce la Comanda
-            '1',                            # Cantitate Minima
-            '1',                            # Increment Cantitate
-            weight_str,                     # Greutate (Kg)
-            '1',                            # Activ in Magazin
-            '',                             # Activ de la
-            '',                             # Activ pana la
-            category_name,                  # Categorie
-            brand,                          # Marca (Brand)
-            name[:70],                      # Titlu Meta
-            meta_desc,                      # Descriere Meta
-            keywords[:250],                 # Cuvinte Cheie
-            name[:100],                     # Titlul Imaginii
-            '',                             # Url Link Canonical
-            '',                             # Id Produs
-        ]
-
+    @metrics.timed('export_csv', 'gomag')
     def generate_csv_file(
         self, products: list,
         category_name: str = "", brand: str = "",
     ) -> bytes:
-        df = self.generate_gomag_csv(
-            products, category_name, brand
-        )
-        output = io.StringIO()
-        df.to_csv(
-            output, index=False, sep=',',
-            quoting=csv.QUOTE_ALL, encoding='utf-8',
-        )
-        return ('\ufeff' + output.getvalue()).encode('utf-8')
+        return self.export_writer(
+            category_name, brand
+        ).to_csv_bytes(products)
+
+    @metrics.timed('export_diff', 'gomag')
+    def generate_diff_files(
+        self, products: list, catalog,
+        category_name: str = "", brand: str = "",
+    ) -> tuple:
+        """(CSV produse noi, CSV actualizări, CatalogDiff)."""
+        return self.export_writer(
+            category_name, brand
+        ).to_diff_csv_bytes(products, catalog)
 
+    @metrics.timed('export_xlsx', 'gomag')
     def generate_excel_file(
         self, products: list,
         category_name: str = "", brand: str = "",
     ) -> bytes:
-        df = self.generate_gomag_csv(
-            products, category_name, brand
-        )
-        buf = io.BytesIO()
-        df.to_excel(buf, index=False, engine='openpyxl')
-        buf.seek(0)
-        return buf.getvalue()
+        return self.export_writer(
+            category_name, brand
+        ).to_xlsx_bytes(products)
+
+    def export_preview(self) -> pd.DataFrame:
+        """Preview-ul ultimului export, fără a regenera rândurile."""
+        if self.last_export is None:
+            return pd.DataFrame()
+        return self.last_export.preview_dataframe()
 
     # ══════════════════════════════════════════
     # UPLOAD AUTOMAT ÎN GOMAG
     # URL: /gomag/product/import/add
     # ══════════════════════════════════════════
 
-    def upload_csv_to_gomag(self, csv_bytes: bytes) -> bool:
+    def _report_import_result(self, result: dict) -> bool:
+        """Afișează rezultatul monitorizării și îl reține."""
+        self.last_import_result = result
+        counts = (
+            f"{result['created']} create, "
+            f"{result['updated']} actualizate, "
+            f"{result['failed']} eșuate"
+        )
+        if result['status'] == 'done':
+            st.success(
+                f"✅ Import finalizat în {result['elapsed']}s "
+                f"({counts})"
+            )
+            return True
+        if result['status'] == 'failed':
+            st.error(f"❌ Eroare la import! ({counts})")
+            self._save_screenshot("ERROR_import")
+            return False
+        st.warning(
+            f"⚠️ Timeout așteptare import "
+            f"({result['elapsed']}s). Verifică manual în Gomag."
+        )
+        self._save_screenshot("TIMEOUT_import")
+        return True
+
+    @metrics.timed('gomag_upload', 'gomag')
+    def upload_csv_to_gomag(
+        self, csv_bytes: bytes, wait: bool = True
+    ) -> bool:
         """
         Upload automat CSV în Gomag.
         Pagina: /gomag/product/import/add
         1. Selectează fișier
         2. Corelează coloanele automat (prima linie = header)
         3. Click Start Import
+        4. Urmărește job-ul prin HTTP (GomagImportMonitor)
+        Cu wait=False, polling-ul rulează în fundal
+        (self.last_import_future) și browserul e eliberat imediat.
         """
         if not self.logged_in:
             if not self.login():
@@ -894,84 +802,31 @@ class GomagImporter:
                     self._save_screenshot("ERROR_no_start_import")
                     return False
 
-                # ═══ PASUL 9: Așteptăm finalizarea ═══
-                st.info("⏳ Import în curs, aștept finalizarea...")
-
-                # Așteptăm până la 120 secunde
-                for wait_sec in range(0, 120, 5):
-                    time.sleep(5)
-                    try:
-                        page = self.driver.page_source.lower()
-                        cur = self.driver.current_url.lower()
-
-                        # Verificăm succes
-                        if any(
-                            msg in page
-                            for msg in [
-                                'import finalizat',
-                                'import complet',
-                                'importul a fost finalizat',
-                                'produse importate',
-                                'import successful',
-                                'successfully imported',
-                                'produse adaugate',
-                            ]
-                        ):
-                            st.success(
-                                "✅ Import finalizat cu succes!"
-                            )
-                            self._save_screenshot(
-                                "SUCCESS_import"
-                            )
-                            return True
-
-                        # Verificăm eroare
-                        if any(
-                            msg in page
-                            for msg in [
-                                'eroare import',
-                                'import error',
-                                'import failed',
-                                'eroare la import',
-                            ]
-                        ):
-                            st.error("❌ Eroare la import!")
-                            self._save_screenshot(
-                                "ERROR_import"
-                            )
-                            return False
-
-                        # Verificăm dacă pagina s-a schimbat
-                        # (redirect după import)
-                        if (
-                            'import' not in cur
-                            and 'product' in cur
-                        ):
-                            st.success(
-                                "✅ Import probabil reușit "
-                                "(redirect detectat)"
-                            )
-                            self._save_screenshot(
-                                "REDIRECT_after_import"
-                            )
-                            return True
-
-                    except Exception:
-                        pass
-
-                    if wait_sec % 15 == 0 and wait_sec > 0:
-                        st.info(
-                            f"⏳ Încă aștept... "
-                            f"({wait_sec}s)"
+                # ═══ PASUL 9: Monitorizare import (HTTP) ═══
+                monitor = GomagImportMonitor(
+                    self.driver, self.base_url
+                )
+                status_url = monitor.discover_status_url()
+                if status_url:
+                    st.info(
+                        f"⏳ Urmăresc importul prin HTTP: "
+                        f"{status_url}"
+                    )
+                    if not wait:
+                        # Browserul e liber pentru următorul fișier
+                        self.last_import_future = monitor.start(
+                            status_url
                         )
+                        return True
+                    result = monitor.wait(status_url)
+                else:
+                    st.info(
+                        "⏳ Endpoint de status negăsit, "
+                        "urmăresc pagina de import..."
+                    )
+                    result = monitor.wait_in_browser()
 
-                # Timeout
-                st.warning(
-                    "⚠️ Timeout așteptare import (120s). "
-                    "Verifică manual în Gomag."
-                )
-                self._save_screenshot("TIMEOUT_import")
-                return True
+                return self._report_import_result(result)
 
             finally:
                 try:
@@ -984,16 +839,32 @@ class GomagImporter:
             self._save_screenshot("ERROR_upload")
             return False
 
+    def import_products(
+        self, products: list,
+        category_name: str = "", brand: str = "",
+        progress_callback=None,
+    ) -> list:
+        """
+        Import în loturi: câteva fișiere XLSX încărcate
+        printr-o singură sesiune, în loc de un upload per produs.
+        Returnează lista de loturi cu status.
+        """
+        uploader = GomagBatchUploader(self)
+        return uploader.upload(
+            products, category_name, brand,
+            progress_callback=progress_callback,
+        )
+
     def import_product(
         self, product: dict,
         category_id: str = "",
         category_name: str = "",
     ) -> bool:
         try:
-            csv_bytes = self.generate_csv_file(
-                [product], category_name
+            chunks = self.import_products([product], category_name)
+            return bool(chunks) and all(
+                c['status'] == 'done' for c in chunks
             )
-            return self.upload_csv_to_gomag(csv_bytes)
         except Exception as e:
             st.error(f"❌ Eroare import: {str(e)}")
             return False
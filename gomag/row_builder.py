@@ -0,0 +1,310 @@
+# gomag/row_builder.py
+"""
+Construcție rânduri Gomag în lot (pentru exporturi mari).
+- Regex-uri precompilate; descrierea e curățată O SINGURĂ dată
+  per produs și reutilizată pentru descrierea completă/scurtă/feed
+- Coloanele constante sunt precalculate într-un rând-șablon
+- Produsele sunt procesate pe loturi, coloană cu coloană
+"""
+import re
+from itertools import islice
+
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_WEIGHT_RE = re.compile(r'([\d.]+)')
+
+BRAND_MAP = {
+    'xdconnects': 'XD Design',
+    'pfconcept': 'PF Concept',
+    'promobox': 'Promobox',
+    'andapresent': 'Anda Present',
+    'midocean': 'Midocean',
+    'sipec': 'Sipec',
+    'stricker': 'Stricker',
+    'stamina': 'Stamina',
+    'utteam': 'UT Team',
+    'clipper': 'Clipper',
+    'psi': 'PSI',
+}
+
+# Valori identice pentru toate produsele
+CONSTANT_COLUMNS = {
+    'Produs: Durata de Livrare': '2-5 zile lucratoare',
+    'Produs: Tip Durata de Livrare': 'zile',
+    'Produs: Unitate de masura': 'buc',
+    'Produs: Produs digital': '0',
+    'Pretul Include TVA': '1',
+    'Cota TVA': '19',
+    'Moneda': 'RON',
+    'Stoc Cantitativ': '1',
+    'Stare Stoc': 'In Stoc',
+    'Gestioneaza Automat Stocul': '0',
+    'Se Aduce la Comanda': '0',
+    'Cantitate Minima': '1',
+    'Increment de Cantitate': '1',
+    'Activ in Magazin': '1',
+}
+
+DEFAULT_BATCH_SIZE = 512
+
+
+def clean_description(raw_desc: str) -> str:
+    """Elimină tag-urile HTML și normalizează spațiile."""
+    if not raw_desc:
+        return ""
+    return _WS_RE.sub(' ', _TAG_RE.sub(' ', raw_desc)).strip()
+
+
+def build_full_description(product: dict, clean: str) -> str:
+    """Descriere completă HTML din descrierea deja curățată."""
+    parts = []
+
+    if clean and len(clean) > 10:
+        parts.append(f"<p>{clean}</p>")
+
+    specs = product.get('specifications', {})
+    if specs:
+        parts.append("<h3>Specificații</h3>")
+        parts.append("<ul>")
+        for key, val in specs.items():
+            if key and val:
+                parts.append(
+                    f"<li><strong>{key}:</strong> {val}</li>"
+                )
+        parts.append("</ul>")
+
+    if product.get('material'):
+        parts.append(
+            f"<p><strong>Material:</strong> "
+            f"{product['material']}</p>"
+        )
+    if product.get('dimensions'):
+        parts.append(
+            f"<p><strong>Dimensiuni:</strong> "
+            f"{product['dimensions']}</p>"
+        )
+    if product.get('weight'):
+        parts.append(
+            f"<p><strong>Greutate:</strong> "
+            f"{product['weight']}</p>"
+        )
+
+    colors = product.get('colors', [])
+    if colors:
+        parts.append(
+            f"<p><strong>Culori disponibile:</strong> "
+            f"{', '.join(colors)}</p>"
+        )
+
+    if not parts:
+        name = product.get('name', 'Produs importat')
+        parts.append(
+            f"<p>{name}. Produs de calitate superioară, "
+            f"ideal pentru protecția bunurilor personale.</p>"
+        )
+
+    return "\n".join(parts)
+
+
+def build_short_description(product: dict, clean: str) -> str:
+    """Descriere scurtă (max 250 car) din descrierea curățată."""
+    parts = []
+
+    if clean and len(clean) > 10:
+        first = clean.split('.', 1)[0]
+        if len(first) > 20:
+            parts.append(first.strip() + '.')
+
+    specs = product.get('specifications', {})
+    if specs and not parts:
+        sp = []
+        for k, v in islice(specs.items(), 4):
+            sp.append(f"{k}: {v}")
+        parts.append(" | ".join(sp))
+
+    if product.get('material') and not parts:
+        parts.append(f"Material: {product['material']}")
+
+    colors = product.get('colors', [])
+    if colors:
+        parts.append(
+            f"Disponibil în {len(colors)} culori: "
+            f"{', '.join(colors[:3])}"
+            + ("..." if len(colors) > 3 else "")
+        )
+
+    if not parts:
+        name = product.get('name', 'Produs importat')
+        parts.append(
+            f"{name} - produs cu protecție anti-furt."
+        )
+
+    return " | ".join(parts)[:250]
+
+
+def build_feed_description(product: dict) -> str:
+    """Descriere feed-uri (max 200 car)."""
+    name = product.get('name', '')
+    colors = product.get('colors', [])
+    specs = product.get('specifications', {})
+    parts = [name]
+    if colors:
+        parts.append(f"Culori: {', '.join(colors[:3])}")
+    for k, v in islice(specs.items(), 2):
+        parts.append(f"{k}: {v}")
+    return ". ".join(parts)[:200]
+
+
+def _build_keywords(name_lower: str, colors: list) -> str:
+    kw_parts = [name_lower.replace('-', ' ')]
+    if 'anti' in name_lower:
+        kw_parts.extend(["anti-furt", "anti-theft"])
+    if 'rucsac' in name_lower or 'backpack' in name_lower:
+        kw_parts.extend(["rucsac", "ghiozdan"])
+    kw_parts.extend(["protectie", "siguranta"])
+    if colors:
+        kw_parts.extend(colors[:3])
+    return ", ".join(kw_parts)
+
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+class GomagRowBuilder:
+    """
+    Construiește rândurile Gomag pe loturi.
+    Rândurile au ordinea din `columns` (GomagImporter.GOMAG_COLUMNS).
+    """
+
+    def __init__(
+        self, columns: list,
+        category_name: str = "", brand: str = "",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.columns = list(columns)
+        self.brand = brand
+        self.batch_size = max(1, batch_size)
+        idx = {col: i for i, col in enumerate(self.columns)}
+
+        # Rând-șablon cu toate coloanele constante completate
+        self._template = [''] * len(self.columns)
+        for col, val in CONSTANT_COLUMNS.items():
+            if col in idx:
+                self._template[idx[col]] = val
+        if 'Categorie / Categorii' in idx:
+            self._template[idx['Categorie / Categorii']] = category_name
+        if brand and 'Marca (Brand)' in idx:
+            self._template[idx['Marca (Brand)']] = brand
+
+        get = idx.get
+        self._i_sku = get('Cod Produs (SKU)')
+        self._i_name = get('Denumire Produs')
+        self._i_desc = get('Descriere Produs')
+        self._i_short = get('Descriere Scurta a Produsului')
+        self._i_images = get('URL Poza de Produs')
+        self._i_feed = get('Descriere pt feed-uri')
+        self._i_colors = get('Atribute: Culoare (variante de produs)')
+        self._i_search = get('Cuvinte Cautare')
+        self._i_price = get('Pret Produs: Descriere')
+        self._i_ext = get('Produs: Cod extern')
+        self._i_buy = get('Pret de Achizitie')
+        self._i_weight = get('Greutate (Kg)')
+        self._i_brand = get('Marca (Brand)')
+        self._i_meta_title = get('Titlu Meta')
+        self._i_meta_desc = get('Descriere Meta')
+        self._i_keywords = get('Cuvinte Cheie')
+        self._i_img_title = get('Titlul Imaginii Principale')
+
+    def iter_rows(self, products):
+        """Generează rândurile, procesând produsele pe loturi."""
+        for batch in _batched(products, self.batch_size):
+            yield from self._build_batch(batch)
+
+    def build_row(self, product: dict) -> list:
+        return self._build_batch([product])[0]
+
+    def _build_batch(self, batch: list) -> list:
+        # Coloane extrase o singură dată pentru tot lotul
+        names = [p.get('name', 'Produs Importat') for p in batch]
+        cleans = [
+            clean_description(p.get('description', ''))
+            for p in batch
+        ]
+        colors_col = [p.get('colors', []) for p in batch]
+
+        rows = []
+        for product, name, clean, colors in zip(
+            batch, names, cleans, colors_col
+        ):
+            row = self._template.copy()
+            short_desc = build_short_description(product, clean)
+            name_lower = name.lower()
+            keywords = _build_keywords(name_lower, colors)
+
+            images = product.get('images', [])
+            price = product.get('final_price', 1.0)
+            if price <= 0:
+                price = 1.0
+            buy_price = product.get('original_price', 0)
+
+            weight_str = ""
+            weight = product.get('weight', '')
+            if weight:
+                wm = _WEIGHT_RE.search(str(weight))
+                if wm:
+                    weight_str = wm.group(1)
+
+            self._set(row, self._i_sku, product.get('sku', ''))
+            self._set(row, self._i_name, name)
+            self._set(
+                row, self._i_desc,
+                build_full_description(product, clean)
+            )
+            self._set(row, self._i_short, short_desc)
+            self._set(
+                row, self._i_images,
+                '|'.join(images[:10]) if images else ''
+            )
+            self._set(
+                row, self._i_feed, build_feed_description(product)
+            )
+            self._set(
+                row, self._i_colors,
+                ','.join(colors) if colors else ''
+            )
+            self._set(row, self._i_search, keywords)
+            self._set(row, self._i_price, f"{price:.2f}")
+            self._set(
+                row, self._i_ext, product.get('source_url', '')
+            )
+            self._set(
+                row, self._i_buy,
+                f"{buy_price:.2f}" if buy_price > 0 else ""
+            )
+            self._set(row, self._i_weight, weight_str)
+            if not self.brand:
+                source = product.get('source_site', '')
+                self._set(
+                    row, self._i_brand, BRAND_MAP.get(source, source)
+                )
+            self._set(row, self._i_meta_title, name[:70])
+            self._set(
+                row, self._i_meta_desc,
+                short_desc[:160] if short_desc else name[:160]
+            )
+            self._set(row, self._i_keywords, keywords[:250])
+            self._set(row, self._i_img_title, name[:100])
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _set(row: list, idx, value):
+        if idx is not None:
+            row[idx] = value
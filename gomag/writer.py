@@ -0,0 +1,232 @@
+# gomag/writer.py
+"""
+Writer streaming pentru fișierele de import Gomag (CSV / XLSX).
+- Rândurile sunt generate direct din iteratorul de produse
+  și scrise imediat (modul csv / openpyxl write-only),
+  fără listă completă de rânduri și fără DataFrame pandas
+- Fiecare rând e calculat o singură dată; pentru preview se
+  păstrează doar coloanele afișate, deci memoria rămâne constantă
+"""
+import io
+import csv
+import pandas as pd
+from openpyxl import Workbook
+
+from gomag.catalog_diff import CatalogDiff
+
+
+PREVIEW_COLUMNS = [
+    'Cod Produs (SKU)',
+    'Denumire Produs',
+    'Pret Produs: Descriere',
+    'Atribute: Culoare (variante de produs)',
+    'Stoc Cantitativ',
+    'Activ in Magazin',
+    'Categorie / Categorii',
+    'Marca (Brand)',
+    'URL Poza de Produs',
+]
+
+# Mărimea implicită a unei bucăți la generarea CSV în streaming
+CSV_CHUNK_SIZE = 64 * 1024
+
+# Import Gomag doar pentru preț / stoc: SKU-ul identifică produsul,
+# restul coloanelor rămân neatinse în magazin
+PRICE_UPDATE_COLUMNS = [
+    'Cod Produs (SKU)',
+    'Pret Produs: Descriere',
+    'Pret de Achizitie',
+]
+STOCK_UPDATE_COLUMNS = ['Stoc Cantitativ', 'Stare Stoc']
+STOCK_STATES = {1: 'In Stoc', 0: 'Stoc Epuizat'}
+
+
+class GomagExportWriter:
+    """Scrie produse în format Gomag, rând cu rând."""
+
+    def __init__(
+        self, importer,
+        category_name: str = "", brand: str = "",
+        preview_columns: list = None,
+        preview_limit: int = 1000,
+    ):
+        self.importer = importer
+        self.columns = importer.GOMAG_COLUMNS
+        self.category_name = category_name
+        self.brand = brand
+        self.preview_columns = [
+            c for c in (preview_columns or PREVIEW_COLUMNS)
+            if c in self.columns
+        ]
+        self._preview_idx = [
+            self.columns.index(c) for c in self.preview_columns
+        ]
+        self.preview_limit = preview_limit
+        self.preview_rows = []
+        self.rows_written = 0
+
+    def iter_rows(self, products):
+        """
+        Generează rândurile Gomag pe rând (generator) și
+        reține în cache doar coloanele de preview.
+        """
+        self.preview_rows = []
+        self.rows_written = 0
+        builder = self.importer.row_builder(
+            self.category_name, self.brand
+        )
+        for row in builder.iter_rows(products):
+            if len(self.preview_rows) < self.preview_limit:
+                self.preview_rows.append(
+                    [row[i] for i in self._preview_idx]
+                )
+            self.rows_written += 1
+            yield row
+
+    # ══════════════════════════════════════════
+    # CSV
+    # ══════════════════════════════════════════
+
+    def _csv_writer(self, text_stream):
+        return csv.writer(
+            text_stream, delimiter=',',
+            quoting=csv.QUOTE_ALL, lineterminator='\n',
+        )
+
+    def write_csv(self, products, fileobj) -> int:
+        """
+        Scrie CSV (UTF-8 cu BOM) într-un fișier binar deschis.
+        Returnează numărul de rânduri scrise.
+        """
+        text = io.TextIOWrapper(
+            fileobj, encoding='utf-8-sig', newline=''
+        )
+        try:
+            writer = self._csv_writer(text)
+            writer.writerow(self.columns)
+            for row in self.iter_rows(products):
+                writer.writerow(row)
+            text.flush()
+        finally:
+            # Nu închidem fișierul apelantului
+            text.detach()
+        return self.rows_written
+
+    def iter_csv_chunks(self, products, chunk_size: int = CSV_CHUNK_SIZE):
+        """Generează CSV-ul ca bucăți de bytes (primul începe cu BOM)."""
+        buf = io.StringIO()
+        writer = self._csv_writer(buf)
+        buf.write('\ufeff')
+        writer.writerow(self.columns)
+        for row in self.iter_rows(products):
+            writer.writerow(row)
+            if buf.tell() >= chunk_size:
+                yield buf.getvalue().encode('utf-8')
+                buf.seek(0)
+                buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode('utf-8')
+
+    def to_csv_bytes(self, products) -> bytes:
+        out = io.BytesIO()
+        for chunk in self.iter_csv_chunks(products):
+            out.write(chunk)
+        return out.getvalue()
+
+    def to_diff_csv_bytes(self, products, catalog) -> tuple:
+        """
+        Export incremental față de exportul Gomag (GomagCatalog):
+        (CSV produse noi, CSV actualizări, CatalogDiff cu statistici).
+        Produsele neschimbate nu apar în niciun fișier.
+        """
+        diff = CatalogDiff(catalog, self.columns)
+        new_buf = io.StringIO()
+        new_buf.write('\ufeff')
+        writer = self._csv_writer(new_buf)
+        writer.writerow(self.columns)
+        for row in diff.new_rows(self.iter_rows(products)):
+            writer.writerow(row)
+
+        header, rows = diff.update_table()
+        update_buf = io.StringIO()
+        update_buf.write('\ufeff')
+        writer = self._csv_writer(update_buf)
+        writer.writerow(header)
+        writer.writerows(rows)
+        return (
+            new_buf.getvalue().encode('utf-8'),
+            update_buf.getvalue().encode('utf-8'),
+            diff,
+        )
+
+    # ══════════════════════════════════════════
+    # XLSX
+    # ══════════════════════════════════════════
+
+    def write_xlsx(self, products, fileobj) -> int:
+        """
+        Scrie XLSX cu openpyxl în modul write-only
+        (rândurile nu sunt ținute în memorie).
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title='Sheet1')
+        ws.append(self.columns)
+        for row in self.iter_rows(products):
+            ws.append(row)
+        wb.save(fileobj)
+        return self.rows_written
+
+    def to_xlsx_bytes(self, products) -> bytes:
+        buf = io.BytesIO()
+        self.write_xlsx(products, buf)
+        return buf.getvalue()
+
+    # ══════════════════════════════════════════
+    # PREVIEW
+    # ══════════════════════════════════════════
+
+    def preview_dataframe(self) -> pd.DataFrame:
+        """Preview din rândurile deja calculate la export."""
+        return pd.DataFrame(
+            self.preview_rows, columns=self.preview_columns
+        )
+
+
+# ══════════════════════════════════════════
+# ACTUALIZARE PREȚ / STOC
+# ══════════════════════════════════════════
+
+def price_update_csv(results, with_stock: bool = False,
+                     only_changed: bool = True) -> bytes:
+    """
+    CSV minimal pentru Gomag din rezultatele scrapers.price_refresh:
+    SKU + preț final + preț de achiziție (+ stoc). Rândurile fără preț
+    sunt omise; cu only_changed, și cele nemodificate.
+    """
+    columns = PRICE_UPDATE_COLUMNS + (
+        STOCK_UPDATE_COLUMNS if with_stock else []
+    )
+    buf = io.StringIO()
+    buf.write('\ufeff')
+    writer = csv.writer(
+        buf, delimiter=',', quoting=csv.QUOTE_ALL, lineterminator='\n',
+    )
+    writer.writerow(columns)
+    for result in results:
+        if not result.get('sku') or not result.get('price'):
+            continue
+        if only_changed and not result.get('changed'):
+            continue
+        row = [
+            result['sku'],
+            f"{result['final_price']:.2f}",
+            f"{result['price']:.2f}",
+        ]
+        if with_stock:
+            stock = result.get('stock')
+            row += (
+                ['', ''] if stock is None
+                else [str(stock), STOCK_STATES[min(stock, 1)]]
+            )
+        writer.writerow(row)
+    return buf.getvalue().encode('utf-8')
@@ -4,12 +4,15 @@ Scraper pentru andapresent.com.
 """
 import re
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 
 
+@register_scraper('andapresent', 'andapresent.com')
 class AndaPresentScraper(BaseScraper):
+    PRODUCT_URL_PATTERN = r'/products/[^/?#]+'
+
     def __init__(self):
         super().__init__()
         self.name = "andapresent"
@@ -19,12 +22,15 @@ class AndaPresentScraper(BaseScraper):
         try:
             soup = self.get_page(
                 url,
-                wait_selector='h1, .product-name, [class*="product"]',
-                prefer_selenium=True
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
             )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata)
+            data = self.structured
+
             name = ""
             for sel in ['h1', '.product-name', '.product-title',
                          '[class*="product-detail"] h1']:
@@ -32,20 +38,18 @@ class AndaPresentScraper(BaseScraper):
                 if el and el.get_text(strip=True):
                     name = el.get_text(strip=True)
                     break
+            if not name:
+                name = data.get('name', '')
 
             # SKU din URL (ex: AP721326-10)
             sku = ""
             sku_match = re.search(r'/products/([^?/]+)', url)
             if sku_match:
                 sku = sku_match.group(1).upper()
+            if not sku:
+                sku = data.get('sku', '')
 
-            price = 0.0
-            for sel in ['.product-price', '.price', '[class*="price"]']:
-                el = soup.select_one(sel)
-                if el:
-                    price = clean_price(el.get_text(strip=True))
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             description = ""
             for sel in ['.product-description', '[class*="description"]',
@@ -54,6 +58,8 @@ class AndaPresentScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             specifications = {}
             for sel in ['.product-specifications', 'table',
@@ -90,6 +96,8 @@ class AndaPresentScraper(BaseScraper):
                             if abs_url not in images:
                                 images.append(abs_url)
                     break
+            if not images:
+                images = list(data.get('images', []))
 
             if not images:
                 for img in soup.select('img'):
@@ -116,6 +124,8 @@ class AndaPresentScraper(BaseScraper):
                         colors.append(c)
                 if colors:
                     break
+            if not colors:
+                colors = list(data.get('colors', []))
 
             return self._build_product(
                 name=name or f"Produs Anda Present {sku}",
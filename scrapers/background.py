@@ -0,0 +1,237 @@
+# scrapers/background.py
+"""
+Extragerea (scraping + traducere) ca job de fundal.
+Thread-ul jobului deține ScrapePipeline-ul și propria conexiune la
+ProductStore-ul sesiunii; progresul și rezultatele ajung în JobStore.
+Pagina Streamlit doar citește starea, deci rerun-urile, refresh-ul
+sau închiderea tab-ului nu mai opresc extragerea.
+În modul distribuit (queue_url) URL-urile merg în coada durabilă
+(scrapers.work_queue), iar jobul doar adună rezultatele workerilor
+(scrapers.worker), traduce și salvează.
+"""
+import time
+import threading
+import traceback
+
+from scrapers import registry
+from scrapers.pipeline import ScrapePipeline
+from scrapers.work_queue import (
+    open_queue, QUEUED, LEASED, FAILED as TASK_FAILED,
+)
+from utils import metrics
+from utils.helpers import match_scraper
+from utils.job_store import (
+    get_job_store, DONE, FAILED, CANCELLED,
+)
+from utils.product_store import ProductStore, SCRAPED, TRANSLATED
+from utils.translator import translate_product_data
+
+
+# Metricile se salvează în job cel mult o dată la atâtea secunde
+METRICS_EVERY = 2.0
+# Cât de des verifică jobul distribuit coada
+QUEUE_POLL_SECONDS = 0.5
+
+_threads = {}
+_threads_lock = threading.Lock()
+
+
+def start_scrape_job(urls: list, store_path: str,
+                     translate: bool = True,
+                     use_page_cache: bool = True,
+                     queue_url: str = None,
+                     local_workers: int = 0,
+                     tabs_per_supplier: int = 1,
+                     prefetch_lookahead: int = 0) -> str:
+    """
+    Pornește extragerea într-un thread de fundal; returnează id-ul.
+    queue_url: mod distribuit (coada din acel URL); local_workers
+    pornește și procese worker pe mașina curentă. tabs_per_supplier:
+    pagini încărcate în paralel per furnizor (browsere comune).
+    prefetch_lookahead: URL-uri descărcate în avans per furnizor.
+    """
+    jobs = get_job_store()
+    job_id = jobs.create(
+        'scrape', len(urls), store_path,
+        {'translate': translate, 'use_page_cache': use_page_cache,
+         'queue_url': queue_url, 'local_workers': local_workers,
+         'tabs_per_supplier': tabs_per_supplier,
+         'prefetch_lookahead': prefetch_lookahead},
+    )
+    if queue_url and local_workers:
+        from scrapers.worker import start_local_workers
+        start_local_workers(local_workers, queue_url)
+    thread = threading.Thread(
+        target=run_scrape_job,
+        args=(job_id, list(urls), store_path, translate, use_page_cache),
+        kwargs={'queue_url': queue_url,
+                'tabs_per_supplier': tabs_per_supplier,
+                'prefetch_lookahead': prefetch_lookahead},
+        name=f"job-{job_id}",
+        daemon=True,
+    )
+    with _threads_lock:
+        _threads[job_id] = thread
+    thread.start()
+    return job_id
+
+
+def is_alive(job_id: str) -> bool:
+    """Jobul rulează în procesul curent."""
+    with _threads_lock:
+        thread = _threads.get(job_id)
+    return thread is not None and thread.is_alive()
+
+
+def _product_line(item: dict) -> str:
+    colors = item.get('colors') or []
+    colors_info = f" | 🎨 {len(colors)} culori" if colors else ""
+    return (
+        f"{item.get('name', 'N/A')} "
+        f"| Preț: {item.get('final_price', 0):.2f} LEI "
+        f"| SKU: {item.get('sku', 'N/A')}{colors_info}"
+    )
+
+
+def _queue_results(queue, job_id: str, urls: list, jobs):
+    """
+    Pune URL-urile în coadă, apoi produce (index, url, produse, eroare)
+    pe măsură ce workerii le termină, ca ScrapePipeline.run().
+    Se oprește la cererea de oprire; sarcinile încă neluate se anulează.
+    """
+    queue.enqueue(job_id, [(url, registry.resolve(url)) for url in urls])
+    remaining = len(urls)
+    position = 0
+    while remaining > 0:
+        if jobs.cancel_requested(job_id):
+            queue.cancel(job_id)
+            return
+        results = queue.collect(job_id)
+        if not results:
+            counts = queue.counts(job_id)
+            jobs.update(job_id, message=(
+                f"🖧 În coadă: {counts[QUEUED]} · "
+                f"la workeri: {counts[LEASED]}"
+            ))
+            time.sleep(QUEUE_POLL_SECONDS)
+            continue
+        for result in results:
+            remaining -= 1
+            if result['seconds']:
+                metrics.record(
+                    'worker_scrape', result['seconds'], result['scraper']
+                )
+            error = None
+            if result['status'] == TASK_FAILED:
+                error = RuntimeError(result['error'] or 'Sarcină eșuată')
+            yield position, result['url'], result['products'], error
+            position += 1
+
+
+def run_scrape_job(job_id: str, urls: list, store_path: str,
+                   translate: bool = True, use_page_cache: bool = True,
+                   jobs=None, queue_url: str = None,
+                   tabs_per_supplier: int = 1,
+                   prefetch_lookahead: int = 0):
+    """Corpul jobului (thread de fundal sau apel direct)."""
+    jobs = jobs or get_job_store()
+    store = ProductStore(store_path)
+    if queue_url:
+        queue = open_queue(queue_url)
+        pipeline = None
+        results = _queue_results(queue, job_id, urls, jobs)
+    else:
+        queue = None
+        pipeline = ScrapePipeline(
+            use_page_cache=use_page_cache,
+            tabs_per_supplier=tabs_per_supplier,
+            prefetch_lookahead=prefetch_lookahead,
+        )
+        results = pipeline.run(urls)
+    # Colector propriu: joburile simultane nu-și amestecă duratele
+    job_metrics = metrics.Collector()
+    counts = {'done': 0, 'ok': 0, 'failed': 0}
+    last_metrics = 0.0
+    status = DONE
+    message = ''
+    try:
+        with metrics.collecting(job_metrics):
+            for position, (index, url, items, error) in enumerate(results):
+                if jobs.cancel_requested(job_id):
+                    status = CANCELLED
+                    message = 'Oprit la cerere'
+                    break
+
+                if error is not None:
+                    counts['failed'] += 1
+                    jobs.add_event(
+                        job_id, 'error',
+                        f"Eroare: {type(error).__name__}: {error!r}",
+                        position,
+                        ''.join(traceback.format_exception(error)),
+                    )
+                elif items:
+                    if translate:
+                        jobs.update(job_id, current_url=f"🌍 {url}")
+                        try:
+                            with metrics.supplier(match_scraper(url)):
+                                items = [
+                                    translate_product_data(item)
+                                    for item in items
+                                ]
+                        except Exception as te:
+                            jobs.add_event(
+                                job_id, 'warning',
+                                f"Traducere eșuată: {str(te)[:80]}",
+                                position,
+                            )
+                    store.extend(items, SCRAPED)
+                    counts['ok'] += len(items)
+                    for item in items:
+                        jobs.add_event(
+                            job_id, 'success', _product_line(item), position
+                        )
+                else:
+                    counts['failed'] += 1
+                    jobs.add_event(
+                        job_id, 'warning',
+                        f"Nu am putut extrage: {url[:80]}", position,
+                    )
+
+                counts['done'] = position + 1
+                fields = dict(counts, current_url=url)
+                now = time.monotonic()
+                if now - last_metrics >= METRICS_EVERY:
+                    fields['metrics'] = job_metrics.summary()
+                    last_metrics = now
+                jobs.update(job_id, **fields)
+
+            if status == DONE and jobs.cancel_requested(job_id):
+                # Oprit în timp ce aștepta workerii
+                status = CANCELLED
+                message = 'Oprit la cerere'
+            if translate and status == DONE:
+                store.copy(SCRAPED, TRANSLATED)
+    except Exception as e:
+        status = FAILED
+        message = f"{type(e).__name__}: {e}"
+        jobs.add_event(
+            job_id, 'error', message, None,
+            ''.join(traceback.format_exception(e)),
+        )
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        if queue is not None:
+            if status != DONE:
+                queue.cancel(job_id)
+            queue.close()
+        try:
+            metrics.write(collector=job_metrics)
+        except OSError:
+            pass
+        jobs.update(
+            job_id, status=status, message=message,
+            metrics=job_metrics.summary(), **counts,
+        )
+        store.close()
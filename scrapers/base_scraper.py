@@ -5,7 +5,7 @@ Include metode robuste de extragere descriere și specificații.
 """
 import os
 import re
-import time
+from functools import lru_cache
 import streamlit as st
 import cloudscraper
 from bs4 import BeautifulSoup
@@ -19,17 +19,100 @@ from selenium.common.exceptions import (
     TimeoutException, WebDriverException,
     NoSuchElementException
 )
-from utils.helpers import clean_price, double_price, generate_sku
+from utils.helpers import (
+    clean_price, double_price, generate_sku, get_domain
+)
 from utils.image_handler import make_absolute_url
+from utils import metrics
+from utils.page_cache import get_cache as get_page_cache
+from utils.browser_profiles import get_store as get_profile_store
+from scrapers.page_bundle import collect_page_bundle
+from scrapers.browser_pool import (
+    get_pool as get_browser_pool, is_lost_session,
+)
+from scrapers.browser_contexts import (
+    get_host as get_browser_host, shared_options,
+)
+from scrapers.structured_data import extract_structured, is_complete
+from scrapers.prefetch import HINT_JS
+from scrapers.tab_selectors import (
+    TAB_SELECTORS, TAB_KEYWORDS, CLICK_TABS_JS,
+    get_store as get_tab_store,
+)
+
+
+# Blocul de descriere al paginii, în HTML-ul brut (calea HTTP-first)
+DESCRIPTION_PROBE = (
+    '.product-description, #product-description, #description, '
+    '[class*="description"], #tab-description, [data-tab="description"]'
+)
+
+
+@lru_cache(maxsize=None)
+def _url_pattern(pattern: str):
+    return re.compile(pattern, re.IGNORECASE)
 
 
 class BaseScraper:
     """Clasă de bază pentru toate scraperele."""
 
+    # Parametrii get_page() pentru pagina de produs
+    WAIT_SELECTOR = 'h1, .product-name, [class*="product"]'
+    PREFER_SELENIUM = True
+    # scrape() folosește doar HTML-ul din get_page() → parsarea poate
+    # rula în alt proces (scrapers.pipeline). False pentru scraperele
+    # care interacționează cu browserul după încărcare.
+    SPLIT_STAGES = True
+    # Pagina se cere întâi prin HTTP; dacă datele structurate
+    # (JSON-LD / OpenGraph / microdata) au nume, preț și imagini,
+    # Selenium nu mai pornește. False când prețul cere login sau
+    # variantele se citesc din browser.
+    HTTP_FIRST = True
+    # După atâtea pagini fără date complete pe un domeniu, nu mai
+    # încercăm HTTP-ul înainte de Selenium
+    HTTP_FIRST_MAX_MISSES = 3
+    # Câmpuri care trebuie găsite și în HTML-ul fără JS pentru a sări
+    # peste browser: descrierea / specificațiile din tab-uri sau randate
+    # din JS lipsesc din răspunsul HTTP. () = ajung datele structurate.
+    HTTP_FIRST_FIELDS = ('description', 'specifications')
+    # URL-urile de produs ale furnizorului (scrapers.discovery filtrează
+    # sitemap-urile și paginile de categorie cu el)
+    PRODUCT_URL_PATTERN = r'/(?:products?|produs|p)/[^/?#]+'
+    # Selectorii de preț (scrape() și verificarea rapidă de preț)
+    PRICE_SELECTORS = ['.product-price', '.price', '[class*="price"]']
+
     def __init__(self):
         self.driver = None
         self.cloud_scraper = None
         self.name = "base"
+        # Rezultatul PAGE_BUNDLE_JS pentru ultima pagină Selenium
+        self.last_bundle = None
+        # Driverul afișează pagina parsată acum (randată de
+        # get_page_selenium); altfel strategia 5 ar citi din browser
+        # pagina produsului anterior
+        self.driver_on_page = False
+        # Paginile descărcate recent se refolosesc din cache
+        self.use_page_cache = True
+        # Pagini deja descărcate (etapa CPU): url → (html, bundle)
+        self._pages = {}
+        # Fără browser / rețea (procesele de parsare)
+        self.offline = False
+        # Câmpurile din datele structurate ale ultimei pagini
+        # (scrapers.structured_data), completate de get_page()
+        self.structured = {}
+        self._http_first_misses = {}
+        # scrapers.prefetch.Prefetcher al furnizorului (ScrapePipeline)
+        self.prefetcher = None
+        # BrowserHost primit de la ScrapePipeline; fără el se folosește
+        # gazda globală (PRODUCT_IMPORTER_BROWSER_CONTEXTS), dacă există
+        self.browser_host = None
+        # Profilul Chrome persistent al driverului local
+        # (utils.browser_profiles), eliberat la _drop_driver
+        self._profile = None
+
+    @classmethod
+    def is_product_url(cls, url: str) -> bool:
+        return bool(_url_pattern(cls.PRODUCT_URL_PATTERN).search(url or ''))
 
     def _get_chrome_options(self) -> Options:
         options = Options()
@@ -54,35 +137,74 @@ class BaseScraper:
             options.binary_location = '/usr/bin/chromium-browser'
         return options
 
+    def _local_driver(self, options: Options):
+        driver_path = None
+        for path in [
+            '/usr/bin/chromedriver',
+            '/usr/lib/chromium/chromedriver',
+            '/usr/lib/chromium-browser/chromedriver',
+        ]:
+            if os.path.exists(path):
+                driver_path = path
+                break
+        if driver_path:
+            service = Service(executable_path=driver_path)
+            return webdriver.Chrome(service=service, options=options)
+        return webdriver.Chrome(options=options)
+
+    def _launch_driver(self, shared: bool = False):
+        """
+        Browser nou: remote (scrapers.browser_pool), dacă e configurat,
+        altfel Chrome local. shared: browser comun mai multor scrapere.
+        """
+        def options():
+            opts = self._get_chrome_options()
+            return shared_options(opts) if shared else opts
+
+        pool = get_browser_pool()
+        if pool is not None:
+            try:
+                with metrics.span('driver_remote'):
+                    return pool.create_driver(options())
+            except RuntimeError as e:
+                st.warning(f"⚠️ {str(e)[:150]} → Chrome local")
+        opts = options()
+        # Profil persistent doar pentru Chrome-ul local al furnizorului:
+        # contextele din browserele comune nu se scriu pe disc
+        store = None if shared else get_profile_store()
+        profile = store.acquire(self.name) if store else None
+        if profile is not None:
+            profile.apply(opts)
+        try:
+            driver = self._local_driver(opts)
+        except Exception:
+            if profile is not None:
+                profile.release()
+            raise
+        self._profile = profile
+        return driver
+
     def _init_driver(self):
-        if self.driver:
+        if self.driver or self.offline:
             return
         try:
-            options = self._get_chrome_options()
-            driver_path = None
-            for path in [
-                '/usr/bin/chromedriver',
-                '/usr/lib/chromium/chromedriver',
-                '/usr/lib/chromium-browser/chromedriver',
-            ]:
-                if os.path.exists(path):
-                    driver_path = path
-                    break
-            if driver_path:
-                service = Service(executable_path=driver_path)
-                self.driver = webdriver.Chrome(
-                    service=service, options=options
+            # Browsere comune cu contexte izolate (scrapers.browser_contexts)
+            host = self.browser_host or get_browser_host()
+            if host is not None:
+                self.driver = host.open_tab(
+                    self.name, lambda: self._launch_driver(shared=True)
                 )
             else:
-                self.driver = webdriver.Chrome(options=options)
+                self.driver = self._launch_driver()
             self.driver.set_page_load_timeout(60)
+            self.driver.set_script_timeout(30)
             self.driver.implicitly_wait(10)
         except Exception as e:
             st.warning(f"⚠️ Selenium init failed: {str(e)[:150]}")
             self.driver = None
 
     def _init_cloudscraper(self):
-        if not self.cloud_scraper:
+        if not self.cloud_scraper and not self.offline:
             self.cloud_scraper = cloudscraper.create_scraper(
                 browser={
                     'browser': 'chrome',
@@ -91,111 +213,175 @@ class BaseScraper:
                 }
             )
 
+    def _drop_driver(self, error: Exception = None):
+        """Închide driverul; cu `error`, endpoint-ul remote e marcat căzut."""
+        driver, self.driver = self.driver, None
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Profilul e liber abia după ce Chrome s-a închis
+        profile, self._profile = self._profile, None
+        if profile is not None:
+            profile.release()
+        pool = get_browser_pool()
+        if pool is not None:
+            pool.release(driver, error)
+
+    def _lost_remote_driver(self, error: Exception) -> bool:
+        """Browserul (remote / comun) a căzut: driverul e abandonat."""
+        pool = get_browser_pool()
+        remote = pool is not None and pool.owns(self.driver)
+        # Tab într-un browser comun care a căzut
+        shared = getattr(self.driver, 'browser_lost', False)
+        if not (shared or remote and is_lost_session(error)):
+            return False
+        self._drop_driver(error)
+        return True
+
     def get_page_selenium(
         self, url: str,
         wait_selector: str = None,
         wait_time: int = 15
     ) -> str | None:
-        self._init_driver()
-        if not self.driver:
-            return None
-        try:
+        # A doua încercare doar după failover pe alt browser remote
+        for attempt in range(2):
+            self._init_driver()
+            if not self.driver:
+                return None
+            try:
+                return self._render_page(url, wait_selector, wait_time)
+            except Exception as e:
+                if attempt == 0 and self._lost_remote_driver(e):
+                    st.warning("⚠️ Browserul a căzut, reîncerc pe altul")
+                    self.prepare()
+                    continue
+                st.warning(
+                    f"⚠️ Selenium error: {str(e)[:100]}"
+                )
+                return None
+
+    def _render_page(self, url: str, wait_selector: str,
+                     wait_time: int) -> str | None:
+        """driver.get, tab-uri, scroll și bundle-ul paginii."""
+        with metrics.span('driver_get'):
             self.driver.get(url)
-            time.sleep(3)
-            if wait_selector:
-                try:
+        metrics.sleep(3)
+        if wait_selector:
+            try:
+                with metrics.span('wait_selector'):
                     WebDriverWait(self.driver, wait_time).until(
                         EC.presence_of_element_located(
                             (By.CSS_SELECTOR, wait_selector)
                         )
                     )
-                except TimeoutException:
-                    pass
+            except TimeoutException:
+                pass
+
+        # Click pe tab-uri de descriere/specificații
+        with metrics.span('click_tabs'):
+            clicked = self._click_description_tabs()
+        if clicked:
+            metrics.sleep(1)
 
-            # Scroll complet pentru lazy loading
+        # Scroll + HTML + text + imagini + specificații
+        # într-un singur round-trip
+        with metrics.span('page_bundle'):
+            self.last_bundle = collect_page_bundle(self.driver)
+        if self.last_bundle:
+            html = self.last_bundle['html']
+        else:
+            # Fallback: scroll complet pentru lazy loading
             for pos in ['document.body.scrollHeight/3',
                         'document.body.scrollHeight/2',
                         'document.body.scrollHeight',
                         '0']:
-                self.driver.execute_script(
-                    f"window.scrollTo(0, {pos});"
-                )
-                time.sleep(0.8)
+                with metrics.span('scroll'):
+                    self.driver.execute_script(
+                        f"window.scrollTo(0, {pos});"
+                    )
+                metrics.sleep(0.8)
+            with metrics.span('page_source'):
+                html = self.driver.page_source
 
-            # Click pe tab-uri de descriere/specificații
-            self._click_description_tabs()
+        # După captură: iframe-ul cu indicii nu ajunge în HTML / cache
+        self._hint_next(url)
+        return html
 
-            time.sleep(1)
-            return self.driver.page_source
-        except Exception as e:
-            st.warning(
-                f"⚠️ Selenium error: {str(e)[:100]}"
-            )
-            return None
+    def _has_element(self, css: str) -> bool:
+        """Există în pagină? Fără implicit wait (un singur execute_script)."""
+        try:
+            return bool(self.driver.execute_script(
+                "return !!document.querySelector(arguments[0]);", css
+            ))
+        except Exception:
+            # Nu știm: apelantul procedează ca înainte
+            return True
 
-    def _click_description_tabs(self):
+    def _click_description_tabs(self) -> list:
         """
         Click pe tab-uri de descriere/specificații
-        care ascund conținutul.
+        care ascund conținutul, printr-un singur execute_script.
+        Pe domeniile cunoscute se încearcă doar selectorii
+        care au afișat conținut anterior.
         """
         if not self.driver:
-            return
+            return []
 
-        tab_selectors = [
-            # Tab-uri comune
-            "a[href*='description']",
-            "a[href*='specification']",
-            "a[href*='details']",
-            "a[href*='features']",
-            "a[href*='info']",
-            "button[data-target*='description']",
-            "button[data-target*='specification']",
-            "button[data-target*='details']",
-            # Tab-uri cu text
-            "[class*='tab'] a",
-            "[class*='tab'] button",
-            "[role='tab']",
-            ".nav-tabs a",
-            ".nav-tabs li a",
-            ".tab-nav a",
-            # Accordion
-            "[class*='accordion'] button",
-            "[class*='accordion'] a",
-            "[class*='collapse'] button",
-            "details summary",
-        ]
+        store = get_tab_store()
+        domain = get_domain(self.driver.current_url or '')
+        known = store.known_good(domain)
+        selectors = known or TAB_SELECTORS
 
-        for selector in tab_selectors:
-            try:
-                elements = self.driver.find_elements(
-                    By.CSS_SELECTOR, selector
-                )
-                for el in elements:
-                    try:
-                        text = el.text.lower().strip()
-                        if any(
-                            kw in text
-                            for kw in [
-                                'descri', 'specifi', 'detail',
-                                'feature', 'info', 'propert',
-                                'about', 'overview',
-                                'caracterist', 'detalii',
-                            ]
-                        ):
-                            if el.is_displayed():
-                                self.driver.execute_script(
-                                    "arguments[0].click();", el
-                                )
-                                time.sleep(1)
-                    except Exception:
-                        continue
-            except Exception:
-                continue
+        try:
+            results = self.driver.execute_script(
+                CLICK_TABS_JS, selectors, TAB_KEYWORDS
+            ) or []
+            if known and not any(
+                r.get('revealed') for r in results
+            ):
+                # Layout schimbat: redescoperim cu toți selectorii
+                rest = [s for s in TAB_SELECTORS if s not in known]
+                results += self.driver.execute_script(
+                    CLICK_TABS_JS, rest, TAB_KEYWORDS
+                ) or []
+        except Exception:
+            return []
+
+        store.learn(domain, results)
+        return results
+
+    def _hint_next(self, url: str):
+        """
+        Anunță browserului paginile următoare (și imaginile lor) care
+        vor trece tot prin Selenium: se descarcă în fundal în cache-ul
+        HTTP al contextului, cât timp pagina curentă e procesată.
+        """
+        if self.prefetcher is None:
+            return
+        pages, images, origins = self.prefetcher.hints(url)
+        if not (pages or images):
+            return
+        try:
+            self.driver.execute_script(HINT_JS, pages, images, origins)
+        except Exception:
+            pass
+
+    def _prefetched(self, url: str) -> str | None:
+        if self.prefetcher is None:
+            return None
+        return self.prefetcher.take(url)
 
     def get_page_cloudscraper(self, url: str) -> str | None:
+        html = self._prefetched(url)
+        if html:
+            return html
         self._init_cloudscraper()
         try:
-            response = self.cloud_scraper.get(url, timeout=30)
+            with metrics.span('http_get'):
+                response = self.cloud_scraper.get(url, timeout=30)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -209,26 +395,240 @@ class BaseScraper:
         wait_selector: str = None,
         prefer_selenium: bool = True
     ) -> BeautifulSoup | None:
+        html = self._fetch_html(url, wait_selector, prefer_selenium)
+        if not html:
+            return None
+        with metrics.span('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+        if not self.structured:
+            with metrics.span('structured_data'):
+                self.structured = extract_structured(html, url, soup)
+        return soup
+
+    def prepare(self):
+        """Pași înainte de descărcare (ex. login). Implicit nimic."""
+
+    def fetch(self, url: str) -> dict | None:
+        """
+        Etapa I/O: descarcă pagina fără s-o parseze.
+        Returnează {'url', 'html' (bytes UTF-8), 'bundle'} pentru
+        provide_page() într-un proces de parsare.
+        """
+        self.prepare()
+        html = self._fetch_html(
+            url, self.WAIT_SELECTOR, self.PREFER_SELENIUM
+        )
+        if not html:
+            return None
+        bundle = dict(self.last_bundle or {})
+        bundle.pop('html', None)
+        bundle.pop('from_cache', None)
+        return {
+            'url': url,
+            'html': html.encode('utf-8'),
+            'bundle': bundle or None,
+        }
+
+    def provide_page(self, url: str, html: str, bundle: dict = None):
+        """Următorul get_page(url) folosește acest HTML."""
+        self._pages[url] = (html, bundle)
+
+    def _fetch_html(
+        self, url: str,
+        wait_selector: str = None,
+        prefer_selenium: bool = True
+    ) -> str | None:
         html = None
-        if prefer_selenium:
+        self.last_bundle = None
+        self.driver_on_page = False
+        self.structured = {}
+        provided = self._pages.pop(url, None)
+        if provided is not None:
+            html, bundle = provided
+            if bundle:
+                self.last_bundle = {**bundle, 'html': html}
+            return html
+        if self.offline:
+            return None
+        cache = get_page_cache() if self.use_page_cache else None
+        if cache:
+            # Bundle-ul din cache ține locul driverului (strategia 5)
+            self.last_bundle = cache.get(url)
+            if self.last_bundle:
+                html = self.last_bundle['html']
+        http_html = None
+        if not html and prefer_selenium and self.HTTP_FIRST:
+            http_html = self._get_page_http_first(url)
+            if self.structured:
+                html = http_html
+        if not html and prefer_selenium:
             html = self.get_page_selenium(url, wait_selector)
+            self.driver_on_page = bool(html)
         if not html:
-            html = self.get_page_cloudscraper(url)
+            html = http_html or self.get_page_cloudscraper(url)
         if not html:
             st.error(f"❌ Nu pot accesa: {url[:80]}")
             return None
-        return BeautifulSoup(html, 'html.parser')
+        if cache and not (self.last_bundle or {}).get('from_cache'):
+            cache.put(url, html, self.last_bundle)
+        return html
+
+    def _http_get(self, url: str) -> str | None:
+        """GET simplu, fără mesaje în pagină (căile rapide)."""
+        html = self._prefetched(url)
+        if html:
+            return html
+        self._init_cloudscraper()
+        try:
+            with metrics.span('http_get'):
+                response = self.cloud_scraper.get(url, timeout=30)
+            response.raise_for_status()
+            return response.text
+        except Exception:
+            return None
+
+    def _get_page_http_first(self, url: str) -> str | None:
+        """
+        GET simplu înainte de Selenium. Dacă datele structurate sunt
+        complete, le păstrează în self.structured (pagina nu mai
+        trece prin browser). Returnează HTML-ul oricum, ca fallback
+        dacă Selenium eșuează.
+        """
+        domain = get_domain(url)
+        misses = self._http_first_misses.get(domain, 0)
+        if misses >= self.HTTP_FIRST_MAX_MISSES:
+            return None
+        html = self._http_get(url)
+        data = {}
+        if html:
+            with metrics.span('structured_data'):
+                data = extract_structured(html, url)
+        if self.http_page_complete(html, data):
+            self.structured = data
+            self._http_first_misses[domain] = 0
+        else:
+            self._http_first_misses[domain] = misses + 1
+        return html
+
+    def http_page_complete(self, html: str, data: dict) -> bool:
+        """
+        Pagina descărcată prin HTTP e suficientă: datele structurate
+        sunt complete și HTTP_FIRST_FIELDS apar în HTML-ul brut.
+        Doar din HTML (apelată și din thread-urile de prefetch): fără
+        driver și fără bundle-ul altei pagini.
+        """
+        if not html or not is_complete(data):
+            return False
+        if not self.HTTP_FIRST_FIELDS:
+            return True
+        with metrics.span('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
+        for field in self.HTTP_FIRST_FIELDS:
+            if field == 'description':
+                block = soup.select_one(DESCRIPTION_PROBE)
+                found = data.get('description') or (
+                    block is not None
+                    and len(block.get_text(' ', strip=True)) >= 30
+                )
+            elif field == 'specifications':
+                found = self.extract_specifications(
+                    soup, html, html_only=True
+                )
+            else:
+                found = data.get(field)
+            if not found:
+                return False
+        return True
+
+    # ══════════════════════════════════════════
+    # VERIFICARE RAPIDĂ PREȚ / STOC
+    # ══════════════════════════════════════════
+
+    def extract_price(self, soup: BeautifulSoup) -> float:
+        """Primul preț > 0 găsit cu PRICE_SELECTORS."""
+        for sel in self.PRICE_SELECTORS:
+            el = soup.select_one(sel)
+            if el:
+                price = clean_price(
+                    el.get('content', '') or el.get_text(strip=True)
+                )
+                if price > 0:
+                    return price
+        return 0.0
+
+    def _price_from_html(self, html: str, url: str) -> dict | None:
+        data = extract_structured(html, url)
+        price = data.get('price', 0.0)
+        if not price:
+            with metrics.span('parse'):
+                soup = BeautifulSoup(html, 'html.parser')
+            price = self.extract_price(soup)
+        if price <= 0:
+            return None
+        return {
+            'price': price,
+            'currency': data.get('currency') or 'EUR',
+            'availability': data.get('availability', ''),
+        }
+
+    def _get_page_narrow(self, url: str) -> str | None:
+        """driver.get + așteptarea prețului; fără scroll, tab-uri, bundle."""
+        self._init_driver()
+        if not self.driver:
+            return None
+        try:
+            with metrics.span('driver_get'):
+                self.driver.get(url)
+            try:
+                with metrics.span('wait_selector'):
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((
+                            By.CSS_SELECTOR,
+                            ', '.join(self.PRICE_SELECTORS),
+                        ))
+                    )
+            except TimeoutException:
+                pass
+            with metrics.span('page_source'):
+                return self.driver.page_source
+        except Exception as e:
+            # Următorul apel pornește driverul pe alt endpoint
+            self._lost_remote_driver(e)
+            return None
+
+    def check_price(self, url: str, use_http: bool = True,
+                    use_browser: bool = True) -> dict | None:
+        """
+        Doar prețul și disponibilitatea, pe calea cea mai ieftină:
+        HTTP + date structurate / PRICE_SELECTORS, apoi (opțional)
+        o singură încărcare Selenium. Fără cache de pagini.
+        Returnează {'price', 'currency', 'availability', 'via'} sau None.
+        """
+        if use_http and (self.HTTP_FIRST or not self.PREFER_SELENIUM):
+            html = self._http_get(url)
+            found = self._price_from_html(html, url) if html else None
+            if found:
+                return {**found, 'via': 'http'}
+        if use_browser and self.PREFER_SELENIUM:
+            self.prepare()
+            html = self._get_page_narrow(url)
+            found = self._price_from_html(html, url) if html else None
+            if found:
+                return {**found, 'via': 'browser'}
+        return None
 
     # ══════════════════════════════════════════
     # METODE ROBUSTE DE EXTRAGERE
     # ══════════════════════════════════════════
 
+    @metrics.timed('extract_description')
     def extract_description(
-        self, soup: BeautifulSoup, page_source: str = ""
+        self, soup: BeautifulSoup, page_source: str = "",
+        html_only: bool = False
     ) -> str:
         """
         Extrage descrierea produsului folosind
-        multiple strategii.
+        multiple strategii. html_only: fără strategia 5 (browser).
         """
         description = ""
 
@@ -321,9 +721,20 @@ class BaseScraper:
                 description = best_div
 
         # Strategia 5: Selenium - text vizibil pe pagină
+        # (din bundle-ul paginii, altfel un execute_script separat)
+        if html_only:
+            return description
         if (
+            (not description or len(description) < 30)
+            and self.last_bundle
+        ):
+            desc_text = self.last_bundle['description_text']
+            if desc_text and len(desc_text) > 30:
+                description = f"<p>{desc_text}</p>"
+        elif (
             (not description or len(description) < 30)
             and self.driver
+            and self.driver_on_page
         ):
             try:
                 desc_text = self.driver.execute_script("""
@@ -364,12 +775,14 @@ class BaseScraper:
 
         return description
 
+    @metrics.timed('extract_specifications')
     def extract_specifications(
-        self, soup: BeautifulSoup, page_source: str = ""
+        self, soup: BeautifulSoup, page_source: str = "",
+        html_only: bool = False
     ) -> dict:
         """
         Extrage specificațiile produsului folosind
-        multiple strategii.
+        multiple strategii. html_only: fără strategia 5 (browser).
         """
         specifications = {}
 
@@ -512,7 +925,11 @@ class BaseScraper:
                     break
 
         # Strategia 5: Selenium - text din elemente ascunse
-        if not specifications and self.driver:
+        # (din bundle-ul paginii, altfel un execute_script separat)
+        browser = not (specifications or html_only)
+        if browser and self.last_bundle:
+            specifications = dict(self.last_bundle['specs'])
+        elif browser and self.driver and self.driver_on_page:
             try:
                 js_specs = self.driver.execute_script("""
                     var specs = {};
@@ -614,6 +1031,10 @@ class BaseScraper:
         if original_price <= 0:
             original_price = 0.0
         final_price = double_price(original_price)
+        # Câmpurile pe care scraperele nu le caută în pagină
+        for key in ('currency', 'material', 'weight'):
+            if not kwargs.get(key) and self.structured.get(key):
+                kwargs[key] = self.structured[key]
 
         return {
             'name': kwargs.get('name', 'Produs Importat'),
@@ -642,12 +1063,7 @@ class BaseScraper:
         }
 
     def close(self):
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
-            self.driver = None
+        self._drop_driver()
 
     def __del__(self):
         self.close()
@@ -0,0 +1,384 @@
+# scrapers/browser_contexts.py
+"""
+Mai multe contexte izolate într-un singur proces Chrome (CDP
+Target.createBrowserContext), în loc de câte un Chromium (~150–300 MB)
+per scraper.
+- Fiecare furnizor are contextul lui (cookie-uri, storage, cache):
+  login-ul XD / PSI nu ajunge pe site-urile anonime; tab-urile
+  aceluiași furnizor împart contextul
+- TabDriver ține locul driverului Selenium în scraper. Comenzile
+  WebDriver trec pe rând prin sesiunea comună (switch_to.window pe
+  tab-ul propriu), dar încărcarea paginii, pauzele și așteptările
+  (implicit wait) rulează în afara lock-ului, deci tab-urile încarcă
+  în paralel; browserul comun folosește pageLoadStrategy 'none'
+- BrowserHost împarte contextele pe browsere (CONTEXTS_PER_BROWSER per
+  Chrome) și pornește altul când toate sunt pline
+Dacă browserul nu acceptă contextele CDP, furnizorul primește un
+browser separat: izolarea se păstrează, economia de memorie nu.
+Activare: PRODUCT_IMPORTER_BROWSER_CONTEXTS=N (contexte per Chrome)
+sau ScrapePipeline(tabs_per_supplier=N).
+"""
+import os
+import time
+import threading
+
+from selenium.common.exceptions import (
+    NoSuchElementException, TimeoutException, WebDriverException,
+)
+from selenium.webdriver.remote.webelement import WebElement
+
+from scrapers.browser_pool import get_pool, is_lost_session
+
+
+CONTEXTS_PER_BROWSER = 5
+# Intervalul de verificare a încărcării / elementelor, fără lock
+POLL_SECONDS = 0.2
+DEFAULT_PAGE_LOAD_TIMEOUT = 60
+
+# Tab-urile din fundal nu sunt încetinite (timere, randare)
+CHROME_FLAGS = [
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+]
+
+# Marcajul dispare odată cu documentul vechi
+_NAVIGATE_JS = (
+    "window.__tabNavigating = true; "
+    "window.location.href = arguments[0];"
+)
+_READY_JS = (
+    "return !window.__tabNavigating "
+    "&& document.readyState === 'complete';"
+)
+
+
+def cdp(driver, cmd: str, params: dict = None) -> dict:
+    """Comandă CDP; merge și pe webdriver.Remote (Grid / chromedriver)."""
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        driver.command_executor.add_command(
+            'executeCdpCommand', 'POST',
+            '/session/$sessionId/goog/cdp/execute',
+        )
+    return driver.execute(
+        'executeCdpCommand', {'cmd': cmd, 'params': params or {}}
+    )['value']
+
+
+def shared_options(options):
+    """Opțiunile Chrome ale unui browser comun."""
+    for flag in CHROME_FLAGS:
+        options.add_argument(flag)
+    # driver.get nu mai blochează sesiunea: TabDriver așteaptă singur
+    options.page_load_strategy = 'none'
+    return options
+
+
+# ══════════════════════════════════════════
+# BROWSER COMUN
+# ══════════════════════════════════════════
+
+class SharedBrowser:
+    """Un Chrome cu contexte izolate; `lock` serializează comenzile."""
+
+    def __init__(self, driver, dedicated: bool = False):
+        self.driver = driver
+        self.lock = threading.RLock()
+        # Browser separat pentru un singur furnizor (fără contexte CDP)
+        self.dedicated = dedicated
+        self.contexts = {}
+        self.tabs = {}
+        self.current = driver.current_window_handle
+        self.lost = False
+        driver.implicitly_wait(0)
+
+    def activate(self, handle: str):
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def open_tab(self, key: str) -> str:
+        """Tab nou în contextul furnizorului (creat la nevoie)."""
+        with self.lock:
+            if self.dedicated:
+                self.contexts.setdefault(key, None)
+                self.driver.switch_to.new_window('tab')
+                handle = self.driver.current_window_handle
+            else:
+                if key not in self.contexts:
+                    self.contexts[key] = cdp(
+                        self.driver, 'Target.createBrowserContext'
+                    )['browserContextId']
+                before = set(self.driver.window_handles)
+                target = cdp(self.driver, 'Target.createTarget', {
+                    'url': 'about:blank',
+                    'browserContextId': self.contexts[key],
+                })['targetId']
+                handles = self.driver.window_handles
+                new = [h for h in handles if h not in before]
+                handle = target if target in handles else (
+                    new[0] if new else None
+                )
+                if handle is None:
+                    raise WebDriverException(
+                        'Tab-ul contextului nu apare în window_handles'
+                    )
+                self.driver.switch_to.window(handle)
+            self.current = handle
+            self.tabs[handle] = key
+            return handle
+
+    def close_tab(self, handle: str):
+        with self.lock:
+            key = self.tabs.pop(handle, None)
+            if self.lost:
+                return
+            try:
+                self.activate(handle)
+                self.driver.close()
+            except Exception:
+                pass
+            self.current = None
+            if key is not None and key not in self.tabs.values():
+                context_id = self.contexts.pop(key, None)
+                if context_id:
+                    try:
+                        cdp(self.driver, 'Target.disposeBrowserContext',
+                            {'browserContextId': context_id})
+                    except Exception:
+                        pass
+
+    def quit(self):
+        with self.lock:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        pool = get_pool()
+        if pool is not None:
+            pool.release(self.driver)
+
+
+# ══════════════════════════════════════════
+# DRIVERUL UNUI TAB
+# ══════════════════════════════════════════
+
+class TabDriver:
+    """
+    Înlocuitor de WebDriver pentru un scraper: orice atribut / metodă
+    a driverului real, executat pe tab-ul propriu.
+    """
+
+    # Lease-ul din RemoteDriverPool aparține browserului comun
+    session_id = None
+
+    def __init__(self, host, browser: SharedBrowser, key: str,
+                 handle: str):
+        self._host = host
+        self._browser = browser
+        self.key = key
+        self.handle = handle
+        self._page_load_timeout = DEFAULT_PAGE_LOAD_TIMEOUT
+        self._implicit_wait = 0
+
+    @property
+    def browser_lost(self) -> bool:
+        return self._browser.lost
+
+    def _call(self, fn, *args, **kwargs):
+        with self._browser.lock:
+            if self._browser.lost:
+                raise WebDriverException('chrome not reachable')
+            try:
+                self._browser.activate(self.handle)
+                return _wrap(self, fn(*_unwrap(args), **kwargs))
+            except Exception as e:
+                if is_lost_session(e):
+                    self._browser.lost = True
+                raise
+
+    def __getattr__(self, name):
+        value = self._call(getattr, self._browser.driver, name)
+        if callable(value):
+            return lambda *a, **k: self._call(value, *a, **k)
+        return value
+
+    def get(self, url: str):
+        """Navigare fără a ține sesiunea; așteaptă documentul nou."""
+        driver = self._browser.driver
+        self._call(driver.execute_script, _NAVIGATE_JS, url)
+        deadline = time.monotonic() + self._page_load_timeout
+        while True:
+            time.sleep(POLL_SECONDS)
+            try:
+                if self._call(driver.execute_script, _READY_JS):
+                    return
+            except WebDriverException:
+                # Contextul JS se schimbă în timpul navigării
+                if self._browser.lost:
+                    raise
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"Timeout la încărcarea {url}")
+
+    def _find(self, method: str, by, value):
+        """Implicit wait emulat: căutări scurte, pauzele fără lock."""
+        deadline = time.monotonic() + self._implicit_wait
+        finder = getattr(self._browser.driver, method)
+        while True:
+            error = None
+            try:
+                found = self._call(finder, by, value)
+            except NoSuchElementException as e:
+                found, error = None, e
+            if found:
+                return found
+            if time.monotonic() >= deadline:
+                if error is not None:
+                    raise error
+                return found
+            time.sleep(POLL_SECONDS)
+
+    def find_element(self, by='id', value=None):
+        return self._find('find_element', by, value)
+
+    def find_elements(self, by='id', value=None):
+        return self._find('find_elements', by, value)
+
+    def implicitly_wait(self, seconds: float):
+        self._implicit_wait = seconds
+
+    def set_page_load_timeout(self, seconds: float):
+        self._page_load_timeout = seconds
+
+    def quit(self):
+        self._host.close_tab(self)
+
+
+class TabElement:
+    """WebElement al unui tab; comenzile trec prin TabDriver._call."""
+
+    def __init__(self, tab: TabDriver, element: WebElement):
+        self._tab = tab
+        self._element = element
+
+    def __getattr__(self, name):
+        value = self._tab._call(getattr, self._element, name)
+        if callable(value):
+            return lambda *a, **k: self._tab._call(value, *a, **k)
+        return value
+
+
+def _wrap(tab: TabDriver, value):
+    if isinstance(value, WebElement):
+        return TabElement(tab, value)
+    if isinstance(value, list):
+        return [_wrap(tab, v) for v in value]
+    return value
+
+
+def _unwrap(args: tuple) -> tuple:
+    return tuple(
+        a._element if isinstance(a, TabElement) else a for a in args
+    )
+
+
+# ══════════════════════════════════════════
+# ALOCAREA CONTEXTELOR
+# ══════════════════════════════════════════
+
+class BrowserHost:
+    """
+    host = BrowserHost(contexts_per_browser=5)
+    driver = host.open_tab('xdconnects', launch)   # launch() → driver nou
+    driver.quit()                                  # închide tab-ul
+    """
+
+    def __init__(self, contexts_per_browser: int = None):
+        self.contexts_per_browser = max(1, (
+            contexts_per_browser or _configured() or CONTEXTS_PER_BROWSER
+        ))
+        self.browsers = []
+        self._lock = threading.Lock()
+
+    def _pick(self, key: str) -> SharedBrowser | None:
+        live = [b for b in self.browsers if not b.lost]
+        for browser in live:
+            if key in browser.contexts:
+                return browser
+        free = [
+            b for b in live
+            if not b.dedicated
+            and len(b.contexts) < self.contexts_per_browser
+        ]
+        return min(free, key=lambda b: len(b.contexts), default=None)
+
+    def open_tab(self, key: str, launch) -> TabDriver:
+        with self._lock:
+            browser = self._pick(key)
+            if browser is None:
+                browser = SharedBrowser(launch())
+                self.browsers.append(browser)
+            try:
+                handle = browser.open_tab(key)
+            except WebDriverException as e:
+                if browser.dedicated or is_lost_session(e):
+                    raise
+                # Fără contexte CDP: browser separat pentru furnizor
+                if not browser.tabs:
+                    self._remove(browser)
+                browser = SharedBrowser(launch(), dedicated=True)
+                self.browsers.append(browser)
+                handle = browser.open_tab(key)
+            return TabDriver(self, browser, key, handle)
+
+    def close_tab(self, tab: TabDriver):
+        browser = tab._browser
+        browser.close_tab(tab.handle)
+        with self._lock:
+            if not browser.tabs:
+                self._remove(browser)
+
+    def _remove(self, browser: SharedBrowser):
+        if browser in self.browsers:
+            self.browsers.remove(browser)
+        browser.quit()
+
+    def status(self) -> list:
+        return [
+            {'contexts': sorted(b.contexts), 'tabs': len(b.tabs),
+             'dedicated': b.dedicated, 'lost': b.lost}
+            for b in self.browsers
+        ]
+
+    def close(self):
+        with self._lock:
+            for browser in list(self.browsers):
+                self._remove(browser)
+
+
+_host = None
+_host_lock = threading.Lock()
+
+
+def enable(contexts_per_browser: int = None) -> BrowserHost:
+    """
+    Gazda comună a procesului: toate scraperele fără gazdă proprie
+    (scraper.browser_host) pornite de acum folosesc browsere comune.
+    """
+    global _host
+    with _host_lock:
+        if _host is None:
+            _host = BrowserHost(contexts_per_browser)
+        return _host
+
+
+def _configured() -> int:
+    value = os.environ.get('PRODUCT_IMPORTER_BROWSER_CONTEXTS', '')
+    return int(value) if value.strip().isdigit() else 0
+
+
+def get_host() -> BrowserHost | None:
+    """Gazda comună, dacă e activată (enable() sau variabila de mediu)."""
+    if _host is None and _configured():
+        return enable()
+    return _host
@@ -0,0 +1,269 @@
+# scrapers/browser_pool.py
+"""
+Browsere remote pentru scrapere: Selenium Grid sau servere chromedriver
+standalone pe alte mașini / containere, în locul Chrome-ului local.
+- Configurare: PRODUCT_IMPORTER_WEBDRIVERS sau secrets [WEBDRIVER] URLS,
+  listă separată prin virgulă; '#N' = sesiuni simultane pe endpoint
+      http://grid:4444#8, http://10.0.0.5:9515#2
+- Sănătate: /status e interogat periodic (ready + sloturile ocupate
+  raportate de Grid); un endpoint care eșuează e scos din rotație cu
+  backoff exponențial, apoi reîncercat
+- Selecție: endpoint-ul sănătos cel mai puțin încărcat (sesiunile
+  deschise din procesul curent sau sloturile ocupate raportate)
+- Failover: la pornire se încearcă pe rând celelalte endpoint-uri;
+  o sesiune pierdută în timpul scraping-ului e reluată pe alt endpoint
+  (BaseScraper.get_page_selenium)
+"""
+import os
+import time
+import threading
+from dataclasses import dataclass
+
+import requests
+from selenium import webdriver
+
+
+# Sesiuni simultane implicite pe un endpoint fără '#N'
+DEFAULT_CAPACITY = 4
+# /status e reinterogat după atâtea secunde
+CHECK_INTERVAL = 30
+STATUS_TIMEOUT = 3
+# Scos din rotație: BACKOFF * 2^(eșecuri - 1), cel mult MAX_BACKOFF
+BACKOFF = 5
+MAX_BACKOFF = 300
+
+# Mesaje WebDriver care înseamnă browser / sesiune pierdută
+_LOST_SESSION = (
+    'invalid session id', 'session deleted', 'no such session',
+    'chrome not reachable', 'disconnected', 'connection refused',
+    'max retries exceeded', 'remote end closed connection',
+)
+
+
+@dataclass
+class Endpoint:
+    url: str
+    capacity: int = DEFAULT_CAPACITY
+    # Sesiuni deschise din procesul curent
+    active: int = 0
+    # Sloturi ocupate raportate de Grid (toți clienții)
+    busy: int = 0
+    failures: int = 0
+    down_until: float = 0.0
+    last_check: float = 0.0
+    last_error: str = ''
+
+    @property
+    def load(self) -> float:
+        return max(self.active, self.busy) / max(self.capacity, 1)
+
+    def available(self, now: float) -> bool:
+        return (now >= self.down_until
+                and max(self.active, self.busy) < self.capacity)
+
+
+def parse_endpoints(spec: str) -> list:
+    """'http://a:4444#8, http://b:9515' → [Endpoint, ...]"""
+    endpoints = []
+    for part in (spec or '').replace('\n', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        url, _, capacity = part.partition('#')
+        endpoints.append(Endpoint(
+            url.rstrip('/'),
+            int(capacity) if capacity.strip().isdigit()
+            else DEFAULT_CAPACITY,
+        ))
+    return endpoints
+
+
+def is_lost_session(error: Exception) -> bool:
+    """Eroarea înseamnă că browserul remote nu mai răspunde."""
+    text = str(error).lower()
+    if isinstance(error, (requests.ConnectionError, ConnectionError)):
+        return True
+    return any(marker in text for marker in _LOST_SESSION)
+
+
+class RemoteDriverPool:
+    """
+    pool = RemoteDriverPool(parse_endpoints('http://grid:4444#8'))
+    driver = pool.create_driver(options)   # cel mai liber endpoint
+    ...
+    pool.release(driver)                   # la driver.quit()
+    """
+
+    def __init__(self, endpoints: list,
+                 check_interval: float = CHECK_INTERVAL):
+        self.endpoints = list(endpoints)
+        self.check_interval = check_interval
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._http = requests.Session()
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    # ══════════════════════════════════════════
+    # SĂNĂTATE
+    # ══════════════════════════════════════════
+
+    def _probe(self, endpoint: Endpoint) -> bool:
+        """GET /status: ready + (Grid) capacitatea și sloturile ocupate."""
+        endpoint.last_check = time.monotonic()
+        try:
+            response = self._http.get(
+                f"{endpoint.url}/status", timeout=STATUS_TIMEOUT
+            )
+            value = response.json().get('value', {})
+        except (requests.RequestException, ValueError) as e:
+            with self._lock:
+                self._mark_down(endpoint, f"{type(e).__name__}: {e}")
+            return False
+        slots = [
+            slot
+            for node in value.get('nodes') or []
+            if node.get('availability', 'UP') == 'UP'
+            for slot in node.get('slots') or []
+        ]
+        with self._lock:
+            # Grid: ready=false și când toate sloturile sunt ocupate
+            if not value.get('ready', False) and not slots:
+                self._mark_down(
+                    endpoint, value.get('message') or 'not ready'
+                )
+                return False
+            if slots:
+                endpoint.capacity = len(slots)
+                endpoint.busy = sum(1 for s in slots if s.get('session'))
+            endpoint.failures = 0
+            endpoint.down_until = 0.0
+            endpoint.last_error = ''
+        return True
+
+    def _mark_down(self, endpoint: Endpoint, error: str):
+        """Scoate endpoint-ul din rotație (apelat cu _lock ținut)."""
+        endpoint.failures += 1
+        endpoint.down_until = time.monotonic() + min(
+            BACKOFF * 2 ** (endpoint.failures - 1), MAX_BACKOFF
+        )
+        endpoint.last_error = error[:300]
+
+    def check(self, force: bool = False):
+        """Interoghează endpoint-urile cu /status expirat."""
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if not force and (
+                now < endpoint.down_until
+                or now - endpoint.last_check < self.check_interval
+            ):
+                continue
+            self._probe(endpoint)
+
+    # ══════════════════════════════════════════
+    # SESIUNI
+    # ══════════════════════════════════════════
+
+    def _candidates(self) -> list:
+        self.check()
+        now = time.monotonic()
+        with self._lock:
+            ready = [e for e in self.endpoints if e.available(now)]
+            return sorted(ready, key=lambda e: (e.load, e.failures))
+
+    def create_driver(self, options):
+        """
+        Sesiune nouă pe cel mai puțin încărcat endpoint sănătos; la
+        eșec, următorul. RuntimeError dacă niciunul nu e disponibil.
+        """
+        # Calea binarului Chromium e a mașinii locale
+        options.binary_location = ''
+        errors = []
+        for endpoint in self._candidates():
+            with self._lock:
+                endpoint.active += 1
+            try:
+                driver = webdriver.Remote(
+                    command_executor=endpoint.url, options=options
+                )
+            except Exception as e:
+                with self._lock:
+                    endpoint.active -= 1
+                    self._mark_down(endpoint, f"{type(e).__name__}: {e}")
+                errors.append(f"{endpoint.url}: {str(e)[:80]}")
+                continue
+            with self._lock:
+                self._sessions[driver.session_id] = endpoint
+            return driver
+        raise RuntimeError(
+            "Niciun browser remote disponibil"
+            + (f" ({'; '.join(errors)})" if errors else "")
+        )
+
+    def release(self, driver, error: Exception = None):
+        """Sesiunea s-a închis; cu `error`, endpoint-ul e marcat căzut."""
+        with self._lock:
+            endpoint = self._sessions.pop(
+                getattr(driver, 'session_id', None), None
+            )
+            if endpoint is None:
+                return
+            endpoint.active = max(endpoint.active - 1, 0)
+            if error is not None:
+                self._mark_down(endpoint, f"{type(error).__name__}: {error}")
+
+    def owns(self, driver) -> bool:
+        with self._lock:
+            return getattr(driver, 'session_id', None) in self._sessions
+
+    def status(self) -> list:
+        """Starea endpoint-urilor, pentru afișare."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'url': e.url,
+                    'healthy': now >= e.down_until,
+                    'active': e.active,
+                    'busy': e.busy,
+                    'capacity': e.capacity,
+                    'failures': e.failures,
+                    'retry_in': max(round(e.down_until - now), 0),
+                    'error': e.last_error,
+                }
+                for e in self.endpoints
+            ]
+
+
+# ══════════════════════════════════════════
+# CONFIGURARE
+# ══════════════════════════════════════════
+
+def configured_endpoints() -> str:
+    """PRODUCT_IMPORTER_WEBDRIVERS sau secrets [WEBDRIVER] URLS."""
+    spec = os.environ.get('PRODUCT_IMPORTER_WEBDRIVERS', '')
+    if spec:
+        return spec
+    try:
+        import streamlit as st
+        urls = st.secrets.get('WEBDRIVER', {}).get('URLS', '')
+    except Exception:
+        return ''
+    return ', '.join(urls) if isinstance(urls, (list, tuple)) else urls
+
+
+_pool = None
+_pool_loaded = False
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> RemoteDriverPool | None:
+    """Instanță comună per proces; None fără endpoint-uri configurate."""
+    global _pool, _pool_loaded
+    with _pool_lock:
+        if not _pool_loaded:
+            endpoints = parse_endpoints(configured_endpoints())
+            _pool = RemoteDriverPool(endpoints) if endpoints else None
+            _pool_loaded = True
+        return _pool
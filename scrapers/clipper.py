@@ -4,12 +4,15 @@ Scraper pentru clipperinterall.com.
 """
 import re
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 
 
+@register_scraper('clipper', 'clipperinterall.com')
 class ClipperScraper(BaseScraper):
+    PRODUCT_URL_PATTERN = r'/products/[^/?#]+'
+
     def __init__(self):
         super().__init__()
         self.name = "clipper"
@@ -19,12 +22,15 @@ class ClipperScraper(BaseScraper):
         try:
             soup = self.get_page(
                 url,
-                wait_selector='h1, .product-name, [class*="product"]',
-                prefer_selenium=True
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
             )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata)
+            data = self.structured
+
             # NUME
             name = ""
             for sel in ['h1', '.product-name', '.product-title',
@@ -33,6 +39,8 @@ class ClipperScraper(BaseScraper):
                 if el and el.get_text(strip=True):
                     name = el.get_text(strip=True)
                     break
+            if not name:
+                name = data.get('name', '')
 
             # SKU
             sku = ""
@@ -42,6 +50,8 @@ class ClipperScraper(BaseScraper):
                 if el:
                     sku = el.get_text(strip=True)
                     break
+            if not sku:
+                sku = data.get('sku', '')
 
             if not sku:
                 parts = url.rstrip('/').split('/')
@@ -49,13 +59,7 @@ class ClipperScraper(BaseScraper):
                     sku = parts[-1].upper().replace('-', '_')[:20]
 
             # PRET
-            price = 0.0
-            for sel in ['.product-price', '.price', '[class*="price"]']:
-                el = soup.select_one(sel)
-                if el:
-                    price = clean_price(el.get_text(strip=True))
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             # DESCRIERE
             description = ""
@@ -65,6 +69,8 @@ class ClipperScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             # SPECIFICATII
             specifications = {}
@@ -102,6 +108,8 @@ class ClipperScraper(BaseScraper):
                             if abs_url not in images:
                                 images.append(abs_url)
                     break
+            if not images:
+                images = list(data.get('images', []))
 
             return self._build_product(
                 name=name or "Produs Clipper",
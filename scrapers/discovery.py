@@ -0,0 +1,304 @@
+# scrapers/discovery.py
+"""
+Descoperirea URL-urilor de produs direct de la furnizor, fără Excel.
+Surse acceptate (câte una pe linie în Pasul 1):
+- domeniul furnizorului → sitemap-urile din robots.txt
+  (altfel /sitemap.xml, /sitemap_index.xml)
+- un sitemap (.xml / .xml.gz / sitemap index), citit în flux:
+  XMLPullParser + zlib pe bucăți, memorie constantă indiferent de
+  mărime, index-urile sunt urmate recursiv
+- o pagină de categorie: link-urile de produs + paginarea
+  (rel="next", ?page=N) până nu mai apar produse noi
+Fiecare URL e filtrat cu PRODUCT_URL_PATTERN al scraperului potrivit,
+canonicalizat și deduplicat (utils.url_ingest) înainte de a fi emis.
+"""
+import re
+import zlib
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import date, datetime
+from urllib.parse import (
+    urljoin, urlsplit, urlunsplit, parse_qsl, urlencode,
+)
+
+from bs4 import BeautifulSoup
+
+from scrapers import registry
+from utils import metrics
+from utils.url_ingest import canonicalize, product_key
+
+
+DEFAULT_SITEMAPS = ('/sitemap.xml', '/sitemap_index.xml')
+# Limite de siguranță per sursă
+MAX_SITEMAPS = 1000
+MAX_CATEGORY_PAGES = 50
+CHUNK_SIZE = 64 * 1024
+PAGE_PARAMS = ('page', 'p', 'pg', 'pagina')
+NEXT_PAGE_SELECTORS = [
+    'link[rel="next"]', 'a[rel="next"]',
+    '.pagination .next a', '.pagination a.next',
+    'a.next', 'li.next a', '.pages-item-next a',
+]
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ROBOTS_SITEMAP_RE = re.compile(r'^\s*sitemap\s*:\s*(\S+)', re.I | re.M)
+
+
+def source_kind(url: str) -> str:
+    """'site', 'sitemap' sau 'category'."""
+    path = urlsplit(url).path
+    if path in ('', '/'):
+        return 'site'
+    lower = path.lower()
+    if lower.endswith(('.xml', '.xml.gz')) or 'sitemap' in lower:
+        return 'sitemap'
+    return 'category'
+
+
+class UrlDiscovery:
+    """
+    discovery = UrlDiscovery()
+    for url in discovery.discover(['https://promobox.com']):
+        ...
+    discovery.stats / discovery.errors
+    """
+
+    def __init__(self, session=None, since=None,
+                 max_sitemaps: int = MAX_SITEMAPS,
+                 max_category_pages: int = MAX_CATEGORY_PAGES):
+        self.session = session
+        # Doar URL-uri cu <lastmod> >= since (sitemap-uri)
+        if isinstance(since, (date, datetime)):
+            since = since.isoformat()
+        self.since = (since or '')[:10]
+        self.max_sitemaps = max_sitemaps
+        self.max_category_pages = max_category_pages
+        self.stats = {
+            'sitemaps': 0, 'pages': 0, 'seen': 0,
+            'products': 0, 'duplicates': 0, 'not_product': 0, 'old': 0,
+        }
+        self.errors = []
+
+    def _session(self):
+        if self.session is None:
+            import cloudscraper
+            self.session = cloudscraper.create_scraper(
+                browser={
+                    'browser': 'chrome',
+                    'platform': 'windows',
+                    'desktop': True,
+                }
+            )
+        return self.session
+
+    def _get(self, url: str, stream: bool = False):
+        try:
+            with metrics.span('discovery_get'):
+                response = self._session().get(
+                    url, timeout=30, stream=stream
+                )
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            self.errors.append((url, str(e)[:200]))
+            return None
+
+    # ══════════════════════════════════════════
+    # SURSE
+    # ══════════════════════════════════════════
+
+    def site_sitemaps(self, site_url: str) -> list:
+        """Sitemap-urile declarate în robots.txt, altfel cele uzuale."""
+        parts = urlsplit(site_url)
+        root = urlunsplit((parts.scheme or 'https', parts.netloc, '/', '', ''))
+        response = self._get(urljoin(root, '/robots.txt'))
+        found = []
+        if response is not None:
+            found = _ROBOTS_SITEMAP_RE.findall(response.text)
+        return found or [urljoin(root, path) for path in DEFAULT_SITEMAPS]
+
+    def iter_sitemap(self, sitemap_url: str):
+        """
+        (loc, lastmod) pentru fiecare <url>, urmând <sitemap>-urile din
+        index-uri. Răspunsul e parsat pe bucăți de CHUNK_SIZE, iar
+        elementele procesate sunt eliberate imediat.
+        """
+        queue = deque([sitemap_url])
+        visited = set()
+        while queue and len(visited) < self.max_sitemaps:
+            url = queue.popleft()
+            if url in visited:
+                continue
+            visited.add(url)
+            response = self._get(url, stream=True)
+            if response is None:
+                continue
+            self.stats['sitemaps'] += 1
+            try:
+                for kind, loc, lastmod in self._parse_sitemap(response):
+                    if kind == 'sitemap':
+                        queue.append(loc)
+                    else:
+                        yield loc, lastmod
+            except (ET.ParseError, zlib.error) as e:
+                self.errors.append((url, str(e)[:200]))
+            finally:
+                response.close()
+
+    @staticmethod
+    def _parse_sitemap(response):
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        inflate = None
+        root = None
+        ns = ''
+        loc = lastmod = ''
+        first = True
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if first:
+                first = False
+                # .xml.gz servit fără Content-Encoding
+                if chunk[:2] == _GZIP_MAGIC:
+                    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if inflate is not None:
+                chunk = inflate.decompress(chunk)
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = element
+                        # {http://www.sitemaps.org/...}urlset → namespace;
+                        # <image:loc> & co. au alt namespace
+                        ns = root.tag[:root.tag.find('}') + 1]
+                    continue
+                if element.tag == f"{ns}loc":
+                    loc = (element.text or '').strip()
+                elif element.tag == f"{ns}lastmod":
+                    lastmod = (element.text or '').strip()
+                elif element.tag in (f"{ns}url", f"{ns}sitemap"):
+                    if loc:
+                        yield element.tag[len(ns):], loc, lastmod
+                    loc = lastmod = ''
+                    # Elementele deja emise nu mai stau în memorie
+                    root.clear()
+        parser.close()
+
+    def iter_category(self, category_url: str):
+        """Link-urile de produs de pe o pagină de categorie și următoarele."""
+        scraper_cls = registry.scraper_class(
+            registry.resolve(category_url)
+        )
+        seen = set()
+        url = category_url
+        pages = set()
+        while (url and url not in pages
+               and len(pages) < self.max_category_pages):
+            pages.add(url)
+            response = self._get(url)
+            if response is None:
+                return
+            self.stats['pages'] += 1
+            with metrics.span('discovery_parse'):
+                soup = BeautifulSoup(response.text, 'html.parser')
+            new = 0
+            for a in soup.select('a[href]'):
+                href = urljoin(url, a['href'].strip())
+                if href in seen or not scraper_cls.is_product_url(href):
+                    continue
+                seen.add(href)
+                new += 1
+                yield href
+            if not new:
+                return
+            url = self._next_page(soup, url)
+
+    @staticmethod
+    def _next_page(soup, url: str) -> str | None:
+        for sel in NEXT_PAGE_SELECTORS:
+            el = soup.select_one(sel)
+            if el and el.get('href'):
+                return urljoin(url, el['href'])
+
+        # ?page=N → ?page=N+1, dacă URL-ul are deja parametrul sau
+        # pagina are un link către pagina următoare
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        for param in PAGE_PARAMS:
+            current = params.get(param, '1')
+            if not current.isdigit():
+                continue
+            following = int(current) + 1
+            if param in params or soup.select_one(
+                f'a[href*="{param}={following}"]'
+            ):
+                params[param] = str(following)
+                return urlunsplit(parts._replace(query=urlencode(params)))
+        return None
+
+    # ══════════════════════════════════════════
+    # API
+    # ══════════════════════════════════════════
+
+    def _iter_source(self, source: str):
+        kind = source_kind(source)
+        if kind == 'category':
+            for url in self.iter_category(source):
+                yield url
+            return
+        sitemaps = (
+            self.site_sitemaps(source) if kind == 'site' else [source]
+        )
+        for sitemap in sitemaps:
+            for url, lastmod in self.iter_sitemap(sitemap):
+                if self.since and lastmod and lastmod[:10] < self.since:
+                    self.stats['old'] += 1
+                    continue
+                yield url
+
+    def discover(self, sources: list, known_urls: list = None,
+                 limit: int = None):
+        """
+        Generator de URL-uri de produs canonice, fără duplicate.
+        known_urls: URL-uri deja extrase (nu mai sunt emise)
+        limit: oprește după atâtea produse noi
+        """
+        keys = set()
+        for url in known_urls or []:
+            supplier = registry.resolve(url)
+            canonical = canonicalize(url, supplier)
+            if canonical:
+                keys.add(product_key(canonical, supplier))
+
+        # Un sitemap are de obicei un singur host: rutarea o dată per origine
+        routes = {}
+        for source in sources:
+            source = source.strip()
+            if not source:
+                continue
+            if '//' not in source:
+                source = f"https://{source}"
+            for url in self._iter_source(source):
+                self.stats['seen'] += 1
+                end = url.find('/', url.find('//') + 2)
+                origin = url if end < 0 else url[:end]
+                route = routes.get(origin)
+                if route is None:
+                    supplier = registry.resolve(url)
+                    route = routes[origin] = (
+                        supplier, registry.scraper_class(supplier)
+                    )
+                supplier, scraper_cls = route
+                if not scraper_cls.is_product_url(url):
+                    self.stats['not_product'] += 1
+                    continue
+                canonical = canonicalize(url, supplier)
+                if not canonical:
+                    continue
+                key = product_key(canonical, supplier)
+                if key in keys:
+                    self.stats['duplicates'] += 1
+                    continue
+                keys.add(key)
+                self.stats['products'] += 1
+                yield canonical
+                if limit and self.stats['products'] >= limit:
+                    return
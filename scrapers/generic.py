@@ -5,12 +5,19 @@ Scraper generic pentru site-uri necunoscute.
 """
 import re
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 
 
+@register_scraper('generic')
 class GenericScraper(BaseScraper):
+    WAIT_SELECTOR = 'h1'
+    PRICE_SELECTORS = ['.price', '[class*="price"]', '[itemprop="price"]']
+    # scrape() nu extrage specificații: doar descrierea trebuie să
+    # apară în HTML-ul fără JS
+    HTTP_FIRST_FIELDS = ('description',)
+
     def __init__(self):
         super().__init__()
         self.name = "generic"
@@ -21,15 +28,26 @@ class GenericScraper(BaseScraper):
             parsed = urlparse(url)
             base = f"{parsed.scheme}://{parsed.netloc}"
 
-            soup = self.get_page(url, wait_selector='h1', prefer_selenium=True)
+            soup = self.get_page(
+                url,
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
+            )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata);
+            # numele și imaginile le completează doar dacă pagina
+            # nu le are, restul euristicilor doar ce lipsește
+            data = self.structured
+
             # NUME - primul h1
             name = ""
             h1 = soup.select_one('h1')
             if h1:
                 name = h1.get_text(strip=True)
+            if not name:
+                name = data.get('name', '')
 
             if not name:
                 title = soup.select_one('title')
@@ -37,26 +55,19 @@ class GenericScraper(BaseScraper):
                     name = title.get_text(strip=True)
 
             # SKU
-            sku = ""
-            for sel in [
-                '[class*="sku"]', '[class*="article"]',
-                '[class*="product-code"]', '[class*="reference"]'
-            ]:
-                el = soup.select_one(sel)
-                if el:
-                    sku = el.get_text(strip=True)
-                    break
+            sku = data.get('sku', '')
+            if not sku:
+                for sel in [
+                    '[class*="sku"]', '[class*="article"]',
+                    '[class*="product-code"]', '[class*="reference"]'
+                ]:
+                    el = soup.select_one(sel)
+                    if el:
+                        sku = el.get_text(strip=True)
+                        break
 
             # PREȚ
-            price = 0.0
-            for sel in ['.price', '[class*="price"]',
-                         '[itemprop="price"]']:
-                el = soup.select_one(sel)
-                if el:
-                    price_val = el.get('content', '') or el.get_text(strip=True)
-                    price = clean_price(price_val)
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             # DESCRIERE
             description = ""
@@ -68,6 +79,8 @@ class GenericScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             # IMAGINI
             images = []
@@ -84,6 +97,8 @@ class GenericScraper(BaseScraper):
                             and 'logo' not in abs_url.lower()
                             and 'flag' not in abs_url.lower()):
                         images.append(abs_url)
+            if not images:
+                images = list(data.get('images', []))
 
             return self._build_product(
                 name=name or "Produs Importat",
@@ -91,7 +106,7 @@ class GenericScraper(BaseScraper):
                 price=price,
                 description=description,
                 images=images,
-                colors=[],
+                colors=data.get('colors', []),
                 specifications={},
                 source_url=url,
                 source_site=parsed.netloc,
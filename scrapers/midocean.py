@@ -4,12 +4,15 @@ Scraper pentru midocean.com.
 """
 import re
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 
 
+@register_scraper('midocean', 'midocean.com')
 class MidoceanScraper(BaseScraper):
+    PRODUCT_URL_PATTERN = r'/mo\d+[-\d]*/?(?:[?#]|$)'
+
     def __init__(self):
         super().__init__()
         self.name = "midocean"
@@ -19,12 +22,15 @@ class MidoceanScraper(BaseScraper):
         try:
             soup = self.get_page(
                 url,
-                wait_selector='h1, .product-name, [class*="product"]',
-                prefer_selenium=True
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
             )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata)
+            data = self.structured
+
             name = ""
             for sel in ['h1', '.product-name', '.product-title',
                          'h1[class*="product"]']:
@@ -32,12 +38,16 @@ class MidoceanScraper(BaseScraper):
                 if el and el.get_text(strip=True):
                     name = el.get_text(strip=True)
                     break
+            if not name:
+                name = data.get('name', '')
 
             # SKU din URL (ex: mo2739-03)
             sku = ""
             sku_match = re.search(r'(mo\d+[-\d]*)', url, re.IGNORECASE)
             if sku_match:
                 sku = sku_match.group(1).upper()
+            if not sku:
+                sku = data.get('sku', '')
 
             for sel in ['.product-sku', '[class*="sku"]',
                          '.product-code', '[class*="code"]']:
@@ -48,13 +58,7 @@ class MidoceanScraper(BaseScraper):
                         sku = sku_text
                     break
 
-            price = 0.0
-            for sel in ['.product-price', '.price', '[class*="price"]']:
-                el = soup.select_one(sel)
-                if el:
-                    price = clean_price(el.get_text(strip=True))
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             description = ""
             for sel in ['.product-description', '[class*="description"]',
@@ -63,6 +67,8 @@ class MidoceanScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             specifications = {}
             for sel in ['table', '.product-specifications',
@@ -95,6 +101,8 @@ class MidoceanScraper(BaseScraper):
                             if abs_url not in images:
                                 images.append(abs_url)
                     break
+            if not images:
+                images = list(data.get('images', []))
 
             colors = []
             for sel in [
@@ -109,6 +117,8 @@ class MidoceanScraper(BaseScraper):
                         colors.append(c)
                 if colors:
                     break
+            if not colors:
+                colors = list(data.get('colors', []))
 
             return self._build_product(
                 name=name or f"Produs Midocean {sku}",
@@ -0,0 +1,169 @@
+# scrapers/page_bundle.py
+"""
+Extragere "bundle" dintr-un singur round-trip WebDriver.
+Un execute_async_script face scroll programatic (lazy loading),
+apoi întoarce împreună:
+- html (DOM serializat) și innerText
+- URL-uri de imagini, inclusiv lazy (data-src, srcset ...)
+- opțiuni de variante (după un regex de ID, opțional)
+- tabele de specificații (th/td, dt/dd, li "cheie: valoare")
+- textul de descriere vizibil (strategia 5 din extract_description)
+Înlocuiește apelurile separate de scroll, page_source,
+document.body.innerText și scripturile de fallback.
+"""
+
+DEFAULT_SCROLL_STEPS = [0.33, 0.66, 1.0]
+DEFAULT_SCROLL_PAUSE_MS = 250
+SCRIPT_TIMEOUT = 30
+
+PAGE_BUNDLE_JS = r"""
+// page-bundle
+const done = arguments[arguments.length - 1];
+const opts = arguments[0] || {};
+const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+const txt = (el) => ((el && (el.innerText || el.textContent)) || '').trim();
+
+(async () => {
+  // 1) Scroll programatic pentru lazy loading
+  for (const f of (opts.scroll_steps || [])) {
+    window.scrollTo(0, document.body.scrollHeight * f);
+    await sleep(opts.scroll_pause_ms || 250);
+  }
+  window.scrollTo(0, 0);
+
+  // 2) Imagini (inclusiv atribute lazy)
+  const images = [];
+  const seenImg = new Set();
+  const addImg = (u) => {
+    u = (u || '').trim();
+    if (!u || u.startsWith('data:')) return;
+    try { u = new URL(u, location.href).href; } catch (e) { return; }
+    if (!seenImg.has(u)) { seenImg.add(u); images.push(u); }
+  };
+  const lazyAttrs = ['src', 'data-src', 'data-lazy', 'data-lazy-src',
+                     'data-original', 'data-zoom-image', 'data-large'];
+  document.querySelectorAll('img, source, [data-src], [data-lazy]').forEach(el => {
+    for (const a of lazyAttrs) addImg(el.getAttribute(a));
+    const ss = el.getAttribute('srcset') || el.getAttribute('data-srcset');
+    if (ss) ss.split(',').forEach(p => addImg(p.trim().split(/\s+/)[0]));
+  });
+
+  // 3) Variante (ID-uri validate de regex)
+  const variants = [];
+  if (opts.variant_pattern) {
+    const isVid = (v) => new RegExp(opts.variant_pattern).test((v || '').trim());
+    const seen = new Set();
+    const add = (v, color) => {
+      v = (v || '').trim();
+      if (isVid(v) && !seen.has(v.toUpperCase())) {
+        seen.add(v.toUpperCase());
+        variants.push({variantId: v.toUpperCase(), color: (color || '').trim()});
+      }
+    };
+    document.querySelectorAll('select').forEach(sel => {
+      const meta = ((sel.id || '') + ' ' + (sel.name || '')).toLowerCase();
+      if (!meta.match(/colou?r/)) return;
+      sel.querySelectorAll('option').forEach(o => add(o.value, o.textContent));
+    });
+    const attrs = ['data-variant', 'data-variantid', 'data-variant-id'];
+    document.querySelectorAll('[data-variant], [data-variantid], [data-variant-id], a[href*="variantId="]').forEach(el => {
+      for (const a of attrs) add(el.getAttribute(a), el.textContent);
+      const m = (el.getAttribute('href') || '').match(/variantId=([A-Za-z0-9.]+)/);
+      if (m) add(m[1], el.textContent);
+    });
+  }
+
+  // 4) Specificații: primul tabel cu perechi, apoi dt/dd, apoi li "k: v"
+  const specs = {};
+  for (const table of document.querySelectorAll('table')) {
+    for (const row of table.querySelectorAll('tr')) {
+      const cells = row.querySelectorAll('td, th');
+      if (cells.length >= 2) {
+        const k = txt(cells[0]), v = txt(cells[1]);
+        if (k && v && k.length < 50 && v.length < 200) specs[k] = v;
+      }
+    }
+    if (Object.keys(specs).length) break;
+  }
+  if (!Object.keys(specs).length) {
+    const dts = document.querySelectorAll('dt'), dds = document.querySelectorAll('dd');
+    for (let i = 0; i < Math.min(dts.length, dds.length); i++) {
+      const k = txt(dts[i]), v = txt(dds[i]);
+      if (k && v) specs[k] = v;
+    }
+  }
+  if (!Object.keys(specs).length) {
+    document.querySelectorAll('li').forEach(li => {
+      const t = txt(li);
+      const i = t.indexOf(':');
+      if (i > 0) {
+        const k = t.slice(0, i).trim(), v = t.slice(i + 1).trim();
+        if (k && v && k.length < 50) specs[k] = v;
+      }
+    });
+  }
+
+  // 5) Cel mai lung bloc de text de tip descriere
+  let description = '';
+  for (const sel of ['[class*="description"]', '[class*="detail"]',
+                     '[class*="info"]', '[class*="content"]',
+                     'article', '.content']) {
+    document.querySelectorAll(sel).forEach(el => {
+      const t = txt(el);
+      if (t.length > 50 && t.length > description.length && t.length < 3000) description = t;
+    });
+    if (description.length > 100) break;
+  }
+
+  done({
+    url: location.href,
+    html: document.documentElement.outerHTML,
+    text: document.body ? document.body.innerText : '',
+    images: images,
+    variants: variants,
+    specs: specs,
+    description_text: description,
+  });
+})().catch(e => done({error: String(e)}));
+"""
+
+
+def collect_page_bundle(
+    driver,
+    variant_pattern: str = None,
+    scroll_steps: list = None,
+    scroll_pause_ms: int = DEFAULT_SCROLL_PAUSE_MS,
+) -> dict | None:
+    """
+    Rulează PAGE_BUNDLE_JS pe pagina curentă.
+    Returnează None dacă browserul nu suportă scriptul sau dă eroare
+    (apelantul revine la page_source + scroll clasic).
+    """
+    if not driver:
+        return None
+    try:
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+    except Exception:
+        pass
+    try:
+        bundle = driver.execute_async_script(PAGE_BUNDLE_JS, {
+            'variant_pattern': variant_pattern,
+            'scroll_steps': (
+                DEFAULT_SCROLL_STEPS if scroll_steps is None
+                else scroll_steps
+            ),
+            'scroll_pause_ms': scroll_pause_ms,
+        })
+    except Exception:
+        return None
+    if not isinstance(bundle, dict) or bundle.get('error'):
+        return None
+    if not bundle.get('html'):
+        return None
+    bundle.setdefault('text', '')
+    bundle.setdefault('images', [])
+    bundle.setdefault('variants', [])
+    bundle.setdefault('specs', {})
+    bundle.setdefault('description_text', '')
+    return bundle
+
@@ -4,12 +4,15 @@ Scraper pentru pfconcept.com.
 """
 import re
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 
 
+@register_scraper('pfconcept', 'pfconcept.com')
 class PFConceptScraper(BaseScraper):
+    PRODUCT_URL_PATTERN = r'/\d{6}-[^/?#]+\.html'
+
     def __init__(self):
         super().__init__()
         self.name = "pfconcept"
@@ -19,12 +22,15 @@ class PFConceptScraper(BaseScraper):
         try:
             soup = self.get_page(
                 url,
-                wait_selector='h1, .product-name, [class*="product"]',
-                prefer_selenium=True
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
             )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata)
+            data = self.structured
+
             # NUME
             name = ""
             for sel in ['h1.product-name', 'h1', '.product-title h1',
@@ -33,6 +39,8 @@ class PFConceptScraper(BaseScraper):
                 if el and el.get_text(strip=True):
                     name = el.get_text(strip=True)
                     break
+            if not name:
+                name = data.get('name', '')
 
             # SKU - din URL
             sku = ""
@@ -45,15 +53,11 @@ class PFConceptScraper(BaseScraper):
                 if el:
                     sku = el.get_text(strip=True)
                     break
+            if not sku:
+                sku = data.get('sku', '')
 
             # PREȚ
-            price = 0.0
-            for sel in ['.product-price', '.price', '[class*="price"]']:
-                el = soup.select_one(sel)
-                if el:
-                    price = clean_price(el.get_text(strip=True))
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             # DESCRIERE
             description = ""
@@ -63,6 +67,8 @@ class PFConceptScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             # SPECIFICAȚII
             specifications = {}
@@ -98,6 +104,8 @@ class PFConceptScraper(BaseScraper):
                             if abs_url not in images:
                                 images.append(abs_url)
                     break
+            if not images:
+                images = list(data.get('images', []))
 
             # CULORI
             colors = []
@@ -113,6 +121,8 @@ class PFConceptScraper(BaseScraper):
                         colors.append(c)
                 if colors:
                     break
+            if not colors:
+                colors = list(data.get('colors', []))
 
             return self._build_product(
                 name=name or "Produs PF Concept",
@@ -0,0 +1,288 @@
+# scrapers/pipeline.py
+"""
+Scraping în două etape, separate:
+- I/O: descărcarea paginilor, câte un thread per furnizor
+  (fiecare scraper are propriul driver Selenium / sesiune HTTP)
+- CPU: BeautifulSoup + extract_* + _build_product într-un
+  ProcessPoolExecutor; HTML-ul intră ca bytes, produsele ies ca dict
+Parsarea nu mai stă sub GIL-ul procesului Streamlit și scalează cu
+numărul de nuclee. Scraperele cu SPLIT_STAGES = False (ex. XD Connects,
+care citește variantele din browser) rulează scrape() complet în
+thread-ul I/O.
+Cu tabs_per_supplier > 1, fiecare furnizor are atâtea thread-uri I/O,
+fiecare cu tab-ul lui în contextul furnizorului, în browsere comune
+(scrapers.browser_contexts).
+Cu prefetch_lookahead > 0, următoarele URL-uri ale furnizorului se
+descarcă prin HTTP cât timp pagina curentă se randează
+(scrapers.prefetch).
+"""
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from scrapers import registry
+from scrapers import browser_contexts
+from scrapers.prefetch import Prefetcher
+from utils import metrics
+from utils.page_cache import get_cache as get_page_cache
+
+
+# Un nucleu rămâne pentru Streamlit + thread-urile I/O
+DEFAULT_CPU_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Pagini descărcate care așteaptă parsarea, per proces de parsare
+PENDING_PER_WORKER = 2
+
+
+def _as_list(result) -> list:
+    if isinstance(result, list):
+        return [p for p in result if isinstance(p, dict)]
+    return [result] if isinstance(result, dict) else []
+
+
+# ══════════════════════════════════════════
+# ETAPA CPU (rulează în procesele din pool)
+# ══════════════════════════════════════════
+
+_worker_scrapers = {}
+
+
+def _init_worker():
+    try:
+        import streamlit.logger
+        streamlit.logger.set_log_level('error')
+    except Exception:
+        pass
+    registry.ensure_loaded()
+
+
+def parse_page(scraper_name: str, url: str, html: bytes,
+               bundle: dict = None) -> tuple:
+    """
+    Parsează o pagină deja descărcată cu scrape()-ul scraperului,
+    fără browser sau rețea. Returnează (produse, secunde).
+    """
+    t0 = time.perf_counter()
+    scraper = _worker_scrapers.get(scraper_name)
+    if scraper is None:
+        scraper = registry.create(scraper_name)
+        scraper.offline = True
+        scraper.use_page_cache = False
+        _worker_scrapers[scraper_name] = scraper
+    scraper.provide_page(url, html.decode('utf-8'), bundle)
+    products = _as_list(scraper.scrape(url))
+    return products, time.perf_counter() - t0
+
+
+# ══════════════════════════════════════════
+# ORCHESTRARE
+# ══════════════════════════════════════════
+
+def _attach_streamlit(thread: threading.Thread):
+    """Mesajele st.* din thread-uri ajung în pagina curentă."""
+    try:
+        from streamlit.runtime.scriptrunner import (
+            add_script_run_ctx, get_script_run_ctx,
+        )
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+    except Exception:
+        pass
+
+
+class ScrapePipeline:
+    """
+    pipeline = ScrapePipeline()
+    for index, url, products, error in pipeline.run(urls):
+        ...
+    pipeline.close()
+    """
+
+    def __init__(self, cpu_workers: int = None,
+                 use_page_cache: bool = True,
+                 tabs_per_supplier: int = 1,
+                 prefetch_lookahead: int = 0):
+        self.cpu_workers = (
+            DEFAULT_CPU_WORKERS if cpu_workers is None else cpu_workers
+        )
+        self.use_page_cache = use_page_cache
+        self.tabs_per_supplier = max(1, tabs_per_supplier)
+        # Tab-uri în browsere comune, nu câte un Chrome per thread;
+        # gazda e a pipeline-ului și se închide odată cu el
+        self.browser_host = (
+            browser_contexts.BrowserHost()
+            if self.tabs_per_supplier > 1 else None
+        )
+        self.prefetch_lookahead = max(0, prefetch_lookahead)
+        self.scrapers = {}
+        self.prefetchers = {}
+        self._pool = None
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.stats = {'fetched': 0, 'parsed': 0, 'inline': 0, 'failed': 0}
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _get_pool(self):
+        """Pool-ul de parsare (spawn: fără fork dintr-un proces cu thread-uri)."""
+        if self._pool is None and self.cpu_workers > 0:
+            try:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                )
+            except (OSError, ValueError):
+                self._pool = None
+        return self._pool
+
+    def _scraper(self, name: str, tab: int = 0):
+        key = name if tab == 0 else f"{name}#{tab}"
+        if key not in self.scrapers:
+            scraper = registry.create(name)
+            scraper.use_page_cache = self.use_page_cache
+            scraper.prefetcher = self.prefetchers.get(name)
+            if self.browser_host is not None:
+                scraper.browser_host = self.browser_host
+            self.scrapers[key] = scraper
+        return self.scrapers[key]
+
+    def _prefetcher(self, name: str, jobs: list):
+        """Fereastra de prefetch a furnizorului, comună tab-urilor lui."""
+        previous = self.prefetchers.pop(name, None)
+        if previous is not None:
+            previous.close()
+        if self.prefetch_lookahead and len(jobs) > 1:
+            self.prefetchers[name] = Prefetcher(
+                self._scraper(name), [url for _, url in jobs],
+                lookahead=self.prefetch_lookahead,
+                page_cache=get_page_cache() if self.use_page_cache else None,
+            )
+        for key, scraper in self.scrapers.items():
+            if key.split('#', 1)[0] == name:
+                scraper.prefetcher = self.prefetchers.get(name)
+
+    def run(self, urls: list):
+        """Generator: (index, url, produse, eroare), în ordinea terminării."""
+        by_supplier = {}
+        for index, url in enumerate(urls):
+            by_supplier.setdefault(registry.resolve(url), []).append(
+                (index, url)
+            )
+
+        results = queue.Queue()
+        pool = self._get_pool()
+        slots = threading.BoundedSemaphore(
+            max(1, self.cpu_workers) * PENDING_PER_WORKER
+        )
+        threads = []
+        # Thread-urile furnizorilor raportează în colectorul jobului
+        collector = metrics.current_collector()
+        for name, jobs in by_supplier.items():
+            # Tab-urile aceluiași furnizor iau URL-uri din aceeași coadă
+            pending = queue.SimpleQueue()
+            for job in jobs:
+                pending.put(job)
+            self._prefetcher(name, jobs)
+            for tab in range(min(self.tabs_per_supplier, len(jobs))):
+                thread = threading.Thread(
+                    target=self._io_worker,
+                    args=(name, tab, pending, pool, slots, results,
+                          collector),
+                    name=f"fetch-{name}-{tab}",
+                    daemon=True,
+                )
+                _attach_streamlit(thread)
+                threads.append(thread)
+                thread.start()
+
+        for _ in range(len(urls)):
+            yield results.get()
+        for thread in threads:
+            thread.join()
+
+    def _io_worker(self, name, tab, pending, pool, slots, results,
+                   collector=None):
+        scraper = self._scraper(name, tab)
+        split = pool is not None and scraper.SPLIT_STAGES
+        with metrics.collecting(collector), metrics.supplier(name):
+            while not self._stop.is_set():
+                try:
+                    index, url = pending.get_nowait()
+                except queue.Empty:
+                    return
+                if scraper.prefetcher is not None:
+                    scraper.prefetcher.advance(url)
+                try:
+                    if not split:
+                        with metrics.span('scrape'):
+                            products = _as_list(scraper.scrape(url))
+                        self._count('inline')
+                        results.put((index, url, products, None))
+                        continue
+
+                    with metrics.span('fetch'):
+                        page = scraper.fetch(url)
+                    if not page:
+                        self._count('failed')
+                        results.put((index, url, [], None))
+                        continue
+                    self._count('fetched')
+
+                    # Backpressure: nu descărcăm mult înaintea parsării
+                    slots.acquire()
+                    try:
+                        future = pool.submit(
+                            parse_page, name, url,
+                            page['html'], page['bundle'],
+                        )
+                    except Exception:
+                        slots.release()
+                        raise
+                    future.add_done_callback(partial(
+                        self._parsed, name, index, url, slots, results,
+                        collector,
+                    ))
+                except Exception as e:
+                    self._count('failed')
+                    results.put((index, url, [], e))
+
+    def _parsed(self, name, index, url, slots, results, collector, future):
+        slots.release()
+        try:
+            products, seconds = future.result()
+        except Exception as e:
+            self._count('failed')
+            results.put((index, url, [], e))
+            return
+        with metrics.collecting(collector):
+            metrics.record('parse_extract', seconds, name)
+        self._count('parsed')
+        results.put((index, url, products, None))
+
+    def cancel(self):
+        """Thread-urile I/O nu mai pornesc descărcări noi."""
+        self._stop.set()
+
+    def close(self):
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        for prefetcher in self.prefetchers.values():
+            prefetcher.close()
+        self.prefetchers = {}
+        for scraper in self.scrapers.values():
+            try:
+                scraper.close()
+            except Exception:
+                pass
+        self.scrapers = {}
+        if self.browser_host is not None:
+            self.browser_host.close()
@@ -0,0 +1,200 @@
+# scrapers/prefetch.py
+"""
+Prefetch speculativ: cât timp scraperul randează URL-ul N, următoarele
+`lookahead` URL-uri ale aceluiași furnizor se descarcă prin HTTP.
+- HTML-ul descărcat ține locul GET-ului din calea HTTP-first
+  (BaseScraper._http_get / get_page_cloudscraper): când pagina ajunge
+  la rând, octeții sunt deja locali; o descărcare în curs e așteptată,
+  nu repetată
+- Paginile care cer totuși browserul și imaginile lor probabile (din
+  datele structurate) sunt anunțate Chrome-ului prin <link rel=prefetch>
+  / preconnect (BaseScraper._hint_next): cache-ul HTTP, DNS-ul și
+  TLS-ul browserului sunt calde la driver.get
+Nu se descarcă nimic ce scraperul n-ar fi cerut oricum: paginile din
+cache-ul de pagini, scraperele fără HTTP-first și domeniile pe care
+HTTP-first s-a oprit sunt sărite.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cloudscraper
+
+from scrapers.structured_data import extract_structured
+from utils import metrics
+from utils.helpers import get_domain
+
+
+DEFAULT_LOOKAHEAD = 3
+# Descărcări simultane per furnizor
+MAX_PARALLEL = 2
+# Cât așteaptă scraperul o descărcare începută
+TAKE_TIMEOUT = 30
+# Imagini anunțate browserului per pagină
+HINT_IMAGES = 4
+
+# <link>-urile stau într-un iframe about:blank ascuns: în HTML-ul paginii
+# curente apare doar iframe-ul gol, partiția de cache e a site-ului curent
+HINT_JS = r"""
+const [pages, images, origins] = arguments;
+let frame = document.getElementById('__prefetch_hints');
+if (!frame) {
+  frame = document.createElement('iframe');
+  frame.id = '__prefetch_hints';
+  frame.style.display = 'none';
+  document.documentElement.appendChild(frame);
+}
+const head = frame.contentDocument.head;
+const add = (rel, href, as) => {
+  const link = frame.contentDocument.createElement('link');
+  link.rel = rel;
+  link.href = href;
+  if (as) link.as = as;
+  head.appendChild(link);
+};
+origins.forEach(o => add('preconnect', o));
+pages.forEach(u => add('prefetch', u, 'document'));
+images.forEach(u => add('prefetch', u, 'image'));
+"""
+
+
+def _origin(url: str) -> str:
+    scheme, _, rest = url.partition('://')
+    return f"{scheme}://{rest.split('/', 1)[0]}" if rest else ''
+
+
+class Prefetcher:
+    """
+    Fereastra de prefetch pentru URL-urile unui furnizor, în ordine.
+    prefetcher.advance(url)   # scraperul a luat URL-ul → programează
+    prefetcher.take(url)      # HTML-ul descărcat (sau None)
+    prefetcher.hints(url)     # ce să anunțe browserul pe pagina curentă
+    """
+
+    def __init__(self, scraper, urls: list,
+                 lookahead: int = DEFAULT_LOOKAHEAD,
+                 page_cache=None, max_parallel: int = MAX_PARALLEL):
+        self.scraper = scraper
+        self.urls = list(urls)
+        self.lookahead = lookahead
+        self.page_cache = page_cache
+        self.stats = {'fetched': 0, 'hits': 0, 'skipped': 0, 'failed': 0}
+        self._position = {url: i for i, url in enumerate(self.urls)}
+        self._taken = 0
+        self._scheduled = 0
+        self._futures = {}
+        self._found = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Descărcările contează la jobul care a creat fereastra
+        self._collector = metrics.current_collector()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_parallel,
+            thread_name_prefix=f"prefetch-{scraper.name}",
+        )
+
+    def _wanted(self, url: str) -> bool:
+        """Scraperul ar cere oricum pagina prin HTTP? (cu _lock ținut)"""
+        if self.page_cache is not None and self.page_cache.contains(url):
+            return False
+        scraper = self.scraper
+        if not scraper.PREFER_SELENIUM:
+            return True
+        if not scraper.HTTP_FIRST:
+            return False
+        # Paginile descărcate deja fără date complete vor fi ratări:
+        # HTTP-first se poate opri înainte să ajungă la `url`
+        domain = get_domain(url)
+        expected = scraper._http_first_misses.get(domain, 0) + sum(
+            1 for pending in self._futures
+            if get_domain(pending) == domain
+            and not self._found.get(pending, (False,))[0]
+        )
+        return expected < scraper.HTTP_FIRST_MAX_MISSES
+
+    def advance(self, url: str):
+        """Scraperul a început `url`: fereastra înaintează."""
+        with self._lock:
+            self._taken = max(self._taken, self._position.get(url, -1) + 1)
+            end = min(self._taken + self.lookahead, len(self.urls))
+            while self._scheduled < end:
+                upcoming = self.urls[self._scheduled]
+                self._scheduled += 1
+                if self._scheduled <= self._taken:
+                    continue   # deja luat de un tab
+                if not self._wanted(upcoming):
+                    self.stats['skipped'] += 1
+                    continue
+                self._futures[upcoming] = self._executor.submit(
+                    self._fetch, upcoming
+                )
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = cloudscraper.create_scraper(
+                browser={
+                    'browser': 'chrome',
+                    'platform': 'windows',
+                    'desktop': True,
+                }
+            )
+        return session
+
+    def _fetch(self, url: str) -> str | None:
+        try:
+            with metrics.collecting(self._collector), \
+                    metrics.span('prefetch', self.scraper.name):
+                response = self._session().get(url, timeout=30)
+            response.raise_for_status()
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            return None
+        html = response.text
+        data = extract_structured(html, url)
+        complete = self.scraper.http_page_complete(html, data)
+        with self._lock:
+            self.stats['fetched'] += 1
+            self._found[url] = (complete, data.get('images') or [])
+        return html
+
+    def take(self, url: str) -> str | None:
+        """HTML-ul prefetch-uit; așteaptă dacă descărcarea e în curs."""
+        with self._lock:
+            future = self._futures.pop(url, None)
+        if future is None:
+            return None
+        try:
+            html = future.result(timeout=TAKE_TIMEOUT)
+        except Exception:
+            return None
+        if html is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+        return html
+
+    def hints(self, url: str) -> tuple:
+        """
+        (pagini, imagini, origini) de anunțat pe pagina `url`: URL-urile
+        următoare de pe același site care vor trece prin browser.
+        """
+        domain = get_domain(url)
+        start = self._position.get(url, -1) + 1
+        pages, images, origins = [], [], []
+        with self._lock:
+            for upcoming in self.urls[start:start + self.lookahead]:
+                if get_domain(upcoming) != domain:
+                    continue
+                complete, found = self._found.get(upcoming, (False, []))
+                if complete:
+                    continue   # HTTP-first o rezolvă fără browser
+                pages.append(upcoming)
+                for image in found[:HINT_IMAGES]:
+                    images.append(image)
+                    origin = _origin(image)
+                    if origin and origin not in origins:
+                        origins.append(origin)
+        return pages, images, origins
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
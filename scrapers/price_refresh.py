@@ -0,0 +1,322 @@
+# scrapers/price_refresh.py
+"""
+Actualizare rapidă doar pentru preț și stoc, fără re-scraping complet.
+- Etapa HTTP: GET + date structurate / PRICE_SELECTORS, în paralel
+  (ThreadPoolExecutor), cu limită de cereri simultane per domeniu
+- Etapa browser: doar paginile fără preț în HTML, pentru furnizorii
+  cu PREFER_SELENIUM; o încărcare per pagină (fără tab-uri, scroll,
+  imagini), câte un thread per furnizor
+- Fără cache de pagini: prețul trebuie să fie cel de acum
+Rezultatul (dict per produs) intră în ProductStore (apply_refresh)
+și în CSV-ul minimal Gomag (gomag.writer.price_update_csv).
+
+Rulare din linia de comandă:
+    python -m scrapers.price_refresh --store products.sqlite \
+        --out preturi.csv --with-stock --apply
+"""
+import sys
+import queue
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scrapers import registry
+from scrapers.pipeline import _attach_streamlit
+from utils import metrics
+from utils.helpers import double_price, get_domain
+
+
+DEFAULT_WORKERS = 16
+# Cereri HTTP simultane către același domeniu
+PER_DOMAIN = 4
+
+# schema.org/ItemAvailability → stoc Gomag (1 / 0)
+IN_STOCK = {'instock', 'limitedavailability', 'preorder', 'presale',
+            'backorder', 'onlineonly', 'instoreonly'}
+OUT_OF_STOCK = {'outofstock', 'soldout', 'discontinued'}
+
+
+def stock_from_availability(availability: str) -> int | None:
+    """1 / 0 din availability (schema.org sau OpenGraph), altfel None."""
+    value = (availability or '').rsplit('/', 1)[-1]
+    value = value.replace(' ', '').replace('_', '').lower()
+    if value in IN_STOCK:
+        return 1
+    if value in OUT_OF_STOCK:
+        return 0
+    return None
+
+
+def items_from_store(store, collection: str) -> list:
+    """Produsele de verificat: {id, sku, url, old_price, old_stock}."""
+    return [
+        {
+            'id': record.id,
+            'sku': record.sku,
+            'url': record.source_url,
+            'old_price': record.original_price,
+            'old_stock': record.stock,
+        }
+        for record in store.records(collection)
+        if record.source_url
+    ]
+
+
+class PriceRefresher:
+    """
+    refresher = PriceRefresher()
+    for result in refresher.run(items_from_store(store, SCRAPED)):
+        ...
+    refresher.close()
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS,
+                 per_domain: int = PER_DOMAIN,
+                 use_browser: bool = True):
+        self.workers = max(1, workers)
+        self.per_domain = max(1, per_domain)
+        self.use_browser = use_browser
+        self.stats = {'http': 0, 'browser': 0, 'failed': 0, 'changed': 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._domains = {}
+        self._scrapers = []
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _scraper(self, name: str):
+        """Un scraper per thread și furnizor (sesiunile nu sunt partajate)."""
+        scrapers = getattr(self._local, 'scrapers', None)
+        if scrapers is None:
+            scrapers = self._local.scrapers = {}
+        if name not in scrapers:
+            scraper = registry.create(name)
+            scraper.use_page_cache = False
+            scrapers[name] = scraper
+            with self._lock:
+                self._scrapers.append(scraper)
+        return scrapers[name]
+
+    def _domain_slot(self, url: str) -> threading.BoundedSemaphore:
+        domain = get_domain(url)
+        with self._lock:
+            if domain not in self._domains:
+                self._domains[domain] = threading.BoundedSemaphore(
+                    self.per_domain
+                )
+            return self._domains[domain]
+
+    # ══════════════════════════════════════════
+    # ETAPE
+    # ══════════════════════════════════════════
+
+    def _check(self, name: str, item: dict, use_http: bool) -> dict:
+        scraper = self._scraper(name)
+        found = None
+        error = None
+        try:
+            with metrics.supplier(name), metrics.span('price_check'):
+                if use_http:
+                    with self._domain_slot(item['url']):
+                        found = scraper.check_price(
+                            item['url'], use_browser=False
+                        )
+                else:
+                    found = scraper.check_price(
+                        item['url'], use_http=False
+                    )
+        except Exception as e:
+            error = str(e)[:200]
+        return self._result(item, found, error)
+
+    def _result(self, item: dict, found: dict | None,
+                error: str | None) -> dict:
+        result = {
+            'id': item.get('id'),
+            'sku': item.get('sku', ''),
+            'url': item['url'],
+            'old_price': item.get('old_price', 0.0),
+            'price': 0.0,
+            'currency': '',
+            'final_price': 0.0,
+            'stock': None,
+            'via': '',
+            'changed': False,
+            'error': error,
+        }
+        if not found:
+            return result
+        price = found['price']
+        stock = stock_from_availability(found.get('availability'))
+        result.update({
+            'price': price,
+            'currency': found.get('currency', ''),
+            'final_price': double_price(price),
+            'stock': stock,
+            'via': found['via'],
+            'changed': (
+                abs(price - (result['old_price'] or 0.0)) >= 0.005
+                or (stock is not None
+                    and stock != item.get('old_stock', stock))
+            ),
+        })
+        return result
+
+    def _needs_browser(self, name: str, result: dict) -> bool:
+        return (
+            self.use_browser and not result['price']
+            and registry.scraper_class(name).PREFER_SELENIUM
+        )
+
+    def _finish(self, result: dict) -> dict:
+        if result['via']:
+            self._count(result['via'])
+            if result['changed']:
+                self._count('changed')
+        else:
+            self._count('failed')
+        return result
+
+    def run(self, items: list):
+        """Generator de rezultate, în ordinea terminării."""
+        http_jobs = []
+        browser_jobs = {}
+        for item in items:
+            name = registry.resolve(item['url'])
+            cls = registry.scraper_class(name)
+            if cls.HTTP_FIRST or not cls.PREFER_SELENIUM:
+                http_jobs.append((name, item))
+            else:
+                browser_jobs.setdefault(name, []).append(item)
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix='price-http',
+        ) as pool:
+            futures = {
+                pool.submit(self._check, name, item, True): (name, item)
+                for name, item in http_jobs
+            }
+            for future in as_completed(futures):
+                name, item = futures[future]
+                result = future.result()
+                if self._needs_browser(name, result):
+                    browser_jobs.setdefault(name, []).append(item)
+                    continue
+                yield self._finish(result)
+
+        if not self.use_browser:
+            for group in browser_jobs.values():
+                for item in group:
+                    yield self._finish(self._result(item, None, None))
+            return
+
+        # Un singur driver per furnizor: browserele sunt scumpe
+        results = queue.Queue()
+        threads = []
+        for name, group in browser_jobs.items():
+            thread = threading.Thread(
+                target=self._browser_worker,
+                args=(name, group, results),
+                name=f"price-{name}",
+                daemon=True,
+            )
+            _attach_streamlit(thread)
+            threads.append(thread)
+            thread.start()
+        for _ in range(sum(len(g) for g in browser_jobs.values())):
+            yield self._finish(results.get())
+        for thread in threads:
+            thread.join()
+
+    def _browser_worker(self, name: str, group: list, results):
+        for item in group:
+            results.put(self._check(name, item, False))
+
+    def close(self):
+        for scraper in self._scrapers:
+            try:
+                scraper.close()
+            except Exception:
+                pass
+        self._scrapers = []
+
+
+def apply_refresh(store, results) -> int:
+    """Scrie prețurile (și stocul) găsite în ProductStore. Returnează nr."""
+    checked_at = datetime.now().isoformat(timespec='seconds')
+    changes = {}
+    for result in results:
+        if result.get('id') is None or not result.get('price'):
+            continue
+        fields = {
+            'original_price': result['price'],
+            'final_price': result['final_price'],
+            'price_checked_at': checked_at,
+        }
+        if result.get('currency'):
+            fields['currency'] = result['currency']
+        if result.get('stock') is not None:
+            fields['stock'] = result['stock']
+        changes[result['id']] = fields
+    store.update_many(changes)
+    return len(changes)
+
+
+# ══════════════════════════════════════════
+# LINIA DE COMANDĂ
+# ══════════════════════════════════════════
+
+def main(argv=None) -> int:
+    from gomag.writer import price_update_csv
+    from utils.product_store import ProductStore, SCRAPED
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--store', required=True,
+                        help="Fișierul SQLite al ProductStore")
+    parser.add_argument('--collection', default=SCRAPED)
+    parser.add_argument('--out', help="CSV-ul Gomag de actualizare")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--per-domain', type=int, default=PER_DOMAIN)
+    parser.add_argument('--no-browser', action='store_true',
+                        help="Doar HTTP, fără Selenium")
+    parser.add_argument('--with-stock', action='store_true')
+    parser.add_argument('--all', action='store_true',
+                        help="Și produsele cu prețul neschimbat")
+    parser.add_argument('--apply', action='store_true',
+                        help="Salvează prețurile noi în store")
+    args = parser.parse_args(argv)
+
+    store = ProductStore(args.store)
+    items = items_from_store(store, args.collection)
+    refresher = PriceRefresher(
+        workers=args.workers, per_domain=args.per_domain,
+        use_browser=not args.no_browser,
+    )
+    results = []
+    try:
+        for result in refresher.run(items):
+            results.append(result)
+            print(f"{len(results)}/{len(items)} "
+                  f"{result['via'] or '-':<8}{result['price']:>10.2f}  "
+                  f"{result['url']}")
+    finally:
+        refresher.close()
+
+    print(refresher.stats)
+    if args.apply:
+        print(f"Actualizate în store: {apply_refresh(store, results)}")
+    if args.out:
+        with open(args.out, 'wb') as f:
+            f.write(price_update_csv(
+                results, with_stock=args.with_stock,
+                only_changed=not args.all,
+            ))
+    store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
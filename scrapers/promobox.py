@@ -4,12 +4,17 @@ Scraper pentru promobox.com.
 """
 import re
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 
 
+@register_scraper('promobox', 'promobox.com')
 class PromoboxScraper(BaseScraper):
+    PRICE_SELECTORS = ['.product-price', '.price', '[class*="price"]',
+                       'span.price']
+    PRODUCT_URL_PATTERN = r'/products/[^/?#]+'
+
     def __init__(self):
         super().__init__()
         self.name = "promobox"
@@ -19,12 +24,15 @@ class PromoboxScraper(BaseScraper):
         try:
             soup = self.get_page(
                 url,
-                wait_selector='h1, .product-name, [class*="product"]',
-                prefer_selenium=True
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
             )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata)
+            data = self.structured
+
             # NUME
             name = ""
             for sel in ['h1', '.product-name', '.product-title',
@@ -33,12 +41,16 @@ class PromoboxScraper(BaseScraper):
                 if el and el.get_text(strip=True):
                     name = el.get_text(strip=True)
                     break
+            if not name:
+                name = data.get('name', '')
 
             # SKU din URL (ex: MAGNUM, CROSS, GORDON)
             sku = ""
             sku_match = re.search(r'/products/([^?/]+)', url)
             if sku_match:
                 sku = sku_match.group(1).upper()
+            if not sku:
+                sku = data.get('sku', '')
 
             for sel in ['.product-sku', '[class*="sku"]', '.sku',
                          '.article-number']:
@@ -50,14 +62,7 @@ class PromoboxScraper(BaseScraper):
                     break
 
             # PREȚ
-            price = 0.0
-            for sel in ['.product-price', '.price', '[class*="price"]',
-                         'span.price']:
-                el = soup.select_one(sel)
-                if el:
-                    price = clean_price(el.get_text(strip=True))
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             # DESCRIERE
             description = ""
@@ -67,6 +72,8 @@ class PromoboxScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             # SPECIFICAȚII
             specifications = {}
@@ -102,6 +109,8 @@ class PromoboxScraper(BaseScraper):
                             if abs_url not in images:
                                 images.append(abs_url)
                     break
+            if not images:
+                images = list(data.get('images', []))
 
             if not images:
                 all_imgs = soup.select('img')
@@ -131,6 +140,8 @@ class PromoboxScraper(BaseScraper):
                         colors.append(c)
                 if colors:
                     break
+            if not colors:
+                colors = list(data.get('colors', []))
 
             return self._build_product(
                 name=name or f"Produs Promobox {sku}",
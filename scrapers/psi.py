@@ -7,7 +7,7 @@ Cookie: #onetrust-accept-btn-handler
 import re
 import time
 from scrapers.base_scraper import BaseScraper
-from utils.helpers import clean_price
+from scrapers.registry import register_scraper
 from utils.image_handler import make_absolute_url
 import streamlit as st
 from selenium.webdriver.common.by import By
@@ -17,7 +17,17 @@ from selenium.common.exceptions import (
 )
 
 
+@register_scraper('psi', 'psiproductfinder.de')
 class PSIScraper(BaseScraper):
+    WAIT_SELECTOR = 'h1, .title, article, [class*="product"]'
+    # Prețurile apar doar după login, în sesiunea Selenium
+    HTTP_FIRST = False
+    PRICE_SELECTORS = [
+        '.product-price', '.price',
+        '[class*="price"]', '.tag.is-large',
+    ]
+    PRODUCT_URL_PATTERN = r'/p-[a-f0-9]+-'
+
     def __init__(self):
         super().__init__()
         self.name = "psi"
@@ -29,6 +39,13 @@ class PSIScraper(BaseScraper):
         if not self.driver:
             return
 
+        # Consimțământul e deja în profilul Chrome
+        if not self._has_element(
+            "#onetrust-consent-sdk, #onetrust-banner-sdk, "
+            ".onetrust-pc-dark-filter"
+        ):
+            return
+
         # OneTrust - selectorul exact de pe PSI
         try:
             btn = self.driver.find_element(
@@ -60,6 +77,16 @@ class PSIScraper(BaseScraper):
         except Exception:
             pass
 
+    def prepare(self):
+        # În procesele de parsare pagina vine deja descărcată
+        if not self.offline:
+            self._login_if_needed()
+
+    def _drop_driver(self, error: Exception = None):
+        # Sesiunea de login moare odată cu browserul
+        self._logged_in = False
+        super()._drop_driver(error)
+
     def _login_if_needed(self):
         """Login pe PSI Product Finder."""
         if self._logged_in:
@@ -86,6 +113,14 @@ class PSIScraper(BaseScraper):
             self._dismiss_cookie_banner()
             time.sleep(1)
 
+            # ═══ Sesiune păstrată în profilul Chrome ═══
+            # /login redirecționează, formularul lipsește
+            if ('/login' not in (self.driver.current_url or '')
+                    and not self._has_element("input[type='password']")):
+                self._logged_in = True
+                st.info("✅ PSI: Sesiune existentă (profil Chrome)")
+                return
+
             # ═══ Completăm username ═══
             # Selectorul EXACT de pe PSI: input[name='username']
             try:
@@ -264,19 +299,19 @@ class PSIScraper(BaseScraper):
     def scrape(self, url: str) -> dict | None:
         """Scrape produs de pe psiproductfinder.de."""
         try:
-            self._login_if_needed()
+            self.prepare()
 
             soup = self.get_page(
                 url,
-                wait_selector=(
-                    'h1, .title, article, '
-                    '[class*="product"]'
-                ),
-                prefer_selenium=True
+                wait_selector=self.WAIT_SELECTOR,
+                prefer_selenium=self.PREFER_SELENIUM
             )
             if not soup:
                 return None
 
+            # Date structurate (JSON-LD / OpenGraph / microdata)
+            data = self.structured
+
             # NUME
             name = ""
             for sel in [
@@ -290,6 +325,8 @@ class PSIScraper(BaseScraper):
                     if len(text) > 3:
                         name = text
                         break
+            if not name:
+                name = data.get('name', '')
 
             # SKU din URL
             sku = ""
@@ -318,18 +355,11 @@ class PSIScraper(BaseScraper):
                     if sku_text and len(sku_text) < 30:
                         sku = sku_text
                     break
+            if not sku:
+                sku = data.get('sku', '')
 
             # PREȚ
-            price = 0.0
-            for sel in [
-                '.product-price', '.price',
-                '[class*="price"]', '.tag.is-large',
-            ]:
-                el = soup.select_one(sel)
-                if el:
-                    price = clean_price(el.get_text(strip=True))
-                    if price > 0:
-                        break
+            price = data.get('price', 0.0) or self.extract_price(soup)
 
             # DESCRIERE
             description = ""
@@ -343,6 +373,8 @@ class PSIScraper(BaseScraper):
                 if el:
                     description = str(el)
                     break
+            if not description and data.get('description'):
+                description = f"<p>{data['description']}</p>"
 
             # SPECIFICAȚII
             specifications = {}
@@ -412,6 +444,8 @@ class PSIScraper(BaseScraper):
                                 images.append(abs_url)
                     if images:
                         break
+            if not images:
+                images = list(data.get('images', []))
 
             # Fallback imagini
             if not images:
@@ -449,6 +483,8 @@ class PSIScraper(BaseScraper):
                         colors.append(c)
                 if colors:
                     break
+            if not colors:
+                colors = list(data.get('colors', []))
 
             return self._build_product(
                 name=name or f"Produs PSI {sku}",
@@ -0,0 +1,165 @@
+# scrapers/registry.py
+"""
+Registru de scrapere + rutare URL → scraper.
+- Scraperele se înregistrează singure cu @register_scraper(nume, domenii)
+- Rutarea folosește o hartă de sufixe de domeniu precompilată:
+  "shop.promobox.com" → "promobox.com" → promobox (O(nr. etichete))
+- Rezultatele sunt puse în cache per host
+- Plugin-uri externe se pot înregistra prin entry points
+  (grupul "product_importer.scrapers"), fără a modifica acest pachet:
+
+    [project.entry-points."product_importer.scrapers"]
+    furnizor = "pachet.modul:FurnizorScraper"
+"""
+import importlib
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+
+ENTRY_POINT_GROUP = 'product_importer.scrapers'
+DEFAULT_SCRAPER = 'generic'
+
+# Modulele scraperelor incluse; importate la prima rutare
+BUILTIN_MODULES = [
+    'scrapers.xdconnects',
+    'scrapers.pfconcept',
+    'scrapers.promobox',
+    'scrapers.andapresent',
+    'scrapers.midocean',
+    'scrapers.sipec',
+    'scrapers.stricker',
+    'scrapers.stamina',
+    'scrapers.utteam',
+    'scrapers.clipper',
+    'scrapers.psi',
+    'scrapers.generic',
+]
+
+_lock = threading.RLock()
+_scrapers = {}      # nume → clasă
+_domains = {}       # domeniu (fără www.) → nume
+_loaded = False
+_load_errors = {}   # modul / entry point → eroare
+
+
+def register(name: str, cls, domains=()):
+    """Înregistrează o clasă de scraper pentru domeniile date."""
+    with _lock:
+        _scrapers[name] = cls
+        for domain in domains:
+            _domains[_normalize_host(domain)] = name
+        _host_lookup.cache_clear()
+
+
+def register_scraper(name: str, *domains: str):
+    """Decorator de clasă: @register_scraper('promobox', 'promobox.com')"""
+    def decorator(cls):
+        cls.SCRAPER_NAME = name
+        cls.DOMAINS = tuple(domains)
+        register(name, cls, domains)
+        return cls
+    return decorator
+
+
+def _normalize_host(host: str) -> str:
+    host = (host or '').strip().lower().rstrip('.')
+    host = host.rsplit('@', 1)[-1].split(':', 1)[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+# ══════════════════════════════════════════
+# ÎNCĂRCARE (built-in + entry points)
+# ══════════════════════════════════════════
+
+def _load_entry_points():
+    try:
+        from importlib.metadata import entry_points
+        eps = entry_points(group=ENTRY_POINT_GROUP)
+    except Exception:
+        return
+    for ep in eps:
+        try:
+            cls = ep.load()
+            # Clasele decorate s-au înregistrat deja la import
+            if ep.name not in _scrapers:
+                register(ep.name, cls, getattr(cls, 'DOMAINS', ()))
+        except Exception as e:
+            _load_errors[f"entry point {ep.name}"] = (
+                f"{type(e).__name__}: {e}"
+            )
+
+
+def ensure_loaded():
+    """Importă o singură dată scraperele incluse și plugin-urile."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        for module in BUILTIN_MODULES:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                _load_errors[module] = f"{type(e).__name__}: {e}"
+        _load_entry_points()
+        _loaded = True
+        _host_lookup.cache_clear()
+
+
+def load_errors() -> dict:
+    return dict(_load_errors)
+
+
+# ══════════════════════════════════════════
+# RUTARE
+# ══════════════════════════════════════════
+
+@lru_cache(maxsize=65536)
+def _host_lookup(host: str) -> str:
+    """Cel mai specific sufix de domeniu înregistrat."""
+    labels = host.split('.')
+    for i in range(len(labels)):
+        name = _domains.get('.'.join(labels[i:]))
+        if name:
+            return name
+    return DEFAULT_SCRAPER
+
+
+def resolve(url: str) -> str:
+    """Numele scraperului pentru un URL (implicit 'generic')."""
+    ensure_loaded()
+    url = (url or '').strip()
+    try:
+        host = urlsplit(url if '//' in url else f"//{url}").netloc
+    except ValueError:
+        return DEFAULT_SCRAPER
+    return _host_lookup(_normalize_host(host))
+
+
+def scraper_class(name: str):
+    """Clasa scraperului; nume necunoscut → generic."""
+    ensure_loaded()
+    cls = _scrapers.get(name) or _scrapers.get(DEFAULT_SCRAPER)
+    if cls is None:
+        raise ImportError(
+            f"Niciun scraper disponibil pentru '{name}': {_load_errors}"
+        )
+    return cls
+
+
+def create(name: str):
+    """Instanță nouă de scraper; nume necunoscut → generic."""
+    return scraper_class(name)()
+
+
+def available() -> dict:
+    """{nume: [domenii]} pentru toate scraperele înregistrate."""
+    ensure_loaded()
+    out = {name: [] for name in _scrapers}
+    for domain, name in _domains.items():
+        out.setdefault(name, []).append(domain)
+    return out
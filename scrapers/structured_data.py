@@ -0,0 +1,340 @@
+# scrapers/structured_data.py
+"""
+Date structurate de produs din HTML-ul brut, fără browser:
+- JSON-LD schema.org (Product / ProductGroup, inclusiv @graph,
+  Offer / AggregateOffer, ImageObject, variante hasVariant)
+- OpenGraph (og:title, og:image, product:price:amount ...), doar
+  dacă pagina declară un produs (og:type product / product:price:*);
+  altfel og:title și og:image sunt titlul și logo-ul de share ale site-ului
+- microdata (itemscope itemtype=".../Product", itemprop=...)
+Rezultatul are cheile lui BaseScraper._build_product (name, sku,
+price, currency, images, description, colors, material, weight)
+plus brand / availability; lipsesc cheile pentru care nu s-a găsit
+nimic. JSON-LD are prioritate, OpenGraph și microdata completează.
+"""
+import re
+import json
+from html import unescape
+
+from utils.helpers import clean_price
+from utils.image_handler import make_absolute_url
+
+
+# Fără ele, pagina tot are nevoie de randare / euristici
+REQUIRED_FIELDS = ('name', 'price', 'images')
+
+PRODUCT_TYPES = {'product', 'productgroup', 'individualproduct',
+                 'productmodel'}
+
+_LD_JSON_RE = re.compile(
+    r'<script[^>]+type\s*=\s*["\']?application/ld\+json["\']?[^>]*>'
+    r'(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+_META_RE = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r'([a-zA-Z:_-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))'
+)
+_MICRODATA_RE = re.compile(
+    r'itemtype\s*=\s*["\']?https?://schema\.org/Product', re.IGNORECASE
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+# ══════════════════════════════════════════
+# VALORI
+# ══════════════════════════════════════════
+
+def _text(value) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@value') or ''
+    if not isinstance(value, (str, int, float)):
+        return ''
+    text = _TAG_RE.sub(' ', unescape(str(value)))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _price(value) -> float:
+    if isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = _text(value)
+    try:
+        # schema.org cere punct zecimal ("1234.50")
+        return float(text)
+    except ValueError:
+        return clean_price(text)
+
+
+def _type_names(node: dict) -> set:
+    types = node.get('@type') or []
+    if isinstance(types, str):
+        types = [types]
+    return {
+        str(t).rsplit('/', 1)[-1].rsplit(':', 1)[-1].lower()
+        for t in types
+    }
+
+
+def _image_urls(value, base_url: str) -> list:
+    if not isinstance(value, list):
+        value = [value]
+    urls = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get('contentUrl') or item.get('url') or ''
+        if isinstance(item, str) and item.strip():
+            url = make_absolute_url(unescape(item.strip()), base_url)
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def _merge(data: dict, found: dict):
+    """Completează doar câmpurile încă lipsă."""
+    for key, value in found.items():
+        if value and not data.get(key):
+            data[key] = value
+
+
+# ══════════════════════════════════════════
+# JSON-LD
+# ══════════════════════════════════════════
+
+def _load_json(raw: str):
+    raw = raw.strip()
+    raw = re.sub(r'^\s*(?://\s*)?<!\[CDATA\[|(?://\s*)?\]\]>\s*$', '',
+                 raw)
+    try:
+        return json.loads(raw, strict=False)
+    except ValueError:
+        # Virgule finale, frecvente în JSON-LD scris de mână
+        try:
+            return json.loads(re.sub(r',\s*([\]}])', r'\1', raw),
+                              strict=False)
+        except ValueError:
+            return None
+
+
+def _walk(node):
+    """Toate obiectele dict dintr-un document JSON-LD."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            yield node
+            for key in ('@graph', 'mainEntity'):
+                if key in node:
+                    stack.append(node[key])
+
+
+def _offer_fields(offers) -> dict:
+    if isinstance(offers, dict):
+        offers = [offers]
+    if not isinstance(offers, list):
+        return {}
+    for offer in offers:
+        if not isinstance(offer, dict):
+            continue
+        spec = offer.get('priceSpecification') or {}
+        if isinstance(spec, list):
+            spec = spec[0] if spec else {}
+        price = _price(
+            offer.get('price') or offer.get('lowPrice')
+            or (spec.get('price') if isinstance(spec, dict) else None)
+        )
+        if price <= 0:
+            continue
+        currency = _text(
+            offer.get('priceCurrency')
+            or (spec.get('priceCurrency') if isinstance(spec, dict)
+                else '')
+        ).upper()
+        availability = _text(offer.get('availability'))
+        return {
+            'price': price,
+            'currency': currency,
+            'availability': availability.rsplit('/', 1)[-1],
+        }
+    return {}
+
+
+def _product_fields(node: dict, base_url: str) -> dict:
+    found = {
+        'name': _text(node.get('name')),
+        'sku': _text(
+            node.get('sku') or node.get('mpn')
+            or node.get('productID') or node.get('productGroupID')
+        ),
+        'description': _text(node.get('description')),
+        'images': _image_urls(node.get('image'), base_url),
+        'brand': _text(node.get('brand')),
+        'material': _text(node.get('material')),
+        'colors': [],
+    }
+    color = _text(node.get('color'))
+    if color:
+        found['colors'].append(color)
+    weight = node.get('weight')
+    if isinstance(weight, dict):
+        weight = ' '.join(
+            _text(weight.get(k)) for k in ('value', 'unitText', 'unitCode')
+            if weight.get(k)
+        )
+    found['weight'] = _text(weight)
+    found.update(_offer_fields(node.get('offers')))
+
+    # ProductGroup: prețul / culorile stau pe variante
+    variants = node.get('hasVariant') or []
+    if isinstance(variants, dict):
+        variants = [variants]
+    for variant in variants:
+        if not isinstance(variant, dict):
+            continue
+        color = _text(variant.get('color'))
+        if color and color not in found['colors']:
+            found['colors'].append(color)
+        if not found.get('price'):
+            found.update(_offer_fields(variant.get('offers')))
+        if not found['images']:
+            found['images'] = _image_urls(variant.get('image'), base_url)
+    return found
+
+
+def from_json_ld(html: str, base_url: str = '') -> dict:
+    data = {}
+    for raw in _LD_JSON_RE.findall(html):
+        document = _load_json(raw)
+        if document is None:
+            continue
+        for node in _walk(document):
+            if _type_names(node) & PRODUCT_TYPES:
+                _merge(data, _product_fields(node, base_url))
+    return data
+
+
+# ══════════════════════════════════════════
+# OPENGRAPH
+# ══════════════════════════════════════════
+
+def _declares_product(meta: dict) -> bool:
+    return (
+        meta.get('og:type', '').lower().startswith('product')
+        or any(key.startswith(('product:price:', 'og:price:'))
+               for key in meta)
+    )
+
+
+def from_open_graph(html: str, base_url: str = '') -> dict:
+    """Câmpurile OpenGraph; {} dacă pagina nu declară un produs."""
+    meta = {}
+    images = []
+    for tag in _META_RE.findall(html):
+        attrs = {
+            m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ''
+            for m in _ATTR_RE.finditer(tag)
+        }
+        key = (attrs.get('property') or attrs.get('name') or '').lower()
+        content = unescape(attrs.get('content', '')).strip()
+        if not key or not content:
+            continue
+        if key in ('og:image', 'og:image:url', 'og:image:secure_url'):
+            url = make_absolute_url(content, base_url)
+            if url not in images:
+                images.append(url)
+        else:
+            meta.setdefault(key, content)
+
+    if not _declares_product(meta):
+        return {}
+    return {
+        'name': meta.get('og:title', ''),
+        'description': meta.get('og:description', ''),
+        'images': images,
+        'price': _price(
+            meta.get('product:price:amount')
+            or meta.get('og:price:amount') or ''
+        ),
+        'currency': (
+            meta.get('product:price:currency')
+            or meta.get('og:price:currency') or ''
+        ).upper(),
+        'sku': meta.get('product:retailer_item_id', ''),
+        'brand': meta.get('product:brand', ''),
+        'availability': meta.get('product:availability', ''),
+    }
+
+
+# ══════════════════════════════════════════
+# MICRODATA
+# ══════════════════════════════════════════
+
+def _itemprop_value(el) -> str:
+    for attr in ('content', 'src', 'data-src', 'href'):
+        if el.get(attr):
+            return el[attr].strip()
+    return el.get_text(' ', strip=True)
+
+
+def from_microdata(soup, base_url: str = '') -> dict:
+    scope = soup.select_one('[itemscope][itemtype*="schema.org/Product"]')
+    if scope is None:
+        return {}
+    props = {}
+    images = []
+    for el in scope.select('[itemprop]'):
+        for prop in el['itemprop'].split():
+            if prop == 'image':
+                url = make_absolute_url(_itemprop_value(el), base_url)
+                if url and url not in images:
+                    images.append(url)
+            elif prop not in props:
+                props[prop] = _itemprop_value(el)
+    return {
+        'name': props.get('name', ''),
+        'sku': props.get('sku') or props.get('mpn', ''),
+        'description': props.get('description', ''),
+        'images': images,
+        'price': _price(props.get('price') or props.get('lowPrice', '')),
+        'currency': props.get('priceCurrency', '').upper(),
+        'availability': props.get('availability', '').rsplit('/', 1)[-1],
+        'brand': props.get('brand', ''),
+        'colors': [props['color']] if props.get('color') else [],
+    }
+
+
+# ══════════════════════════════════════════
+# API
+# ══════════════════════════════════════════
+
+def extract_structured(html: str, base_url: str = '', soup=None) -> dict:
+    """
+    Câmpurile de produs din JSON-LD, apoi OpenGraph, apoi microdata.
+    soup (opțional): BeautifulSoup-ul deja construit al paginii;
+    fără el, microdata se parsează doar dacă pagina o declară.
+    """
+    if not html:
+        return {}
+    data = from_json_ld(html, base_url)
+    if not is_complete(data):
+        _merge(data, from_open_graph(html, base_url))
+    if not is_complete(data) and _MICRODATA_RE.search(html):
+        if soup is None:
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(html, 'html.parser')
+        _merge(data, from_microdata(soup, base_url))
+    return data
+
+
+def is_complete(data: dict) -> bool:
+    """
+    Nume, preț și imagini. BaseScraper.http_page_complete cere în plus
+    câmpurile HTTP_FIRST_FIELDS ale scraperului înainte de a sări
+    peste browser.
+    """
+    return all(data.get(field) for field in REQUIRED_FIELDS)
@@ -0,0 +1,168 @@
+# scrapers/tab_selectors.py
+"""
+Memorie per domeniu pentru tab-urile de descriere/specificații.
+- Un singur execute_script găsește și apasă tab-urile în pagină
+- Se reține ce selectori au afișat conținut nou pe fiecare domeniu
+- Paginile următoare de pe același domeniu apasă doar selectorii buni
+"""
+import os
+import json
+import tempfile
+import threading
+
+from utils.helpers import get_cache_dir
+
+
+TAB_SELECTORS = [
+    # Tab-uri comune
+    "a[href*='description']",
+    "a[href*='specification']",
+    "a[href*='details']",
+    "a[href*='features']",
+    "a[href*='info']",
+    "button[data-target*='description']",
+    "button[data-target*='specification']",
+    "button[data-target*='details']",
+    # Tab-uri cu text
+    "[class*='tab'] a",
+    "[class*='tab'] button",
+    "[role='tab']",
+    ".nav-tabs a",
+    ".nav-tabs li a",
+    ".tab-nav a",
+    # Accordion
+    "[class*='accordion'] button",
+    "[class*='accordion'] a",
+    "[class*='collapse'] button",
+    "details summary",
+]
+
+TAB_KEYWORDS = [
+    'descri', 'specifi', 'detail', 'feature', 'info', 'propert',
+    'about', 'overview', 'caracterist', 'detalii',
+]
+
+# Găsește și apasă tab-urile într-un singur round-trip.
+# Link-urile către alte pagini sunt ignorate (ar naviga în altă parte).
+# Returnează [{selector, clicked, revealed}] - revealed = caractere
+# de text vizibil apărute după click.
+CLICK_TABS_JS = r"""
+const selectors = arguments[0];
+const keywords = arguments[1];
+const textLen = () => (document.body && document.body.innerText || '').length;
+const samePage = (el) => {
+  if (el.tagName !== 'A') return true;
+  const href = (el.getAttribute('href') || '').trim();
+  if (!href || href.startsWith('#') || href.startsWith('javascript')) return true;
+  return el.pathname === location.pathname && el.host === location.host;
+};
+const visible = (el) => {
+  const r = el.getBoundingClientRect();
+  if (!r.width && !r.height) return false;
+  const s = getComputedStyle(el);
+  return s.visibility !== 'hidden' && s.display !== 'none';
+};
+const clicked = new Set();
+const out = [];
+for (const sel of selectors) {
+  let els;
+  try { els = document.querySelectorAll(sel); } catch (e) { continue; }
+  let n = 0, revealed = 0;
+  for (const el of els) {
+    if (clicked.has(el)) continue;
+    const t = (el.innerText || el.textContent || '').toLowerCase().trim();
+    if (!t || t.length > 80 || !keywords.some(k => t.includes(k))) continue;
+    if (!samePage(el) || !visible(el)) continue;
+    const before = textLen();
+    try { el.click(); } catch (e) { continue; }
+    clicked.add(el);
+    n++;
+    revealed += Math.max(0, textLen() - before);
+  }
+  if (n) out.push({selector: sel, clicked: n, revealed: revealed});
+}
+return out;
+"""
+
+
+class TabSelectorStore:
+    """Statistici hit/miss per (domeniu, selector), salvate pe disc."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(
+            get_cache_dir('scrapers'), 'tab_selectors.json'
+        )
+        self._lock = threading.Lock()
+        self.domains = {}
+        self.load()
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.domains = json.load(f)
+            return True
+        except (OSError, ValueError):
+            self.domains = {}
+            return False
+
+    def save(self):
+        """Scriere atomică (fișier temporar + rename)."""
+        folder = os.path.dirname(self.path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.domains, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    def known_good(self, domain: str) -> list:
+        """Selectorii care au afișat conținut pe domeniu, după hit-uri."""
+        stats = self.domains.get(domain) or {}
+        good = [
+            (s['hits'], sel) for sel, s in stats.items()
+            if s.get('hits', 0) > 0
+        ]
+        return [sel for _, sel in sorted(good, key=lambda x: -x[0])]
+
+    def selectors_for(self, domain: str) -> list:
+        return self.known_good(domain) or list(TAB_SELECTORS)
+
+    def learn(self, domain: str, results: list):
+        """results: ieșirea CLICK_TABS_JS pentru o pagină."""
+        if not domain or not results:
+            return
+        with self._lock:
+            stats = self.domains.setdefault(domain, {})
+            for item in results:
+                sel = item.get('selector')
+                if not sel:
+                    continue
+                s = stats.setdefault(sel, {'hits': 0, 'misses': 0})
+                if item.get('revealed', 0) > 0:
+                    s['hits'] += 1
+                else:
+                    s['misses'] += 1
+            try:
+                self.save()
+            except OSError:
+                pass
+
+    def forget(self, domain: str):
+        with self._lock:
+            if self.domains.pop(domain, None) is not None:
+                try:
+                    self.save()
+                except OSError:
+                    pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> TabSelectorStore:
+    """Instanță comună per proces."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TabSelectorStore()
+        return _store
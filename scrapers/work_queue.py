@@ -0,0 +1,456 @@
+# scrapers/work_queue.py
+"""
+Coadă durabilă de sarcini de scraping (URL + numele scraperului),
+pentru workeri în alte procese sau pe alte mașini (scrapers.worker).
+- Lease cu timeout de vizibilitate: o sarcină luată de un worker
+  redevine disponibilă dacă lease-ul expiră (worker oprit / blocat);
+  heartbeat() îl prelungește cât timp scrape() rulează
+- Token de lease la fiecare preluare: un worker întârziat nu mai poate
+  raporta rezultatul unei sarcini preluate între timp de altcineva
+- Sharding per domeniu: shard = crc32(domeniu) % NUM_SHARDS; un worker
+  poate servi doar anumite shard-uri (driver cald pe aceleași site-uri)
+  și există o limită de lease-uri simultane per domeniu
+- Reîncercări cu backoff, până la MAX_ATTEMPTS
+- Sarcinile citite sau anulate se șterg automat după PURGE_AFTER
+Backend implicit: SQLite (WAL, BEGIN IMMEDIATE la preluare), sigur cu
+mai multe procese pe aceeași mașină / același disc partajat. Alte
+backend-uri se înregistrează cu register_backend() sau prin entry
+points (grupul "product_importer.queues"):
+
+    [project.entry-points."product_importer.queues"]
+    redis = "pachet.modul:RedisQueue"
+"""
+import os
+import re
+import json
+import time
+import uuid
+import zlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+from utils.helpers import get_cache_dir, get_domain
+
+
+ENTRY_POINT_GROUP = 'product_importer.queues'
+
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Timpul de vizibilitate implicit al unui lease (secunde)
+DEFAULT_LEASE = 300
+MAX_ATTEMPTS = 3
+# Întârzierea reîncercării: RETRY_DELAY * 2^(încercări - 1)
+RETRY_DELAY = 10
+NUM_SHARDS = 16
+# Lease-uri active simultan pe același domeniu (toți workerii)
+PER_DOMAIN = 2
+# Sarcinile citite / anulate se șterg după PURGE_AFTER; verificare la
+# enqueue, cel mult o dată pe PURGE_EVERY
+PURGE_AFTER = 7 * 24 * 3600
+PURGE_EVERY = 3600
+
+
+@dataclass(slots=True)
+class Task:
+    """O sarcină preluată (lease) de un worker."""
+    id: int
+    job_id: str
+    url: str
+    scraper: str
+    domain: str
+    attempts: int
+    token: str
+
+
+def shard_of(domain: str, shards: int = NUM_SHARDS) -> int:
+    return zlib.crc32(domain.encode('utf-8')) % shards
+
+
+def parse_shards(spec: str) -> list | None:
+    """'0-3,7' → [0, 1, 2, 3, 7]; gol → None (toate)."""
+    if not spec:
+        return None
+    shards = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if '-' in part:
+            start, end = part.split('-', 1)
+            shards.update(range(int(start), int(end) + 1))
+        elif part:
+            shards.add(int(part))
+    return sorted(shards)
+
+
+def _pack(products: list) -> bytes:
+    return zlib.compress(
+        json.dumps(products, ensure_ascii=False).encode('utf-8'), 3
+    )
+
+
+def _unpack(blob) -> list:
+    return json.loads(zlib.decompress(blob)) if blob else []
+
+
+class WorkQueue:
+    """
+    Interfața unui backend de coadă. Coordonatorul (scrapers.background)
+    folosește enqueue / collect / counts / cancel; workerii lease /
+    heartbeat / complete / fail.
+    """
+
+    def enqueue(self, job_id: str, tasks: list) -> int:
+        """tasks: [(url, nume scraper)]; returnează numărul adăugat."""
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, shards: list = None,
+              per_domain: int = PER_DOMAIN,
+              lease_seconds: float = DEFAULT_LEASE,
+              prefer_domain: str = '') -> Task | None:
+        raise NotImplementedError
+
+    def heartbeat(self, task: Task,
+                  lease_seconds: float = DEFAULT_LEASE) -> bool:
+        """Prelungește lease-ul; False dacă sarcina nu mai e a noastră."""
+        raise NotImplementedError
+
+    def complete(self, task: Task, products: list,
+                 seconds: float = 0.0) -> bool:
+        raise NotImplementedError
+
+    def fail(self, task: Task, error: str, retry: bool = True) -> bool:
+        raise NotImplementedError
+
+    def collect(self, job_id: str, limit: int = 100) -> list:
+        """Sarcinile terminate încă necitite (apoi marcate citite)."""
+        raise NotImplementedError
+
+    def counts(self, job_id: str = None) -> dict:
+        raise NotImplementedError
+
+    def cancel(self, job_id: str) -> int:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    scraper TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER,
+    not_before REAL DEFAULT 0,
+    lease_owner TEXT, lease_token TEXT, lease_expires REAL,
+    error TEXT, result BLOB, seconds REAL,
+    collected INTEGER DEFAULT 0,
+    created_at REAL, updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_ready
+    ON tasks (status, shard, not_before);
+CREATE INDEX IF NOT EXISTS idx_tasks_domain ON tasks (domain, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_job ON tasks (job_id, collected);
+"""
+
+
+class SQLiteQueue(WorkQueue):
+    """Coada într-un fișier SQLite (mai multe procese, același disc)."""
+
+    def __init__(self, path: str = None,
+                 max_attempts: int = MAX_ATTEMPTS):
+        if path is None:
+            path = os.path.join(get_cache_dir('queue'), 'queue.sqlite')
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        # Tranzacții explicite; așteptăm până la 30 s după alte procese
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _write(self, fn):
+        """fn(cursor) într-o tranzacție BEGIN IMMEDIATE."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(cur)
+            except BaseException:
+                cur.execute('ROLLBACK')
+                raise
+            cur.execute('COMMIT')
+            return result
+
+    # ══════════════════════════════════════════
+    # COORDONATOR
+    # ══════════════════════════════════════════
+
+    def enqueue(self, job_id: str, tasks: list) -> int:
+        now = time.time()
+        rows = []
+        for url, scraper in tasks:
+            domain = get_domain(url)
+            rows.append((
+                job_id, url, scraper, domain, shard_of(domain), QUEUED,
+                self.max_attempts, now, now,
+            ))
+
+        def insert(cur):
+            cur.executemany(
+                "INSERT INTO tasks (job_id, url, scraper, domain, shard, "
+                "status, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return len(rows)
+        added = self._write(insert)
+        if now - self._last_purge >= PURGE_EVERY:
+            self._last_purge = now
+            self.purge()
+        return added
+
+    def collect(self, job_id: str, limit: int = 100) -> list:
+        def take(cur):
+            rows = cur.execute(
+                "SELECT id, url, scraper, status, result, error, seconds "
+                "FROM tasks WHERE job_id = ? AND collected = 0 "
+                "AND status IN (?, ?) ORDER BY id LIMIT ?",
+                (job_id, DONE, FAILED, limit),
+            ).fetchall()
+            cur.executemany(
+                "UPDATE tasks SET collected = 1, result = NULL "
+                "WHERE id = ?",
+                [(row[0],) for row in rows],
+            )
+            return rows
+        return [
+            {
+                'id': task_id, 'url': url, 'scraper': scraper,
+                'status': status, 'products': _unpack(result),
+                'error': error, 'seconds': seconds or 0.0,
+            }
+            for task_id, url, scraper, status, result, error, seconds
+            in self._write(take)
+        ]
+
+    def counts(self, job_id: str = None) -> dict:
+        sql = "SELECT status, COUNT(*) FROM tasks"
+        args = ()
+        if job_id:
+            sql += " WHERE job_id = ?"
+            args = (job_id,)
+        with self._lock:
+            rows = self._conn.execute(
+                sql + " GROUP BY status", args
+            ).fetchall()
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0, CANCELLED: 0}
+        counts.update(rows)
+        return counts
+
+    def cancel(self, job_id: str) -> int:
+        """Sarcinile încă neluate nu mai pornesc."""
+        def update(cur):
+            cur.execute(
+                "UPDATE tasks SET status = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED),
+            )
+            return cur.rowcount
+        return self._write(update)
+
+    def purge(self, older_than: float = PURGE_AFTER) -> int:
+        """Șterge sarcinile terminate și citite, mai vechi de atât."""
+        def delete(cur):
+            cur.execute(
+                "DELETE FROM tasks WHERE (collected = 1 OR status = ?) "
+                "AND updated_at < ?",
+                (CANCELLED, time.time() - older_than),
+            )
+            return cur.rowcount
+        return self._write(delete)
+
+    # ══════════════════════════════════════════
+    # WORKER
+    # ══════════════════════════════════════════
+
+    def lease(self, worker_id: str, shards: list = None,
+              per_domain: int = PER_DOMAIN,
+              lease_seconds: float = DEFAULT_LEASE,
+              prefer_domain: str = '') -> Task | None:
+        def take(cur):
+            now = time.time()
+            # Lease-uri expirate după ultima încercare → eșuate
+            cur.execute(
+                "UPDATE tasks SET status = ?, error = ?, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? "
+                "AND attempts >= max_attempts",
+                (FAILED, 'Lease expirat după ultima încercare', now,
+                 LEASED, now),
+            )
+            where = (
+                "(status = ? OR (status = ? AND lease_expires < ?)) "
+                "AND not_before <= ?"
+            )
+            args = [QUEUED, LEASED, now, now]
+            if shards is not None:
+                where += (
+                    f" AND shard IN ({', '.join('?' * len(shards))})"
+                )
+                args += list(shards)
+            busy = [
+                row[0] for row in cur.execute(
+                    "SELECT domain FROM tasks WHERE status = ? "
+                    "AND lease_expires >= ? GROUP BY domain "
+                    "HAVING COUNT(*) >= ?",
+                    (LEASED, now, per_domain),
+                )
+            ]
+            if busy:
+                where += (
+                    f" AND domain NOT IN ({', '.join('?' * len(busy))})"
+                )
+                args += busy
+            # Același domeniu ca sarcina anterioară: driverul e deja cald
+            row = cur.execute(
+                f"SELECT id, job_id, url, scraper, domain, attempts "
+                f"FROM tasks WHERE {where} "
+                f"ORDER BY domain = ? DESC, id LIMIT 1",
+                (*args, prefer_domain),
+            ).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            cur.execute(
+                "UPDATE tasks SET status = ?, lease_owner = ?, "
+                "lease_token = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (LEASED, worker_id, token, now + lease_seconds, now,
+                 row[0]),
+            )
+            return Task(*row[:5], attempts=row[5] + 1, token=token)
+        return self._write(take)
+
+    def _owned(self, cur, task: Task) -> bool:
+        row = cur.execute(
+            "SELECT status, lease_token FROM tasks WHERE id = ?",
+            (task.id,),
+        ).fetchone()
+        return bool(row) and row[0] == LEASED and row[1] == task.token
+
+    def heartbeat(self, task: Task,
+                  lease_seconds: float = DEFAULT_LEASE) -> bool:
+        def extend(cur):
+            if not self._owned(cur, task):
+                return False
+            cur.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ?",
+                (time.time() + lease_seconds, task.id),
+            )
+            return True
+        return self._write(extend)
+
+    def complete(self, task: Task, products: list,
+                 seconds: float = 0.0) -> bool:
+        def finish(cur):
+            if not self._owned(cur, task):
+                return False
+            cur.execute(
+                "UPDATE tasks SET status = ?, result = ?, seconds = ?, "
+                "error = NULL, lease_token = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (DONE, _pack(products), seconds, time.time(), task.id),
+            )
+            return True
+        return self._write(finish)
+
+    def fail(self, task: Task, error: str, retry: bool = True) -> bool:
+        def finish(cur):
+            if not self._owned(cur, task):
+                return False
+            now = time.time()
+            if retry and task.attempts < self.max_attempts:
+                status = QUEUED
+                not_before = now + RETRY_DELAY * 2 ** (task.attempts - 1)
+            else:
+                status = FAILED
+                not_before = 0
+            cur.execute(
+                "UPDATE tasks SET status = ?, error = ?, not_before = ?, "
+                "lease_token = NULL, updated_at = ? WHERE id = ?",
+                (status, error[:2000], not_before, now, task.id),
+            )
+            return True
+        return self._write(finish)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ══════════════════════════════════════════
+# BACKEND-URI
+# ══════════════════════════════════════════
+
+_backends = {'sqlite': SQLiteQueue}
+
+
+def register_backend(scheme: str, cls):
+    """cls(locație) pentru URL-uri de forma scheme://locație."""
+    _backends[scheme] = cls
+
+
+def _backend(scheme: str):
+    if scheme not in _backends:
+        try:
+            from importlib.metadata import entry_points
+            for ep in entry_points(group=ENTRY_POINT_GROUP):
+                if ep.name == scheme:
+                    register_backend(scheme, ep.load())
+        except Exception:
+            pass
+    if scheme not in _backends:
+        raise ValueError(f"Backend de coadă necunoscut: '{scheme}'")
+    return _backends[scheme]
+
+
+def default_queue_url() -> str:
+    """PRODUCT_IMPORTER_QUEUE sau fișierul SQLite din cache."""
+    return os.environ.get('PRODUCT_IMPORTER_QUEUE') or (
+        'sqlite:///' + os.path.join(get_cache_dir('queue'), 'queue.sqlite')
+    )
+
+
+def redact_url(url: str) -> str:
+    """URL-ul cozii fără utilizator / parolă (pentru afișare)."""
+    return re.sub(r'://[^/@]*@', '://***@', url or '')
+
+
+def open_queue(url: str = None) -> WorkQueue:
+    """
+    'sqlite:///cale/coada.sqlite', o cale simplă (SQLite) sau
+    'schemă://...' pentru un backend înregistrat.
+    """
+    url = url or default_queue_url()
+    if '://' not in url:
+        return SQLiteQueue(url)
+    scheme, location = url.split('://', 1)
+    if scheme == 'sqlite':
+        # sqlite:///cale → /cale; sqlite:////cale (stil SQLAlchemy) → /cale
+        return SQLiteQueue(location[1:] if location.startswith('//')
+                           else location or None)
+    return _backend(scheme)(location)
@@ -0,0 +1,223 @@
+# scrapers/worker.py
+"""
+Worker de scraping pentru modul distribuit: ia sarcini din coadă
+(scrapers.work_queue), rulează scraperul potrivit și trimite produsele
+înapoi. Oricâte procese / mașini pot servi aceeași coadă; fiecare
+worker păstrează câte o instanță de scraper (driver Selenium cald)
+per furnizor.
+
+Rulare:
+    python -m scrapers.worker --queue sqlite:////date/coada.sqlite
+    python -m scrapers.worker --processes 4 --shards 0-7 --idle-exit 60
+    python -m scrapers.worker --plugin pachet.scrapere_extra
+"""
+import os
+import sys
+import time
+import socket
+import signal
+import logging
+import argparse
+import importlib
+import threading
+import multiprocessing
+
+from scrapers import registry
+from scrapers.pipeline import _as_list, _init_worker
+from scrapers.work_queue import (
+    open_queue, parse_shards, DEFAULT_LEASE, PER_DOMAIN,
+)
+from utils import metrics
+
+
+# Pauza dintre interogări când coada e goală
+POLL_SECONDS = 1.0
+
+
+class Worker:
+    """
+    worker = Worker(open_queue())
+    worker.run()          # până la stop() / idle_exit / max_tasks
+    worker.close()
+    """
+
+    def __init__(self, queue, worker_id: str = None, shards: list = None,
+                 per_domain: int = PER_DOMAIN,
+                 lease_seconds: float = DEFAULT_LEASE,
+                 idle_exit: float = None):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.shards = shards
+        self.per_domain = per_domain
+        self.lease_seconds = lease_seconds
+        self.idle_exit = idle_exit
+        self.scrapers = {}
+        self.stats = {'done': 0, 'failed': 0, 'lost': 0}
+        self._stop = threading.Event()
+        self._last_domain = ''
+
+    def stop(self):
+        self._stop.set()
+
+    def _scraper(self, name: str):
+        if name not in self.scrapers:
+            self.scrapers[name] = registry.create(name)
+        return self.scrapers[name]
+
+    def _keep_alive(self, task, done: threading.Event, lost: list):
+        """Prelungește lease-ul cât timp scrape() rulează."""
+        while not done.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(task, self.lease_seconds):
+                lost.append(True)
+                return
+
+    def run_one(self, task):
+        done = threading.Event()
+        lost = []
+        keeper = threading.Thread(
+            target=self._keep_alive, args=(task, done, lost),
+            name=f"lease-{task.id}", daemon=True,
+        )
+        keeper.start()
+        t0 = time.perf_counter()
+        try:
+            with metrics.supplier(task.scraper), metrics.span('scrape'):
+                products = _as_list(
+                    self._scraper(task.scraper).scrape(task.url)
+                )
+            seconds = time.perf_counter() - t0
+            done.set()
+            # Fără produse = pagina s-a încărcat, dar nu e produs:
+            # terminată (coordonatorul o raportează), fără reîncercare
+            ok = self.queue.complete(task, products, seconds)
+            self.stats['done' if products else 'failed'] += 1
+        except Exception as e:
+            done.set()
+            ok = self.queue.fail(task, f"{type(e).__name__}: {e}")
+            self.stats['failed'] += 1
+        keeper.join()
+        if lost or not ok:
+            # Lease-ul a expirat și sarcina a fost preluată de altcineva
+            self.stats['lost'] += 1
+
+    def run(self, max_tasks: int = None) -> int:
+        """Procesează sarcini; returnează câte a procesat."""
+        processed = 0
+        idle_since = time.monotonic()
+        while not self._stop.is_set():
+            if max_tasks is not None and processed >= max_tasks:
+                break
+            task = self.queue.lease(
+                self.worker_id, self.shards, self.per_domain,
+                self.lease_seconds, self._last_domain,
+            )
+            if task is None:
+                if (self.idle_exit is not None
+                        and time.monotonic() - idle_since > self.idle_exit):
+                    break
+                self._stop.wait(POLL_SECONDS)
+                continue
+            self._last_domain = task.domain
+            self.run_one(task)
+            processed += 1
+            idle_since = time.monotonic()
+        return processed
+
+    def close(self):
+        for scraper in self.scrapers.values():
+            try:
+                scraper.close()
+            except Exception:
+                pass
+        self.scrapers = {}
+        self.queue.close()
+
+
+# ══════════════════════════════════════════
+# PROCESE
+# ══════════════════════════════════════════
+
+def _load_plugins(plugins):
+    for module in plugins or []:
+        importlib.import_module(module)
+
+
+def worker_main(queue_url: str = None, shards: list = None,
+                per_domain: int = PER_DOMAIN,
+                lease_seconds: float = DEFAULT_LEASE,
+                idle_exit: float = None, plugins: list = None) -> dict:
+    """Corpul unui proces worker."""
+    _init_worker()
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    _load_plugins(plugins)
+    worker = Worker(
+        open_queue(queue_url), shards=shards, per_domain=per_domain,
+        lease_seconds=lease_seconds, idle_exit=idle_exit,
+    )
+    # SIGTERM: termină sarcina curentă, apoi iese
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.close()
+    return worker.stats
+
+
+def start_local_workers(count: int, queue_url: str = None,
+                        idle_exit: float = 30, **kwargs) -> list:
+    """
+    Pornește `count` procese worker pe mașina curentă (spawn).
+    Ies singure după idle_exit secunde fără sarcini.
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    for _ in range(count):
+        process = context.Process(
+            target=worker_main,
+            kwargs=dict(kwargs, queue_url=queue_url, idle_exit=idle_exit),
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--queue', help="URL-ul cozii (implicit "
+                        "PRODUCT_IMPORTER_QUEUE / cache local)")
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--shards', default='',
+                        help="Doar aceste shard-uri, ex. 0-7,12")
+    parser.add_argument('--per-domain', type=int, default=PER_DOMAIN)
+    parser.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                        help="Timpul de vizibilitate (secunde)")
+    parser.add_argument('--idle-exit', type=float,
+                        help="Iese după atâtea secunde fără sarcini")
+    parser.add_argument('--plugin', action='append', default=[],
+                        help="Modul importat înainte (scrapere extra)")
+    args = parser.parse_args(argv)
+
+    kwargs = dict(
+        queue_url=args.queue, shards=parse_shards(args.shards),
+        per_domain=args.per_domain, lease_seconds=args.lease,
+        idle_exit=args.idle_exit, plugins=args.plugin,
+    )
+    if args.processes <= 1:
+        print(worker_main(**kwargs))
+        return 0
+    processes = start_local_workers(args.processes, **kwargs)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
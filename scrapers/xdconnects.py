@@ -15,12 +15,19 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 
 from scrapers.base_scraper import BaseScraper
+from scrapers.registry import register_scraper
+from scrapers.page_bundle import collect_page_bundle
+from scrapers.structured_data import extract_structured
 from utils.image_handler import make_absolute_url
 from utils.helpers import clean_price
+from utils import metrics
+from utils.page_cache import get_cache as get_page_cache
 
 XD_SCRAPER_VERSION = "2026-02-18-xd-v6.1-stable"
 
 _VALID_VARIANT_RE = re.compile(r"^[P]\d{3}\.\d{2,3}$", re.IGNORECASE)
+# Același pattern, pentru PAGE_BUNDLE_JS
+_VARIANT_JS_PATTERN = r"^[Pp]\d{3}\.\d{2,3}$"
 
 
 def _is_variant_id(v: str) -> bool:
@@ -39,7 +46,13 @@ def _dedupe_keep_order(items: List[str]) -> List[str]:
     return out
 
 
+@register_scraper("xdconnects", "xdconnects.com")
 class XDConnectsScraper(BaseScraper):
+    # Variantele se citesc din browser, pagină cu pagină
+    SPLIT_STAGES = False
+    HTTP_FIRST = False
+    PRODUCT_URL_PATTERN = r"-p\d{3}\.\d{2,3}(?:[/?#]|$)|[?&]variantId="
+
     def __init__(self):
         super().__init__()
         self.name = "xdconnects"
@@ -52,6 +65,13 @@ class XDConnectsScraper(BaseScraper):
     def _dismiss_cookie_banner(self):
         if not self.driver:
             return
+        # Consimțământul e deja în profilul Chrome: fără banner, fără
+        # cele 3 find_element cu implicit wait
+        if not self._has_element(
+            "#CybotCookiebotDialog, #CybotCookiebotDialogBodyUnderlay, "
+            "#onetrust-consent-sdk, .cookie, .cookies"
+        ):
+            return
         for sel in [
             "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll",
             "#CybotCookiebotDialogBodyButtonAccept",
@@ -77,6 +97,25 @@ class XDConnectsScraper(BaseScraper):
         except Exception:
             pass
 
+    @staticmethod
+    def _price_from_text(txt: str) -> float:
+        m = re.search(r"\bPrice\b\s*€\s*(\d{1,6}(?:[\.,]\d{1,2})?)", txt or "", re.IGNORECASE)
+        if not m:
+            m = re.search(r"€\s*(\d{1,6}(?:[\.,]\d{1,2})?)", txt or "")
+        return clean_price(m.group(1)) if m else 0.0
+
+    def extract_price(self, soup) -> float:
+        """Prețul XD apare doar în text ("Price € 1,23")."""
+        return self._price_from_text(soup.get_text(" ", strip=True))
+
+    def prepare(self):
+        self._login_if_needed()
+
+    def _drop_driver(self, error: Exception = None):
+        # Sesiunea de login moare odată cu browserul
+        self._logged_in = False
+        super()._drop_driver(error)
+
     def _login_if_needed(self):
         if self._logged_in:
             return
@@ -213,7 +252,10 @@ class XDConnectsScraper(BaseScraper):
             )
         except Exception:
             return []
+        return self._normalize_variant_options(data)
 
+    @staticmethod
+    def _normalize_variant_options(data) -> List[Dict[str, str]]:
         out: List[Dict[str, str]] = []
         if isinstance(data, list):
             for it in data:
@@ -236,30 +278,67 @@ class XDConnectsScraper(BaseScraper):
     # ---------------------------
     # Single variant scrape
     # ---------------------------
-    def _scrape_one(self, url: str) -> Optional[dict]:
+    def _load_bundle(self, url: str) -> Optional[dict]:
+        """Deschide pagina și ia HTML + text + imagini + variante dintr-un apel."""
+        cache = get_page_cache() if self.use_page_cache else None
+        if cache:
+            bundle = cache.get(url)
+            if bundle:
+                return bundle
+        with metrics.span("driver_get"):
+            self.driver.get(url)
+        metrics.sleep(5)
+        with metrics.span("cookie_banner"):
+            self._dismiss_cookie_banner()
+        with metrics.span("page_bundle"):
+            bundle = collect_page_bundle(
+                self.driver,
+                variant_pattern=_VARIANT_JS_PATTERN,
+                scroll_steps=[0.35, 0.8, 1.0],
+            )
+        if cache and bundle:
+            cache.put(url, bundle["html"], bundle)
+        return bundle
+
+    def _scrape_one(self, url: str, bundle: Optional[dict] = None) -> Optional[dict]:
         if not self.driver:
             return None
 
-        self.driver.get(url)
-        time.sleep(5)
-        self._dismiss_cookie_banner()
+        if bundle is None:
+            bundle = self._load_bundle(url)
 
-        # scroll pt lazy images
-        try:
-            for frac in [0.35, 0.8, 1.0, 0.0]:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight*arguments[0]);", frac)
-                time.sleep(0.7)
-        except Exception:
-            pass
+        if bundle:
+            page_source = bundle["html"]
+            txt = bundle["text"] or ""
+        else:
+            # fallback: scroll pt lazy images + page_source + innerText
+            try:
+                for frac in [0.35, 0.8, 1.0, 0.0]:
+                    with metrics.span("scroll"):
+                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight*arguments[0]);", frac)
+                    metrics.sleep(0.7)
+            except Exception:
+                pass
+            with metrics.span("page_source"):
+                page_source = self.driver.page_source or ""
+            try:
+                txt = (self.driver.execute_script("return document.body.innerText || ''") or "")
+            except Exception:
+                txt = ""
+        self.last_bundle = bundle
+        # Fără bundle, pagina e cea deschisă acum în driver
+        self.driver_on_page = not bundle
 
-        page_source = self.driver.page_source or ""
-        soup = BeautifulSoup(page_source, "html.parser")
+        with metrics.span("parse"):
+            soup = BeautifulSoup(page_source, "html.parser")
+        with metrics.span("structured_data"):
+            data = extract_structured(page_source, url, soup)
 
         # Nume
         h1 = soup.select_one("h1")
         name = h1.get_text(strip=True) if h1 else ""
         if not name:
-            name = "Produs XD Connects"
+            name = data.get("name", "") or "Produs XD Connects"
 
         # SKU (Item no.)
         sku = ""
@@ -270,23 +349,21 @@ class XDConnectsScraper(BaseScraper):
             m = re.search(r"variantId=([A-Z0-9.]+)", url, re.IGNORECASE)
             if m:
                 sku = m.group(1).upper()
+        if not sku:
+            sku = data.get("sku", "")
 
         # Preț (nu te interesează acum, dar îl păstrăm 0)
-        price = 0.0
-        currency = "EUR"
-        try:
-            txt = (self.driver.execute_script("return document.body.innerText || ''") or "")
-            m = re.search(r"\bPrice\b\s*€\s*(\d{1,6}(?:[\.,]\d{1,2})?)", txt, re.IGNORECASE)
-            if not m:
-                m = re.search(r"€\s*(\d{1,6}(?:[\.,]\d{1,2})?)", txt)
-            if m:
-                price = clean_price(m.group(1))
+        price = data.get("price", 0.0)
+        currency = data.get("currency") or "EUR"
+        if not price:
+            price = self._price_from_text(txt)
+            if price:
                 currency = "EUR"
-        except Exception:
-            pass
 
         # Descriere + Specificații (folosim metode robuste din BaseScraper)
         description_html = self.extract_description(soup, page_source)
+        if not description_html and data.get("description"):
+            description_html = f"<p>{data['description']}</p>"
         specifications = self.extract_specifications(soup, page_source)
 
         # Curățăm ce nu vrei
@@ -296,7 +373,6 @@ class XDConnectsScraper(BaseScraper):
         # Culoare (fallback din text, dacă există)
         color = None
         try:
-            txt = (self.driver.execute_script("return document.body.innerText || ''") or "")
             cm = re.search(r"\bColour\b\s*[:\t ]+\s*([^\n\r\t]+)", txt, flags=re.IGNORECASE)
             if cm:
                 color = cm.group(1).strip()
@@ -316,7 +392,10 @@ class XDConnectsScraper(BaseScraper):
                 continue
             if "/product/image/" in src or "xdconnects.com" in src:
                 images.append(make_absolute_url(src, self.base_url))
-        images = _dedupe_keep_order(images)
+        for src in (bundle or {}).get("images") or []:
+            if "/product/image/" in src or "xdconnects.com" in src:
+                images.append(src)
+        images = _dedupe_keep_order(images) or list(data.get("images") or [])
 
         product = self._build_product(
             name=name,
@@ -342,17 +421,21 @@ class XDConnectsScraper(BaseScraper):
         if not self.driver:
             return None
 
+        # open once: HTML + text + variante dintr-un singur bundle
+        bundle = None
         try:
-            # open once, get options
-            self.driver.get(url)
-            time.sleep(5)
-            self._dismiss_cookie_banner()
+            bundle = self._load_bundle(url)
         except Exception:
             pass
 
-        options = self._get_variant_options()
+        if bundle:
+            options = self._normalize_variant_options(bundle["variants"])
+        else:
+            with metrics.span("variant_options"):
+                options = self._get_variant_options()
         if not options:
-            return self._scrape_one(url)
+            # pagina e deja încărcată: refolosim bundle-ul
+            return self._scrape_one(url, bundle)
 
         products: List[dict] = []
         for opt in options:
@@ -360,7 +443,7 @@ class XDConnectsScraper(BaseScraper):
             if not _is_variant_id(vid):
                 continue
             vurl = self._set_variant_in_url(url, vid)
-            p = self._scrape_one(vurl)
+            p = self._scrape_one(vurl, bundle if vurl == url else None)
             if isinstance(p, dict):
                 col = (opt.get("color") or "").strip()
                 if col:
@@ -2,6 +2,6 @@
 from utils.translator import translate_text, translate_html
 from utils.helpers import (
     clean_price, double_price, generate_sku,
-    sanitize_filename, get_domain, match_scraper
+    sanitize_filename, get_domain, match_scraper, get_cache_dir
 )
 from utils.image_handler import download_image, download_images_parallel
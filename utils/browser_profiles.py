@@ -0,0 +1,288 @@
+# utils/browser_profiles.py
+"""
+Profiluri Chrome persistente (user-data-dir), câte unul per furnizor:
+cache-ul HTTP de pe disc (JS, CSS, fonturi, imagini) și cookie-urile
+de consimțământ rămân de la o pagină la alta și de la o rulare la alta.
+- <cache>/chrome-profiles/<furnizor>/<slot>/ — un Chrome ține
+  profilul blocat, deci instanțele simultane ale aceluiași furnizor
+  (tab-uri, procese worker) primesc sloturi diferite; slotul e rezervat
+  cu un flock pe <slot>.lock, eliberat la driver.quit
+- Cache-ul HTTP al unui profil e limitat de Chrome (--disk-cache-size)
+- Curățare periodică (cel mult o dată pe GC_INTERVAL, între procese):
+  profilurile nefolosite de MAX_AGE se șterg; peste MAX_TOTAL_BYTES,
+  profilurile folosite cel mai demult își pierd întâi cache-urile
+  (cookie-urile rămân), apoi sunt șterse cu totul
+Dezactivare: PRODUCT_IMPORTER_CHROME_PROFILES=0.
+"""
+import os
+import time
+import shutil
+import threading
+
+try:
+    import fcntl
+except ImportError:   # Windows: rezervare doar în procesul curent
+    fcntl = None
+
+from utils.helpers import get_cache_dir, sanitize_filename
+
+
+# Cache-ul HTTP al unui profil (--disk-cache-size)
+CACHE_BYTES = 200 * 1024 * 1024
+# Toate profilurile la un loc
+MAX_TOTAL_BYTES = 2 * 1024 * 1024 * 1024
+# Profil nefolosit de atât → șters
+MAX_AGE = 14 * 24 * 3600
+GC_INTERVAL = 3600
+# Instanțe simultane ale aceluiași furnizor cu profil propriu
+MAX_SLOTS = 8
+
+# Se pot șterge fără a pierde cookie-uri / storage
+CACHE_DIRS = [
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'GPUCache'),
+    os.path.join('Default', 'Service Worker', 'CacheStorage'),
+    os.path.join('Default', 'Service Worker', 'ScriptCache'),
+    'GrShaderCache',
+    'GraphiteDawnCache',
+    'ShaderCache',
+]
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class Profile:
+    """Un slot rezervat; release() după ce browserul s-a închis."""
+
+    def __init__(self, store, path: str, handle):
+        self.store = store
+        self.path = path
+        self._handle = handle
+
+    def apply(self, options):
+        """Opțiunile Chrome care folosesc profilul."""
+        options.add_argument(f'--user-data-dir={self.path}')
+        options.add_argument(f'--disk-cache-size={self.store.cache_bytes}')
+        return options
+
+    def release(self):
+        if self._handle is not None:
+            self.store._unlock(self.path, self._handle)
+            self._handle = None
+
+
+class ProfileStore:
+    """
+    store = ProfileStore()
+    profile = store.acquire('psi')     # None: toate sloturile ocupate
+    profile.apply(options)
+    ...
+    profile.release()                  # după driver.quit()
+    """
+
+    def __init__(self, folder: str = None,
+                 cache_bytes: int = CACHE_BYTES,
+                 max_total_bytes: int = MAX_TOTAL_BYTES,
+                 max_age: float = MAX_AGE,
+                 gc_interval: float = GC_INTERVAL):
+        self.folder = folder or get_cache_dir('chrome-profiles')
+        os.makedirs(self.folder, exist_ok=True)
+        self.cache_bytes = cache_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_age = max_age
+        self.gc_interval = gc_interval
+        self._held = set()
+        self._lock = threading.Lock()
+
+    # ══════════════════════════════════════════
+    # REZERVARE
+    # ══════════════════════════════════════════
+
+    def _lock_path(self, path: str) -> str:
+        return path + '.lock'
+
+    def _try_lock(self, path: str):
+        """Handle-ul rezervării sau None dacă slotul e ocupat."""
+        with self._lock:
+            if path in self._held:
+                return None
+            handle = True
+            if fcntl is not None:
+                try:
+                    handle = open(self._lock_path(path), 'a+')
+                except OSError:
+                    return None
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    handle.close()
+                    return None
+            self._held.add(path)
+            return handle
+
+    def _unlock(self, path: str, handle, touch: bool = True):
+        # mtime-ul fișierului .lock = ultima folosire (pentru curățare)
+        if touch:
+            try:
+                os.utime(self._lock_path(path))
+            except OSError:
+                pass
+        with self._lock:
+            self._held.discard(path)
+            if fcntl is not None:
+                handle.close()
+
+    def acquire(self, name: str) -> Profile | None:
+        """Primul slot liber al furnizorului (creat la nevoie)."""
+        self.maybe_gc()
+        base = os.path.join(self.folder, sanitize_filename(name) or 'default')
+        try:
+            os.makedirs(base, exist_ok=True)
+        except OSError:
+            return None
+        for slot in range(MAX_SLOTS):
+            path = os.path.join(base, str(slot))
+            handle = self._try_lock(path)
+            if handle is None:
+                continue
+            os.makedirs(path, exist_ok=True)
+            return Profile(self, path, handle)
+        return None
+
+    # ══════════════════════════════════════════
+    # CURĂȚARE
+    # ══════════════════════════════════════════
+
+    def profiles(self) -> list:
+        """Căile tuturor profilurilor, cu ultima folosire."""
+        found = []
+        try:
+            suppliers = os.listdir(self.folder)
+        except OSError:
+            return found
+        for supplier in suppliers:
+            base = os.path.join(self.folder, supplier)
+            if not os.path.isdir(base):
+                continue
+            for slot in os.listdir(base):
+                path = os.path.join(base, slot)
+                if not os.path.isdir(path):
+                    continue
+                try:
+                    used = os.path.getmtime(self._lock_path(path))
+                except OSError:
+                    # Slot creat, dar niciodată eliberat (proces oprit)
+                    used = 0.0
+                found.append((used, path))
+        return sorted(found)
+
+    def maybe_gc(self):
+        """gc() dacă ultima curățare (orice proces) e mai veche de interval."""
+        stamp = os.path.join(self.folder, '.gc')
+        try:
+            if time.time() - os.path.getmtime(stamp) < self.gc_interval:
+                return
+        except OSError:
+            pass
+        try:
+            with open(stamp, 'a'):
+                os.utime(stamp)
+        except OSError:
+            return
+        self.gc()
+
+    def _remove(self, path: str):
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.remove(self._lock_path(path))
+        except OSError:
+            pass
+
+    def gc(self) -> dict:
+        """
+        Șterge profilurile expirate, apoi aduce totalul sub
+        max_total_bytes. Profilurile în folosință nu sunt atinse.
+        """
+        report = {'removed': 0, 'trimmed': 0, 'bytes': 0}
+        now = time.time()
+        sizes = []
+        for used, path in self.profiles():
+            handle = self._try_lock(path)
+            if handle is not None and now - used > self.max_age:
+                self._remove(path)
+                self._unlock(path, handle, touch=False)
+                report['removed'] += 1
+                continue
+            sizes.append([used, path, _dir_size(path), handle])
+
+        total = sum(size for _, _, size, _ in sizes)
+        # Întâi cache-urile, apoi profilurile întregi (cele vechi primele)
+        for trim_only in (True, False):
+            for entry in sizes:
+                if total <= self.max_total_bytes:
+                    break
+                used, path, size, handle = entry
+                if handle is None or size == 0:
+                    continue
+                if trim_only:
+                    for cache in CACHE_DIRS:
+                        shutil.rmtree(os.path.join(path, cache),
+                                      ignore_errors=True)
+                    entry[2] = _dir_size(path)
+                    if entry[2] < size:
+                        report['trimmed'] += 1
+                else:
+                    self._remove(path)
+                    entry[2] = 0
+                    report['removed'] += 1
+                total -= size - entry[2]
+
+        for _, path, _, handle in sizes:
+            if handle is not None:
+                self._unlock(path, handle, touch=False)
+        report['bytes'] = total
+        return report
+
+    def clear(self) -> int:
+        """Șterge toate profilurile libere (ex. după o problemă de login)."""
+        removed = 0
+        for _, path in self.profiles():
+            handle = self._try_lock(path)
+            if handle is None:
+                continue
+            self._remove(path)
+            self._unlock(path, handle, touch=False)
+            removed += 1
+        return removed
+
+    def total_bytes(self) -> int:
+        return sum(_dir_size(path) for _, path in self.profiles())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get('PRODUCT_IMPORTER_CHROME_PROFILES', '1') != '0'
+
+
+def get_store() -> ProfileStore | None:
+    """Instanță comună per proces; None dacă profilurile sunt dezactivate."""
+    global _store
+    if not enabled():
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore()
+        return _store
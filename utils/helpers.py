@@ -70,6 +70,21 @@ def generate_sku(source_sku: str, url: str = "") -> str:
     return f"IMP-{hashlib.md5(os.urandom(8)).hexdigest()[:8].upper()}"
 
 
+def get_cache_dir(name: str = "") -> str:
+    """
+    Director persistent pentru cache-uri (categorii, pagini etc.).
+    Implicit ~/.cache/product-importer, suprascris prin
+    variabila de mediu PRODUCT_IMPORTER_CACHE.
+    """
+    root = os.environ.get(
+        'PRODUCT_IMPORTER_CACHE',
+        os.path.join(os.path.expanduser('~'), '.cache', 'product-importer'),
+    )
+    path = os.path.join(root, name) if name else root
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
 def sanitize_filename(name: str) -> str:
     """Curăță un string pentru a fi folosit ca nume de fișier."""
     name = re.sub(r'[^\w\s\-.]', '', name)
@@ -80,29 +95,11 @@ def sanitize_filename(name: str) -> str:
 def match_scraper(url: str) -> str:
     """
     Determină care scraper să fie folosit pe baza URL-ului.
-    Returnează numele scraperului.
+    Returnează numele scraperului (registrul din scrapers.registry,
+    cu hartă de sufixe de domeniu și cache per host).
     """
-    domain = get_domain(url)
-
-    scraper_map = {
-        'xdconnects.com': 'xdconnects',
-        'pfconcept.com': 'pfconcept',
-        'promobox.com': 'promobox',
-        'andapresent.com': 'andapresent',
-        'midocean.com': 'midocean',
-        'sipec.com': 'sipec',
-        'stricker-europe.com': 'stricker',
-        'stamina-shop.eu': 'stamina',
-        'utteam.com': 'utteam',
-        'clipperinterall.com': 'clipper',
-        'psiproductfinder.de': 'psi',
-    }
-
-    for key, value in scraper_map.items():
-        if key in domain:
-            return value
-
-    return 'generic'
+    from scrapers.registry import resolve
+    return resolve(url)
 
 
 def format_product_for_display(product: dict) -> dict:
@@ -4,7 +4,6 @@ Handler pentru descărcare și procesare imagini.
 """
 import os
 import io
-import time
 import base64
 import hashlib
 import requests
@@ -12,6 +11,8 @@ from PIL import Image
 from urllib.parse import urljoin, urlparse
 import streamlit as st
 
+from utils import metrics
+
 
 def download_image(url: str, timeout: int = 30) -> dict | None:
     """
@@ -30,10 +31,10 @@ def download_image(url: str, timeout: int = 30) -> dict | None:
             'Accept': 'image/*, */*',
         }
 
-        response = requests.get(url, headers=headers, timeout=timeout, stream=True)
-        response.raise_for_status()
-
-        content = response.content
+        with metrics.span('image_download'):
+            response = requests.get(url, headers=headers, timeout=timeout, stream=True)
+            response.raise_for_status()
+            content = response.content
         content_type = response.headers.get('Content-Type', '')
 
         # Determinăm extensia
@@ -84,7 +85,7 @@ def download_images_parallel(urls: list, max_images: int = 10) -> list:
             results.append(result)
 
         if i < len(urls) - 1:
-            time.sleep(0.5)  # delay între descărcări
+            metrics.sleep(0.5)  # delay între descărcări
 
     return results
 
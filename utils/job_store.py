@@ -0,0 +1,215 @@
+# utils/job_store.py
+"""
+Starea joburilor de fundal (extragere) într-un SQLite comun tuturor
+sesiunilor Streamlit din proces.
+- jobs: progres, stare, ultimul URL, metrici (JSON), cerere de oprire
+- events: rezultatele incrementale (produs extras, avertisment,
+  eroare), citite de pagină după `seq`
+Jobul scrie, paginile doar citesc: oricâte tab-uri / utilizatori pot
+urmări același job, iar un refresh nu îl oprește.
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+from utils.helpers import get_cache_dir
+
+
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+INTERRUPTED = 'interrupted'
+FINISHED = (DONE, FAILED, CANCELLED, INTERRUPTED)
+
+# Un job „running” neactualizat de atâta timp la pornirea procesului
+# aparține unui proces oprit
+STALE_AFTER = 120
+# Joburile (și evenimentele lor) mai vechi de atât se șterg
+JOB_MAX_AGE = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER, done INTEGER, ok INTEGER, failed INTEGER,
+    current_url TEXT, message TEXT,
+    store_path TEXT, params TEXT, metrics TEXT,
+    cancel INTEGER DEFAULT 0,
+    created_at REAL, updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    level TEXT, position INTEGER, text TEXT, detail TEXT,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_events_job ON events (job_id, seq);
+"""
+
+_JOB_FIELDS = (
+    'status', 'total', 'done', 'ok', 'failed', 'current_url',
+    'message', 'metrics',
+)
+
+
+class JobStore:
+    """Joburile și evenimentele lor, într-un fișier SQLite."""
+
+    def __init__(self, path: str = None):
+        if path is None:
+            path = os.path.join(get_cache_dir('jobs'), 'jobs.sqlite')
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._expire()
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, message = ? "
+                "WHERE status = ? AND updated_at < ?",
+                (INTERRUPTED, 'Procesul s-a oprit', RUNNING,
+                 now - STALE_AFTER),
+            )
+            old = [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE created_at < ?",
+                (now - JOB_MAX_AGE,),
+            )]
+            for job_id in old:
+                self._conn.execute(
+                    "DELETE FROM events WHERE job_id = ?", (job_id,)
+                )
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE id = ?", (job_id,)
+                )
+            self._conn.commit()
+
+    # ══════════════════════════════════════════
+    # SCRIERE (jobul)
+    # ══════════════════════════════════════════
+
+    def create(self, kind: str, total: int, store_path: str = '',
+               params: dict = None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, total, done, ok, "
+                "failed, current_url, message, store_path, params, "
+                "metrics, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 0, 0, 0, '', '', ?, ?, '[]', ?, ?)",
+                (job_id, kind, RUNNING, total, store_path,
+                 json.dumps(params or {}), now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        """Câmpuri din _JOB_FIELDS; updated_at ține loc de heartbeat."""
+        if 'metrics' in fields and not isinstance(fields['metrics'], str):
+            fields['metrics'] = json.dumps(fields['metrics'])
+        columns = [c for c in fields if c in _JOB_FIELDS]
+        assignments = ''.join(f"{c} = ?, " for c in columns)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments}updated_at = ? "
+                f"WHERE id = ?",
+                (*(fields[c] for c in columns), time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def add_event(self, job_id: str, level: str, text: str,
+                  position: int = None, detail: str = ''):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO events (job_id, level, position, text, "
+                "detail, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, level, position, text, detail, time.time()),
+            )
+            self._conn.commit()
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cancel FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    # ══════════════════════════════════════════
+    # CITIRE (paginile)
+    # ══════════════════════════════════════════
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params'] or '{}')
+        job['metrics'] = json.loads(job['metrics'] or '[]')
+        return job
+
+    def events(self, job_id: str, after: int = 0,
+               limit: int = 200) -> list:
+        """Evenimentele cu seq > after, în ordine."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, level, position, text, detail FROM events "
+                "WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, after, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_events(self, job_id: str, limit: int = 50) -> list:
+        """Ultimele `limit` evenimente, în ordine cronologică."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, level, position, text, detail FROM events "
+                "WHERE job_id = ? ORDER BY seq DESC LIMIT ?",
+                (job_id, limit),
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def recent(self, limit: int = 10) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self.get(row[0]) for row in rows]
+
+    def request_cancel(self, job_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET cancel = 1 WHERE id = ?", (job_id,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Instanță comună per proces."""
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = JobStore()
+        return _jobs
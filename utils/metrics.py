@@ -0,0 +1,288 @@
+# utils/metrics.py
+"""
+Instrumentare ușoară pe etape pentru rulările de scraping.
+- span('driver_get') măsoară o etapă (context manager)
+- supplier('promobox') setează furnizorul curent pe thread
+- Agregare p50/p95 per (furnizor, etapă)
+- Export JSON + text Prometheus (metrics.json / metrics.prom)
+
+CLI:
+    python -m utils.metrics            # tabel din ultimul metrics.json
+    python -m utils.metrics --prom     # format Prometheus
+"""
+import os
+import sys
+import json
+import math
+import time
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from utils.helpers import get_cache_dir
+
+
+# Ultimele N durate păstrate per (furnizor, etapă) pentru percentile
+MAX_SAMPLES = 2000
+DEFAULT_SUPPLIER = 'general'
+METRIC_NAME = 'product_importer_stage_seconds'
+
+_local = threading.local()
+
+
+# ══════════════════════════════════════════
+# COLECTOARE
+# ══════════════════════════════════════════
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """Percentilă nearest-rank pe o listă deja sortată."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Collector:
+    """Duratele per (furnizor, etapă); unul per proces + unul per job."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}   # (furnizor, etapă) → deque de durate
+        self._totals = {}    # (furnizor, etapă) → [număr, sumă]
+
+    def record(self, key: tuple, seconds: float):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=MAX_SAMPLES)
+                self._totals[key] = [0, 0.0]
+            samples.append(seconds)
+            self._totals[key][0] += 1
+            self._totals[key][1] += seconds
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+    def summary(self) -> list:
+        """[{supplier, stage, count, total_s, p50_ms, p95_ms, max_ms}]"""
+        with self._lock:
+            items = [
+                (key, sorted(samples), list(self._totals[key]))
+                for key, samples in self._samples.items()
+            ]
+        rows = []
+        for (sup, stage), values, (count, total) in sorted(items):
+            rows.append({
+                'supplier': sup,
+                'stage': stage,
+                'count': count,
+                'total_s': round(total, 3),
+                'p50_ms': round(_percentile(values, 0.50) * 1000, 1),
+                'p95_ms': round(_percentile(values, 0.95) * 1000, 1),
+                'max_ms': round(values[-1] * 1000, 1) if values else 0.0,
+            })
+        return rows
+
+    def snapshot(self) -> dict:
+        return {'generated_at': time.time(), 'stages': self.summary()}
+
+
+# Toate duratele din proces (bara laterală, export)
+_process = Collector()
+
+
+def current_collector() -> Collector | None:
+    """Colectorul jobului care rulează pe thread-ul curent."""
+    return getattr(_local, 'collector', None)
+
+
+@contextmanager
+def collecting(collector: Collector | None):
+    """
+    Span-urile din bloc ajung și în `collector` (pe lângă cel al
+    procesului). Thread-urile pornite de job îl primesc explicit.
+    """
+    previous = current_collector()
+    _local.collector = collector
+    try:
+        yield collector
+    finally:
+        _local.collector = previous
+
+
+def current_supplier() -> str:
+    return getattr(_local, 'supplier', None) or DEFAULT_SUPPLIER
+
+
+@contextmanager
+def supplier(name: str):
+    """Toate span-urile din bloc sunt atribuite furnizorului `name`."""
+    previous = getattr(_local, 'supplier', None)
+    _local.supplier = name
+    try:
+        yield
+    finally:
+        _local.supplier = previous
+
+
+def record(stage: str, seconds: float, supplier_name: str = None):
+    key = (supplier_name or current_supplier(), stage)
+    _process.record(key, seconds)
+    collector = current_collector()
+    if collector is not None:
+        collector.record(key, seconds)
+
+
+@contextmanager
+def span(stage: str, supplier_name: str = None):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - t0, supplier_name)
+
+
+def timed(stage: str, supplier_name: str = None):
+    """Decorator: întreaga funcție e un span."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage, supplier_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def sleep(seconds: float, supplier_name: str = None):
+    """time.sleep contorizat ca etapa 'sleep'."""
+    with span('sleep', supplier_name):
+        time.sleep(seconds)
+
+
+def reset():
+    """Golește colectorul procesului (nu și pe cele ale joburilor)."""
+    _process.reset()
+
+
+# ══════════════════════════════════════════
+# AGREGARE
+# ══════════════════════════════════════════
+
+def summary(collector: Collector = None) -> list:
+    return (collector or _process).summary()
+
+
+def snapshot(collector: Collector = None) -> dict:
+    return (collector or _process).snapshot()
+
+
+def to_prometheus(stages: list = None) -> str:
+    """Text în formatul de expunere Prometheus (tip summary)."""
+    if stages is None:
+        stages = summary()
+    lines = [
+        f"# HELP {METRIC_NAME} Durata etapelor de scraping/import",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+    for row in stages:
+        labels = (
+            f'supplier="{_escape(row["supplier"])}",'
+            f'stage="{_escape(row["stage"])}"'
+        )
+        for q, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms')):
+            lines.append(
+                f'{METRIC_NAME}{{{labels},quantile="{q}"}} '
+                f'{row[key] / 1000:.6f}'
+            )
+        lines.append(f"{METRIC_NAME}_sum{{{labels}}} {row['total_s']:.6f}")
+        lines.append(f"{METRIC_NAME}_count{{{labels}}} {row['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+# ══════════════════════════════════════════
+# PERSISTENȚĂ
+# ══════════════════════════════════════════
+
+def default_dir() -> str:
+    return get_cache_dir('metrics')
+
+
+def _atomic_write(path: str, text: str):
+    folder = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write(folder: str = None, collector: Collector = None) -> str:
+    """
+    Scrie metrics.json și metrics.prom (pentru node_exporter
+    textfile collector). Returnează calea fișierului JSON.
+    collector: doar duratele unui job (implicit tot procesul).
+    """
+    folder = folder or default_dir()
+    os.makedirs(folder, exist_ok=True)
+    data = snapshot(collector)
+    json_path = os.path.join(folder, 'metrics.json')
+    _atomic_write(json_path, json.dumps(data, indent=2))
+    _atomic_write(
+        os.path.join(folder, 'metrics.prom'),
+        to_prometheus(data['stages']),
+    )
+    return json_path
+
+
+def load(path: str = None) -> dict:
+    path = path or os.path.join(default_dir(), 'metrics.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'generated_at': 0, 'stages': []}
+
+
+def format_table(stages: list) -> str:
+    head = (
+        f"{'furnizor':<14}{'etapă':<24}{'n':>6}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}"
+    )
+    lines = [head, '-' * len(head)]
+    for row in stages:
+        lines.append(
+            f"{row['supplier']:<14}{row['stage']:<24}{row['count']:>6}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+            f"{row['total_s']:>10.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Timpi pe etape din ultima rulare"
+    )
+    parser.add_argument('--file', help="Calea către metrics.json")
+    parser.add_argument(
+        '--prom', action='store_true', help="Afișare format Prometheus"
+    )
+    args = parser.parse_args(argv)
+
+    data = load(args.file)
+    if args.prom:
+        sys.stdout.write(to_prometheus(data['stages']))
+    else:
+        print(format_table(data['stages']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
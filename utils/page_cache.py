@@ -0,0 +1,135 @@
+# utils/page_cache.py
+"""
+Cache pe disc pentru paginile de produs deja descărcate.
+- Cheia = URL-ul canonic (utils.url_ingest.canonicalize)
+- Valoarea = bundle-ul paginii (html, text, imagini, variante,
+  specificații), comprimat gzip
+- Expiră după TTL (implicit 6 ore: prețurile și stocul se schimbă)
+O pagină din cache nu mai cere un driver.get / HTTP GET.
+"""
+import os
+import json
+import gzip
+import time
+import hashlib
+import tempfile
+import threading
+
+from utils.helpers import get_cache_dir
+from utils.url_ingest import canonicalize
+
+
+DEFAULT_TTL = 6 * 3600
+
+BUNDLE_DEFAULTS = {
+    'text': '',
+    'images': [],
+    'variants': [],
+    'specs': {},
+    'description_text': '',
+}
+
+
+class PageCache:
+    """Fișiere <sha1>.json.gz, scrise atomic, un subfolder per prefix."""
+
+    def __init__(self, folder: str = None, ttl: int = DEFAULT_TTL):
+        self.folder = folder or get_cache_dir('pages')
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha1(
+            (canonicalize(url) or url).encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self.folder, key[:2], f"{key}.json.gz")
+
+    def _fresh(self, path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(path) < self.ttl
+        except OSError:
+            return False
+
+    def contains(self, url: str) -> bool:
+        """Există o copie nevalidată de TTL? (doar stat, fără citire)"""
+        return self._fresh(self._path(url))
+
+    def get(self, url: str) -> dict | None:
+        """Bundle-ul paginii sau None (lipsă / expirat / corupt)."""
+        path = self._path(url)
+        data = None
+        if self._fresh(path):
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError, EOFError):
+                data = None
+        with self._lock:
+            if data and data.get('html'):
+                self.hits += 1
+            else:
+                self.misses += 1
+                return None
+        for key, value in BUNDLE_DEFAULTS.items():
+            data.setdefault(key, type(value)())
+        data['from_cache'] = True
+        return data
+
+    def put(self, url: str, html: str, bundle: dict = None):
+        """Salvează pagina; bundle (opțional) = rezultatul PAGE_BUNDLE_JS."""
+        if not html:
+            return
+        data = dict(bundle or {})
+        data.pop('from_cache', None)
+        data['html'] = html
+        data.setdefault('url', url)
+        data['cached_at'] = time.time()
+        path = self._path(url)
+        folder = os.path.dirname(path)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=folder, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(json.dumps(data, ensure_ascii=False)
+                            .encode('utf-8'))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def invalidate(self, url: str):
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
+
+    def purge(self, max_age: int = None) -> int:
+        """Șterge fișierele mai vechi de max_age (implicit TTL)."""
+        max_age = self.ttl if max_age is None else max_age
+        now = time.time()
+        removed = 0
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if now - os.path.getmtime(path) >= max_age:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> PageCache:
+    """Instanță comună per proces."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
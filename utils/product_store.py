@@ -0,0 +1,446 @@
+# utils/product_store.py
+"""
+Depozit de produse pe disc (SQLite) în locul listelor de dict-uri
+din st.session_state.
+- Produsul complet (descriere HTML, specificații, imagini) stă
+  comprimat într-o coloană BLOB și se citește doar la nevoie
+- Listele / tabelele folosesc înregistrări compacte (ProductRecord,
+  cu __slots__ și string-uri internate pentru site, monedă, status,
+  culori), citite pagină cu pagină
+- Colecții: 'scraped' (Pasul 1) și 'translated' (Pasul 2)
+- Fiecare sesiune Streamlit are fișierul ei; fișierele vechi se șterg
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import zlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+from utils.helpers import get_cache_dir
+
+
+SCRAPED = 'scraped'
+TRANSLATED = 'translated'
+
+# Fișierele sesiunilor neatinse de atâta timp sunt șterse
+SESSION_MAX_AGE = 7 * 24 * 3600
+
+_COLOR_SEP = '\x1f'
+
+_SUMMARY_COLUMNS = (
+    'name', 'sku', 'final_price', 'original_price', 'currency', 'stock',
+    'status', 'source_site', 'source_url', 'thumbnail', 'colors',
+    'images_count', 'variants_count',
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    name TEXT, sku TEXT,
+    final_price REAL, original_price REAL, currency TEXT,
+    stock INTEGER, status TEXT,
+    source_site TEXT, source_url TEXT, thumbnail TEXT,
+    colors TEXT, images_count INTEGER, variants_count INTEGER,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_collection
+    ON products (collection, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+INSERT OR IGNORE INTO meta VALUES ('version', 0);
+"""
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """Rezumatul unui produs: tot ce trebuie pentru liste și tabele."""
+    id: int
+    name: str
+    sku: str
+    final_price: float
+    original_price: float
+    currency: str
+    stock: int
+    status: str
+    source_site: str
+    source_url: str
+    thumbnail: str
+    colors: tuple
+    images_count: int
+    variants_count: int
+
+
+def _intern(value) -> str:
+    return sys.intern(str(value or ''))
+
+
+def _to_float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_int(value, default: int = 1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _summary(product: dict) -> tuple:
+    """Valorile coloanelor _SUMMARY_COLUMNS pentru un produs."""
+    images = product.get('images') or []
+    return (
+        str(product.get('name') or ''),
+        str(product.get('sku') or ''),
+        _to_float(product.get('final_price'), 1.0),
+        _to_float(product.get('original_price')),
+        str(product.get('currency') or 'EUR'),
+        _to_int(product.get('stock')),
+        str(product.get('status') or ''),
+        str(product.get('source_site') or ''),
+        str(product.get('source_url') or ''),
+        str(images[0]) if images else '',
+        _COLOR_SEP.join(str(c) for c in product.get('colors') or []),
+        len(images),
+        len(product.get('color_variants') or []),
+    )
+
+
+def _pack(product: dict) -> bytes:
+    return zlib.compress(
+        json.dumps(product, ensure_ascii=False, default=str)
+        .encode('utf-8')
+    )
+
+
+def _unpack(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def _record(row) -> ProductRecord:
+    colors = row[11]
+    return ProductRecord(
+        id=row[0],
+        name=row[1],
+        sku=row[2],
+        final_price=row[3],
+        original_price=row[4],
+        currency=_intern(row[5]),
+        stock=row[6],
+        status=_intern(row[7]),
+        source_site=_intern(row[8]),
+        source_url=row[9],
+        thumbnail=row[10],
+        colors=tuple(
+            sys.intern(c) for c in colors.split(_COLOR_SEP)
+        ) if colors else (),
+        images_count=row[12],
+        variants_count=row[13],
+    )
+
+
+def _flatten(products) -> list:
+    """XD Connects întoarce o listă de variante per URL."""
+    out = []
+    for product in products or []:
+        items = product if isinstance(product, list) else [product]
+        out.extend(p for p in items if isinstance(p, dict))
+    return out
+
+
+class ProductStore:
+    """Produsele unei sesiuni, într-un fișier SQLite."""
+
+    def __init__(self, path: str = None):
+        if path is None:
+            folder = get_cache_dir('products')
+            _cleanup_sessions(folder)
+            path = os.path.join(
+                folder, f"session-{uuid.uuid4().hex}.sqlite"
+            )
+        self.path = path
+        self._lock = threading.Lock()
+        # Streamlit rulează fiecare rerun pe alt thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ══════════════════════════════════════════
+    # SCRIERE
+    # ══════════════════════════════════════════
+
+    def _bump(self, cur):
+        cur.execute(
+            "UPDATE meta SET value = value + 1 WHERE key = 'version'"
+        )
+
+    def extend(self, products, collection: str = SCRAPED) -> list:
+        """Adaugă produse (dict sau listă de variante); întoarce id-urile."""
+        ids = []
+        placeholders = ', '.join('?' * (len(_SUMMARY_COLUMNS) + 2))
+        sql = (
+            f"INSERT INTO products (collection, "
+            f"{', '.join(_SUMMARY_COLUMNS)}, data) "
+            f"VALUES ({placeholders})"
+        )
+        with self._lock:
+            cur = self._conn.cursor()
+            for product in _flatten(products):
+                cur.execute(
+                    sql,
+                    (collection, *_summary(product), _pack(product)),
+                )
+                ids.append(cur.lastrowid)
+            if ids:
+                self._bump(cur)
+            self._conn.commit()
+        return ids
+
+    def add(self, product, collection: str = SCRAPED) -> list:
+        return self.extend([product], collection)
+
+    def update(self, product_id: int, **fields):
+        """Modifică câmpuri ale unui produs (nume, preț, SKU ...)."""
+        product = self.get(product_id)
+        if product is None:
+            return
+        product.update(fields)
+        self.replace(product_id, product)
+
+    def update_prices(self, prices: dict):
+        """{id: preț final} - toate într-o singură tranzacție."""
+        self.update_many({
+            product_id: {'final_price': float(price)}
+            for product_id, price in prices.items()
+        })
+
+    def update_many(self, changes: dict):
+        """{id: {câmp: valoare}} - toate într-o singură tranzacție."""
+        if not changes:
+            return
+        ids = list(changes)
+        assignments = ', '.join(f"{c} = ?" for c in _SUMMARY_COLUMNS)
+        with self._lock:
+            cur = self._conn.cursor()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = cur.execute(
+                    f"SELECT id, data FROM products WHERE id IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                updates = []
+                for product_id, blob in rows:
+                    product = _unpack(blob)
+                    product.update(changes[product_id])
+                    updates.append((
+                        *_summary(product), _pack(product), product_id,
+                    ))
+                cur.executemany(
+                    f"UPDATE products SET {assignments}, data = ? "
+                    f"WHERE id = ?",
+                    updates,
+                )
+            self._bump(cur)
+            self._conn.commit()
+
+    def replace(self, product_id: int, product: dict):
+        assignments = ', '.join(f"{c} = ?" for c in _SUMMARY_COLUMNS)
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute(
+                f"UPDATE products SET {assignments}, data = ? "
+                f"WHERE id = ?",
+                (*_summary(product), _pack(product), product_id),
+            )
+            self._bump(cur)
+            self._conn.commit()
+
+    def clear(self, collection: str = None):
+        with self._lock:
+            cur = self._conn.cursor()
+            if collection:
+                cur.execute(
+                    "DELETE FROM products WHERE collection = ?",
+                    (collection,),
+                )
+            else:
+                cur.execute("DELETE FROM products")
+            self._bump(cur)
+            self._conn.commit()
+
+    def copy(self, source: str = SCRAPED, target: str = TRANSLATED):
+        """Înlocuiește colecția target cu o copie a colecției source."""
+        columns = ', '.join(_SUMMARY_COLUMNS)
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute(
+                "DELETE FROM products WHERE collection = ?", (target,)
+            )
+            cur.execute(
+                f"INSERT INTO products (collection, {columns}, data) "
+                f"SELECT ?, {columns}, data FROM products "
+                f"WHERE collection = ? ORDER BY id",
+                (target, source),
+            )
+            self._bump(cur)
+            self._conn.commit()
+
+    # ══════════════════════════════════════════
+    # CITIRE
+    # ══════════════════════════════════════════
+
+    def version(self) -> int:
+        """Crește la fiecare modificare (cheie pentru cache-uri UI)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def count(self, collection: str = SCRAPED) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM products WHERE collection = ?",
+                (collection,),
+            ).fetchone()[0]
+
+    def records(
+        self, collection: str = SCRAPED,
+        offset: int = 0, limit: int = None,
+    ) -> list:
+        """Rezumate (fără BLOB), în ordinea adăugării."""
+        sql = (
+            f"SELECT id, {', '.join(_SUMMARY_COLUMNS)} FROM products "
+            f"WHERE collection = ? ORDER BY id LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                sql, (collection, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [_record(row) for row in rows]
+
+    def search(
+        self, collection: str = SCRAPED,
+        query: str = '', site: str = '',
+        offset: int = 0, limit: int = None,
+    ) -> tuple:
+        """
+        Căutare după nume / SKU / site (LIKE din SQLite: litere mari
+        și mici echivalente doar pentru ASCII) + filtru exact pe site.
+        Returnează (total potriviri, rezumatele paginii).
+        """
+        where = ["collection = ?"]
+        params = [collection]
+        query = (query or '').strip()
+        if query:
+            pattern = '%' + (
+                query.replace('\\', '\\\\')
+                .replace('%', '\\%').replace('_', '\\_')
+            ) + '%'
+            where.append(
+                "(name LIKE ? ESCAPE '\\' OR sku LIKE ? ESCAPE '\\' "
+                "OR source_site LIKE ? ESCAPE '\\')"
+            )
+            params += [pattern] * 3
+        if site:
+            where.append("source_site = ?")
+            params.append(site)
+        condition = ' AND '.join(where)
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM products WHERE {condition}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(_SUMMARY_COLUMNS)} FROM products "
+                f"WHERE {condition} ORDER BY id LIMIT ? OFFSET ?",
+                (*params, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return total, [_record(row) for row in rows]
+
+    def sites(self, collection: str = SCRAPED) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT source_site FROM products "
+                "WHERE collection = ? AND source_site != '' "
+                "ORDER BY source_site",
+                (collection,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, product_id: int) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM products WHERE id = ?", (product_id,)
+            ).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def get_many(self, ids: list) -> list:
+        """Produsele complete, în ordinea id-urilor cerute."""
+        found = {}
+        ids = list(ids)
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM products WHERE id IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update(rows)
+        return [_unpack(found[i]) for i in ids if i in found]
+
+    def iter_products(self, collection: str = SCRAPED):
+        """Produsele complete, unul câte unul (memorie constantă)."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM products "
+                    "WHERE collection = ? AND id > ? ORDER BY id LIMIT 200",
+                    (collection, last_id),
+                ).fetchall()
+            if not rows:
+                return
+            for product_id, blob in rows:
+                yield _unpack(blob)
+            last_id = rows[-1][0]
+
+    def urls(self, collection: str = SCRAPED) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_url FROM products "
+                "WHERE collection = ? AND source_url != ''",
+                (collection,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _cleanup_sessions(folder: str):
+    """Șterge fișierele sesiunilor abandonate."""
+    now = time.time()
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith('session-'):
+            continue
+        path = os.path.join(folder, name)
+        try:
+            if now - os.path.getmtime(path) > SESSION_MAX_AGE:
+                os.remove(path)
+        except OSError:
+            pass
@@ -3,10 +3,11 @@
 Modul de traducere folosind deep-translator (gratuit, fără API key).
 """
 import re
-import time
 import streamlit as st
 from deep_translator import GoogleTranslator
 
+from utils import metrics
+
 
 # Cache pentru traduceri (evită re-traducerea aceluiași text)
 _translation_cache = {}
@@ -38,16 +39,18 @@ def translate_text(text: str, source: str = 'auto', target: str = 'ro') -> str:
             chunks = _split_text(text, 4500)
             translated_chunks = []
             for chunk in chunks:
-                translated = GoogleTranslator(
-                    source=source, target=target
-                ).translate(chunk)
+                with metrics.span('translate_api'):
+                    translated = GoogleTranslator(
+                        source=source, target=target
+                    ).translate(chunk)
                 translated_chunks.append(translated or chunk)
-                time.sleep(0.3)  # rate limiting
+                metrics.sleep(0.3)  # rate limiting
             result = ' '.join(translated_chunks)
         else:
-            result = GoogleTranslator(
-                source=source, target=target
-            ).translate(text)
+            with metrics.span('translate_api'):
+                result = GoogleTranslator(
+                    source=source, target=target
+                ).translate(text)
             if not result:
                 result = text
 
@@ -110,6 +113,7 @@ def _split_text(text: str, max_length: int) -> list:
     return chunks if chunks else [text[:max_length]]
 
 
+@metrics.timed('translate')
 def translate_product_data(product: dict) -> dict:
     """
     Traduce toate câmpurile relevante ale unui produs.
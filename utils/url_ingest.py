@@ -0,0 +1,205 @@
+# utils/url_ingest.py
+"""
+Pregătirea listei de URL-uri înainte de scraping.
+- Canonicalizare: fără parametri UTM / click-id / sesiune, fără
+  fragment, host cu litere mici, segment de limbă normalizat
+- Reguli per furnizor (ex. XD Connects: toate variantId-urile unui
+  produs → un singur scrape, scraperul extrage singur variantele)
+- Deduplicare față de produsele deja extrase și cache-ul de pagini
+- Raport cu numărul de fetch-uri economisite
+"""
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Parametri de tracking (prefix sau nume exact)
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_', 'matomo_')
+TRACKING_PARAMS = {
+    'gclid', 'gbraid', 'wbraid', 'dclid', 'fbclid', 'msclkid', 'yclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'igshid', 'srsltid', 'ref',
+    'referrer', 'campaign', 'trk', 'spm',
+}
+# Identificatori de sesiune (în query sau ca ;param în path)
+SESSION_PARAMS = {
+    'sid', 'sessionid', 'session_id', 'phpsessid', 'jsessionid',
+    'aspsessionid', 'cfid', 'cftoken', 'zenid', 'oscsid', 'sessid',
+}
+
+_LOCALE_RE = re.compile(r'^[a-z]{2}(?:[-_][a-z]{2})?$', re.IGNORECASE)
+_PATH_PARAM_RE = re.compile(
+    r';(?:' + '|'.join(SESSION_PARAMS) + r')=[^/?#]*', re.IGNORECASE
+)
+
+# Reguli per scraper:
+#   locale         - segmentul de limbă impus (parserele caută etichete
+#                    în engleză: "Item no.", "Price", "Colour")
+#   variant_params - parametri care doar aleg varianta; scraperul
+#                    extrage singur toate variantele de pe pagină
+SUPPLIER_RULES = {
+    'xdconnects': {
+        'locale': 'en-gb',
+        'variant_params': ('variantid',),
+    },
+}
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return (
+        name in TRACKING_PARAMS
+        or name in SESSION_PARAMS
+        or name.startswith(TRACKING_PREFIXES)
+    )
+
+
+def canonicalize(url: str, supplier: str = None) -> str | None:
+    """
+    URL-ul de descărcat, în formă canonică.
+    None dacă nu e un URL http(s) valid.
+    """
+    url = (url or '').strip()
+    if not url:
+        return None
+    if url.lower().startswith('www.'):
+        url = f"https://{url}"
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+
+    host = parts.hostname.rstrip('.')
+    if port and not (
+        (scheme == 'http' and port == 80)
+        or (scheme == 'https' and port == 443)
+    ):
+        host = f"{host}:{port}"
+
+    path = _PATH_PARAM_RE.sub('', parts.path)
+    path = re.sub(r'/{2,}', '/', path) or '/'
+
+    rules = SUPPLIER_RULES.get(supplier) or {}
+    segments = path.split('/')
+    if len(segments) > 2 and _LOCALE_RE.match(segments[1]):
+        segments[1] = rules.get('locale') or segments[1].lower()
+        path = '/'.join(segments)
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(k)
+    ]
+    query.sort()
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def product_key(canonical_url: str, supplier: str = None) -> str:
+    """
+    Cheia de deduplicare: fără schemă, fără www., fără slash final
+    și fără parametrii de variantă ai furnizorului.
+    """
+    parts = urlsplit(canonical_url)
+    host = parts.netloc
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/') or '/'
+    variant_params = (SUPPLIER_RULES.get(supplier) or {}).get(
+        'variant_params', ()
+    )
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in variant_params
+    ]
+    key = f"{host}{path}"
+    if query:
+        key += f"?{urlencode(query)}"
+    return key
+
+
+def ingest(
+    urls: list,
+    known_urls: list = None,
+    page_cache=None,
+) -> dict:
+    """
+    Canonicalizează și deduplică o listă brută de URL-uri.
+    known_urls: URL-uri deja extrase (sar peste ele)
+    page_cache: utils.page_cache.PageCache - numără paginile servite
+                din cache (rămân în listă, dar fără fetch)
+
+    Returnează:
+        urls              - URL-urile de extras, în ordinea de intrare
+        suppliers         - {scraper: nr. URL-uri}
+        groups            - {url: [URL-uri originale grupate]} (>1)
+        invalid           - intrări care nu sunt URL-uri
+        total, duplicates, variants_grouped, already_scraped, cached
+        fetches_saved     - fetch-uri evitate față de lista brută
+    """
+    from scrapers.registry import resolve
+
+    known_keys = set()
+    for url in known_urls or []:
+        supplier = resolve(url)
+        canonical = canonicalize(url, supplier)
+        if canonical:
+            known_keys.add(product_key(canonical, supplier))
+
+    report = {
+        'urls': [],
+        'suppliers': {},
+        'groups': {},
+        'invalid': [],
+        'total': 0,
+        'duplicates': 0,
+        'variants_grouped': 0,
+        'already_scraped': 0,
+        'cached': 0,
+        'fetches_saved': 0,
+    }
+    by_key = {}         # cheie produs → URL-ul păstrat
+    originals = {}      # URL-ul păstrat → intrările brute
+    seen_exact = set()  # chei fără gruparea variantelor
+
+    for raw in urls:
+        report['total'] += 1
+        supplier = resolve(raw)
+        canonical = canonicalize(raw, supplier)
+        if not canonical:
+            report['invalid'].append(raw)
+            continue
+
+        key = product_key(canonical, supplier)
+        exact = product_key(canonical)
+        if key in known_keys:
+            report['already_scraped'] += 1
+            continue
+        if key in by_key:
+            if exact in seen_exact:
+                report['duplicates'] += 1
+            else:
+                report['variants_grouped'] += 1
+            seen_exact.add(exact)
+            originals[by_key[key]].append(raw)
+            continue
+
+        seen_exact.add(exact)
+        by_key[key] = canonical
+        originals[canonical] = [raw]
+        report['urls'].append(canonical)
+        report['suppliers'][supplier] = (
+            report['suppliers'].get(supplier, 0) + 1
+        )
+        if page_cache is not None and page_cache.contains(canonical):
+            report['cached'] += 1
+
+    report['groups'] = {
+        url: raws for url, raws in originals.items() if len(raws) > 1
+    }
+    report['fetches_saved'] = (
+        report['duplicates'] + report['variants_grouped']
+        + report['already_scraped'] + report['cached']
+    )
+    return report
+